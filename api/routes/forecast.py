@@ -1,61 +1,279 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Union
+import asyncio
+import datetime
 import os
 import sys
 from src.inference.predictor import ModelPredictor
 from src.inference.preprocess import Preprocessor
 from src.inference.postprocess import Postprocessor
+from src.inference.batcher import RequestCoalescer, predict_payload
+from src.inference.cache import PredictionCache
+from src.inference.feature_store import OnlineFeatureStore
+from src.inference.batch import aiter_rows, aiter_chunks, stream_forecasts
 from src.utils.logger import logger
 
 router = APIRouter()
 
-predictor = ModelPredictor(region_name="us-east-1")
-preprocessor = Preprocessor()
-postprocessor = Postprocessor()
+# Built by init_components() (FastAPI lifespan), not at import time
+predictor = None
+preprocessor = None
+postprocessor = None
+coalescer = None
+prediction_cache = None
+feature_store = None
+
+class SeriesRequest(BaseModel):
+    store_nbr: int
+    family: str
+    date: datetime.date  # ISO date; anything else is rejected with a 422
+    onpromotion: float = 0.0
 
 class ForecastRequest(BaseModel):
-    model_type: str 
-    data: List[List[float]] 
+    model_type: str
+    # Either precomputed feature rows, or series IDs whose features come from the online feature store.
+    # Windowed LSTMs (LSTM_WINDOW > 1) take one window of rows per sample instead.
+    data: Optional[Union[List[List[float]], List[List[List[float]]]]] = None
+    items: Optional[List[SeriesRequest]] = None
+
+DEFAULT_XGB_ENDPOINT = "retail-xgb-endpoint-2023-..."
+DEFAULT_LSTM_ENDPOINT = "retail-lstm-endpoint-2023-..."
+
+def init_components():
+    """
+    Creates the predictor, processors, coalescer and cache. Idempotent.
+    Cheap by design: artifacts and models load lazily per model, or via preload_artifacts().
+    """
+    global predictor, preprocessor, postprocessor, coalescer, prediction_cache, feature_store
+    if predictor is not None:
+        return
+
+    predictor = ModelPredictor(region_name="us-east-1")
+    preprocessor = Preprocessor()
+    postprocessor = Postprocessor()
+
+    # Opt-in micro-batching: concurrent requests are merged into one endpoint call
+    coalescer = None
+    if os.getenv("ENABLE_MICRO_BATCHING", "false").lower() == "true":
+        coalescer = RequestCoalescer(
+            predictor, preprocessor, postprocessor,
+            max_wait_ms=float(os.getenv("BATCH_MAX_WAIT_MS", "5")),
+            max_batch_rows=int(os.getenv("BATCH_MAX_ROWS", "256"))
+        )
+
+    # Repeated identical payloads are answered from here (PREDICTION_CACHE_SIZE=0 disables)
+    prediction_cache = PredictionCache(
+        max_size=int(os.getenv("PREDICTION_CACHE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL", "60")),
+        shared_path=os.getenv("PREDICTION_CACHE_PATH")
+    )
+
+    # Latest lag/rolling features per series, loaded and refreshed by refresh_feature_store() (FEATURE_STORE_PATH)
+    feature_store = OnlineFeatureStore()
+    logger.info("Forecast components initialised")
+
+def preload_artifacts():
+    """
+    Loads preprocessors, endpoint clients and (local backend) models up front.
+    Blocking: run it in a worker thread.
+    """
+    init_components()
+    preprocessor.preload()
+    feature_store.reload()
+    # Build the per-endpoint clients now so the first request does not pay for it
+    predictor.warm_up(list(resolve_endpoints().values()))
+
+def shutdown_components():
+    global predictor
+    if predictor is not None:
+        predictor.close()
+        predictor = None
+
+def component_status() -> dict:
+    if predictor is None:
+        return {"initialised": False}
+    return {
+        "initialised": True,
+        "artifacts": preprocessor.artifact_status(),
+        "endpoints": sorted(predictor.pool_stats()),
+        "feature_store": {"path": feature_store.path, "loaded": feature_store.stats()["loaded"]},
+    }
+
+def resolve_endpoints() -> dict:
+    """
+    Endpoint names are re-read on every request so a redeploy picked up from
+    the environment invalidates the cached forecasts of the old endpoint.
+    """
+    endpoints = {
+        "xgboost": os.getenv("XGB_ENDPOINT_NAME", DEFAULT_XGB_ENDPOINT),
+        "lstm": os.getenv("LSTM_ENDPOINT_NAME", DEFAULT_LSTM_ENDPOINT),
+    }
+    prediction_cache.sync_endpoints(endpoints)
+    return endpoints
+
+async def refresh_feature_store():
+    """
+    Loads the feature store on first use and picks up a republished file every
+    FEATURE_STORE_REFRESH_SECONDS. The SQLite read runs in a worker thread.
+    """
+    if feature_store.refresh_due():
+        await asyncio.to_thread(feature_store.reload)
+
+def rows_from_feature_store(items: list) -> list:
+    """
+    Series IDs -> model-ready XGBoost rows, from the online feature store.
+    """
+    feature_rows = []
+    for item in items:
+        features = feature_store.lookup(item.store_nbr, item.family, item.date)
+        features["onpromotion"] = item.onpromotion
+        feature_rows.append(features)
+    return preprocessor.build_xgboost_rows(feature_rows).tolist()
+
+def preprocess_rows(model_type: str, rows: list):
+    if model_type == "xgboost":
+        return preprocessor.preprocess_xgboost(rows)
+    return preprocessor.preprocess_lstm(rows)
+
+async def predict_rows(model_type: str, endpoint: str, rows: list, payload=None) -> list:
+    """
+    Preprocess -> predict -> postprocess, with no caching or batching.
+    """
+    if payload is None:
+        payload = preprocess_rows(model_type, rows)
+    return await predict_payload(predictor, preprocessor, postprocessor, model_type, endpoint, payload)
+
+async def run_forecast(model_type: str, endpoint: str, rows: list) -> list:
+    """
+    Preprocess -> (cache | predict) -> postprocess for a single request.
+    """
+    # 1. Preprocess
+    payload = preprocess_rows(model_type, rows)
+
+    cache_key = prediction_cache.make_key(model_type, endpoint, payload)
+    forecast = prediction_cache.get(cache_key)
+    if forecast is not None:
+        return forecast
+
+    # 2. Predict & 3. Postprocess
+    if coalescer is not None:
+        forecast = await coalescer.submit(model_type, endpoint, rows, payload=payload)
+    else:
+        forecast = await predict_rows(model_type, endpoint, rows, payload=payload)
 
-XGB_ENDPOINT = os.getenv("XGB_ENDPOINT_NAME", "retail-xgb-endpoint-2023-...") 
-LSTM_ENDPOINT = os.getenv("LSTM_ENDPOINT_NAME", "retail-lstm-endpoint-2023-...")
+    prediction_cache.set(cache_key, forecast)
+    return forecast
 
 @router.post("/predict")
 async def get_forecast(request: ForecastRequest):
     try:
+        init_components()
         model_type = request.model_type.lower()
         logger.info(f"API Request received for {model_type}")
-        
-        if model_type == "xgboost":
-            # 1. Preprocess 
-            payload = preprocessor.preprocess_xgboost(request.data)
-            
-            # 2. Predict
-            raw_response = predictor.predict(XGB_ENDPOINT, payload, "text/csv")
-            
-            # 3. Postprocess
-            forecast = postprocessor.postprocess_xgboost(raw_response)
-
-        elif model_type == "lstm":
-            # 1. Preprocess 
-            payload = preprocessor.preprocess_lstm(request.data)
-            
-            # 2. Predict
-            raw_response = predictor.predict(LSTM_ENDPOINT, payload, "application/json")
-            
-            # 3. Postprocess
-            forecast = postprocessor.postprocess_lstm(raw_response)
-        
-        else:
+
+        endpoints = resolve_endpoints()
+        if model_type not in endpoints:
             raise HTTPException(status_code=400, detail="Invalid model_type. Use 'xgboost' or 'lstm'")
 
+        rows = request.data
+        if request.items:
+            if model_type != "xgboost":
+                raise HTTPException(status_code=400, detail="Series ID requests are only supported for model_type 'xgboost'")
+            await refresh_feature_store()
+            try:
+                rows = rows_from_feature_store(request.items)
+            except KeyError as e:
+                raise HTTPException(status_code=404, detail=str(e.args[0]))
+        if not rows:
+            raise HTTPException(status_code=400, detail="Provide either 'data' or 'items'")
+
+        forecast = await run_forecast(model_type, endpoints[model_type], rows)
+
         return {
             "status": "success",
             "model": model_type,
             "forecast": forecast
         }
 
+    except HTTPException:
+        raise
+
     except Exception as e:
         logger.error(f"API Error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body is produced from the request body as it is received.
+    Starlette's disconnect listener (ASGI spec < 2.4, e.g. uvicorn HTTP) would consume the
+    request messages the body still needs; here a disconnect surfaces instead through
+    request.stream() while uploading, or as a failed send afterwards.
+    """
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+@router.post("/predict/batch")
+async def get_batch_forecast(request: Request, model_type: str, chunk_size: int = 1000):
+    """
+    Scores a large row set streamed as the request body and streams results back as NDJSON.
+
+    Body: NDJSON (one JSON array per line) or a raw CSV file upload (Content-Type: text/csv).
+    Rows are sent to the endpoint in chunks of `chunk_size`, at most BATCH_MAX_PARALLEL_CHUNKS
+    at a time; each output line carries the `start` offset of its chunk.
+    """
+    init_components()
+    model_type = model_type.lower()
+    logger.info(f"Batch API Request received for {model_type}")
+
+    endpoints = resolve_endpoints()
+    if model_type not in endpoints:
+        raise HTTPException(status_code=400, detail="Invalid model_type. Use 'xgboost' or 'lstm'")
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be >= 1")
+
+    endpoint = endpoints[model_type]
+
+    async def score_chunk(rows):
+        return await predict_rows(model_type, endpoint, rows)
+
+    # Rows are parsed and scored while the upload is still arriving
+    rows = aiter_rows(request.stream(), request.headers.get("content-type", "application/x-ndjson"))
+    body = stream_forecasts(
+        aiter_chunks(rows, chunk_size),
+        score_chunk,
+        max_parallel_chunks=int(os.getenv("BATCH_MAX_PARALLEL_CHUNKS", "4"))
+    )
+    return UploadStreamingResponse(body, media_type="application/x-ndjson")
+
+
+@router.get("/metrics/predictor")
+async def get_predictor_metrics():
+    """
+    Connection pool saturation per endpoint, used to size API workers.
+    """
+    init_components()
+    return {
+        "max_concurrency": predictor.max_concurrency,
+        "endpoints": predictor.pool_stats()
+    }
+
+
+@router.get("/metrics/cache")
+async def get_cache_metrics():
+    init_components()
+    return prediction_cache.stats()
+
+
+@router.get("/metrics/feature-store")
+async def get_feature_store_metrics():
+    init_components()
+    return feature_store.stats()
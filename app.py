@@ -1,29 +1,65 @@
 import sys
 import os
+import asyncio
+import time
+from contextlib import asynccontextmanager
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
 
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
 
 from src.utils.logger import logger
-from api.routes import forecast 
+from api.routes import forecast
 
 
 load_dotenv()
 
+startup_state = {"preload": "disabled", "preload_seconds": None, "error": None}
+
+async def preload_in_background():
+    startup_state["preload"] = "running"
+    start = time.perf_counter()
+    try:
+        await asyncio.to_thread(forecast.preload_artifacts)
+        startup_state["preload"] = "done"
+    except Exception as e:
+        logger.error(f"Artifact preload failed: {e}")
+        startup_state["preload"] = "failed"
+        startup_state["error"] = str(e)
+    startup_state["preload_seconds"] = time.perf_counter() - start
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker, after .env is loaded
+    forecast.init_components()
+
+    # PRELOAD_ARTIFACTS=true loads artifacts/models without delaying startup;
+    # otherwise each model loads on its first request
+    preload_task = None
+    if os.getenv("PRELOAD_ARTIFACTS", "false").lower() == "true":
+        preload_task = asyncio.create_task(preload_in_background())
+
+    yield
+
+    if preload_task is not None:
+        preload_task.cancel()
+    forecast.shutdown_components()
+
 app = FastAPI(
     title="Retail Forecasting API",
     description="API for forecasting sales using XGBoost and LSTM SageMaker Endpoints",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  
+    allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -41,7 +77,19 @@ async def root():
         "message": "Retail Forecasting API is running successfully."
     }
 
+@app.get("/ready", tags=["Health Check"])
+async def ready():
+    """
+    Readiness probe: 200 once components are up and any background preload has finished.
+    Reports per-artifact load times.
+    """
+    status = forecast.component_status()
+    is_ready = status["initialised"] and startup_state["preload"] not in ("running", "failed")
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"ready": is_ready, **startup_state, **status}
+    )
+
 if __name__ == "__main__":
     logger.info("Starting API Server...")
     uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
-
@@ -0,0 +1,54 @@
+"""
+Benchmark: add_date_features (per-day lookup table, no copy) vs the original
+copy + .dt accessors over every row.
+
+Usage (from the repo root):
+    python benchmarks/calendar_features.py --days 1700
+"""
+import argparse
+import os
+import sys
+import time
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.load import peak_rss_mb
+from src.features.calendar_features import add_date_features
+
+def legacy_date_features(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['year'] = df['date'].dt.year.astype('int16')
+    df['month'] = df['date'].dt.month.astype('int8')
+    df['day_of_week'] = df['date'].dt.dayofweek.astype('int8')
+    return df
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    args = parser.parse_args()
+
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    print(f"{len(df):,} rows, {df['date'].nunique():,} distinct dates")
+
+    start = time.perf_counter()
+    expected = legacy_date_features(df)
+    legacy_s = time.perf_counter() - start
+    del expected
+
+    start = time.perf_counter()
+    add_date_features(df, flags=False)
+    table_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    add_date_features(df, flags=True)
+    flags_s = time.perf_counter() - start
+
+    print(f"{'copy + .dt (3 cols)':>24}: {legacy_s:6.3f}s")
+    print(f"{'lookup table (3 cols)':>24}: {table_s:6.3f}s  ({legacy_s / table_s:.1f}x)")
+    print(f"{'lookup table (+5 flags)':>24}: {flags_s:6.3f}s")
+    print(f"peak RSS {peak_rss_mb():.0f} MB")
@@ -0,0 +1,87 @@
+"""
+Benchmark: XGBoost on one-hot features vs native categorical codes (XGBOOST_FEATURE_MODE).
+Matrix width and memory, fit time, scoring time (booster and Preprocessor row building)
+and test RMSE for each mode.
+
+Usage (from the repo root):
+    python benchmarks/categorical_features.py --days 400
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.save_split_data import split_data_time_series
+from src.data_processing.transform import get_xgboost_preprocessor, xgboost_matrix, category_vocabulary
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features
+from src.inference.preprocess import Preprocessor
+from src.training.xgboost_train_eval_script import as_categorical
+
+def matrix_mb(X) -> float:
+    if sparse.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1024**2
+    if isinstance(X, pd.DataFrame):
+        return X.memory_usage(index=False).sum() / 1024**2
+    return X.nbytes / 1024**2
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--n-estimators", type=int, default=100)
+    parser.add_argument("--serve-rows", type=int, default=1000)
+    parser.add_argument("--max-cat-to-onehot", type=int, default=64)
+    args = parser.parse_args()
+
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    df = add_date_features(clean_data(df))
+    train_df, test_df = split_data_time_series(add_lag_features(df))
+    X_train, y_train = train_df.drop(columns=["sales", "date"]), train_df["sales"].to_numpy()
+    X_test, y_test = test_df.drop(columns=["sales", "date"]), test_df["sales"].to_numpy()
+    serve_features = X_test.head(args.serve_rows).to_dict("records")
+    print(f"{len(X_train):,} training rows, {len(X_test):,} test rows")
+
+    for mode in ("one_hot", "categorical"):
+        preprocessor = get_xgboost_preprocessor(feature_mode=mode)
+        train = xgboost_matrix(preprocessor.fit_transform(X_train), preprocessor)
+        test = xgboost_matrix(preprocessor.transform(X_test), preprocessor)
+        vocab = category_vocabulary(preprocessor)
+        names = list(preprocessor.get_feature_names_out())
+        if vocab:
+            train = as_categorical(pd.DataFrame(train, columns=names), vocab)
+            test = as_categorical(pd.DataFrame(test, columns=names), vocab)
+
+        model = xgb.XGBRegressor(
+            n_estimators=args.n_estimators, max_depth=6, tree_method="hist",
+            enable_categorical=bool(vocab), max_cat_to_onehot=args.max_cat_to_onehot if vocab else None, n_jobs=-1
+        )
+        _, fit_s = timed(lambda: model.fit(train, y_train))
+        preds, predict_s = timed(lambda: model.predict(test))
+        rmse = np.sqrt(np.mean((preds - y_test) ** 2))
+
+        # Online path: raw feature dicts -> rows -> booster
+        serving = Preprocessor()
+        serving.xgb_scaler = preprocessor
+        booster = model.get_booster()
+        rows, build_s = timed(lambda: serving.build_xgboost_rows(serve_features))
+        _, score_s = timed(lambda: booster.inplace_predict(rows))
+
+        print(f"{mode:>12}: {len(names):2d} cols  {matrix_mb(train):6.1f} MB  fit {fit_s:5.2f}s  "
+              f"predict test {predict_s:5.2f}s  RMSE {rmse:7.2f}  "
+              f"serve {args.serve_rows} rows: build {build_s * 1000:5.1f} ms + score {score_s * 1000:5.1f} ms")
@@ -0,0 +1,69 @@
+"""
+Benchmark: clean -> lags -> split with the original copies and unconditional
+sorts vs the copy-free path (sorts skipped when the frame is already ordered).
+Each mode runs in its own process so the per-stage peak RSS is not shared.
+
+Usage (from the repo root):
+    python benchmarks/clean_prep.py --days 1700
+"""
+import argparse
+import os
+import subprocess
+import sys
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.save_split_data import split_data_time_series
+from src.features.lag_features import add_lag_features
+from src.utils.profiling import StageProfiler
+
+def legacy_clean(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    df['family'] = df['family'].str.strip().str.upper()
+    df = df.drop_duplicates()
+    df['sales'] = df['sales'].fillna(0.0)
+    df['onpromotion'] = df['onpromotion'].fillna(0)
+    df['sales'] = df['sales'].clip(lower=0.0)
+    df = df.astype({'store_nbr': 'int32', 'onpromotion': 'int32', 'sales': 'float32', 'family': 'category'})
+    return df.sort_values(by=['store_nbr', 'family', 'date'])
+
+def legacy_split(df: pd.DataFrame, test_days: int = 16) -> tuple:
+    df = df.sort_values(by=['date', 'store_nbr', 'family'])
+    cutoff = df['date'].max() - pd.Timedelta(days=test_days)
+    return df[df['date'] <= cutoff].copy(), df[df['date'] > cutoff].copy()
+
+def run(mode: str, args):
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.astype({'store_nbr': 'int32', 'family': 'category', 'sales': 'float32', 'onpromotion': 'float32'})
+
+    profiler = StageProfiler()
+    with profiler.stage("clean"):
+        df = legacy_clean(df) if mode == "legacy" else clean_data(df)
+    with profiler.stage("lags"):
+        if mode == "legacy":
+            df = df.copy().sort_values(by=['store_nbr', 'family', 'date'])
+        df = add_lag_features(df)
+    with profiler.stage("split"):
+        train, test = legacy_split(df) if mode == "legacy" else split_data_time_series(df)
+
+    for stage in profiler.report():
+        print(f"{mode:>9} {stage['stage']:>6}: {stage['seconds']:6.2f}s  peak {stage['peak_rss_mb']:6.0f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    parser.add_argument("--mode", choices=["legacy", "copy-free"])
+    args = parser.parse_args()
+
+    if args.mode:
+        run(args.mode, args)
+    else:
+        for mode in ("legacy", "copy-free"):
+            subprocess.run([sys.executable, __file__, "--mode", mode, "--stores", str(args.stores),
+                            "--families", str(args.families), "--days", str(args.days)], check=True)
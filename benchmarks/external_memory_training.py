@@ -0,0 +1,75 @@
+"""
+Benchmark: XGBoost training with the whole split in memory vs streamed through
+xgb.DataIter (--data-mode quantile / external). Each mode runs
+src/training/xgboost_train_eval_script.py in its own process and reports its
+peak RSS, DMatrix build and training time and the test RMSE.
+
+Usage (from the repo root):
+    python benchmarks/external_memory_training.py --days 1700
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.save_split_data import split_data_time_series
+from src.data_processing.storage import save_splits, save_category_vocab
+from src.data_processing.transform import get_xgboost_preprocessor, xgboost_matrix, category_vocabulary
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features
+
+TRAIN_SCRIPT = os.path.join("src", "training", "xgboost_train_eval_script.py")
+REPORT_LINES = re.compile(r"^(Training Shape|\[INFO\] Trained|Test RMSE|\[INFO\] Peak memory)")
+
+def write_splits(save_dir: str, args):
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    train_df, test_df = split_data_time_series(add_lag_features(add_date_features(clean_data(df))))
+    del df
+
+    preprocessor = get_xgboost_preprocessor(sparse_output=args.sparse, feature_mode=args.feature_mode)
+    X_train = xgboost_matrix(preprocessor.fit_transform(train_df.drop(columns=["sales", "date"])), preprocessor)
+    X_test = xgboost_matrix(preprocessor.transform(test_df.drop(columns=["sales", "date"])), preprocessor)
+    save_splits(save_dir, preprocessor.get_feature_names_out(), X_train, train_df["sales"], X_test, test_df["sales"])
+    save_category_vocab(save_dir, category_vocabulary(preprocessor))
+    print(f"{X_train.shape[0]:,} x {X_train.shape[1]} training matrix written to {save_dir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    parser.add_argument("--sparse", action="store_true", help="CSR .npz splits instead of dense Parquet")
+    parser.add_argument("--feature-mode", choices=["one_hot", "categorical"], default="one_hot")
+    parser.add_argument("--n-estimators", type=int, default=50)
+    parser.add_argument("--chunk-rows", type=int, default=250_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Split generation runs in a child process so its memory does not linger in this one
+        if not os.environ.get("BENCH_WRITE_SPLITS"):
+            subprocess.run([sys.executable] + sys.argv, env={**os.environ, "BENCH_WRITE_SPLITS": tmp}, check=True)
+        else:
+            write_splits(os.environ["BENCH_WRITE_SPLITS"], args)
+            sys.exit(0)
+
+        for mode in ("memory", "quantile", "external"):
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, TRAIN_SCRIPT, "--model-dir", tmp, "--train", tmp, "--test", tmp,
+                 "--data-mode", mode, "--chunk-rows", str(args.chunk_rows), "--cache-dir", tmp,
+                 "--n_estimators", str(args.n_estimators)],
+                capture_output=True, text=True, check=True
+            )
+            report = [line for line in result.stdout.splitlines() if REPORT_LINES.match(line)]
+            print(f"\n{mode} ({time.perf_counter() - start:.1f}s wall)")
+            for line in report:
+                print(f"  {line}")
@@ -0,0 +1,71 @@
+"""
+Benchmark: building an XGBoost request row server-side from the online feature store
+vs the old client-side pandas feature computation (src/test/api_test.py before the store).
+
+Usage (from the repo root):
+    python benchmarks/feature_store_lookup.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.transform import get_xgboost_preprocessor
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features, FeatureSpec
+from src.features.incremental_features import future_features
+from src.inference.feature_store import OnlineFeatureStore
+from src.inference.preprocess import Preprocessor
+
+def client_side_features(history):
+    # What clients had to do before: pandas lags/rolling over their own history
+    df = pd.DataFrame(history, columns=['sales'])
+    df['lag_7'] = df['sales'].shift(7)
+    df['lag_28'] = df['sales'].shift(28)
+    df['rolling_mean_7'] = df['sales'].rolling(window=7).mean()
+    df['rolling_std_7'] = df['sales'].rolling(window=7).std()
+    return df.dropna().tail(1).values.tolist()
+
+def per_call_us(fn, repeat=2000):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+if __name__ == "__main__":
+    df = make_sales_frame(days=400)
+    df["date"] = pd.to_datetime(df["date"])
+    df = add_date_features(clean_data(df))
+
+    preprocessor = Preprocessor()
+    preprocessor.xgb_scaler = get_xgboost_preprocessor().fit(add_lag_features(df))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = OnlineFeatureStore(os.path.join(tmp, "online.sqlite"))
+        store.write(future_features(df, FeatureSpec()))
+        store.load()
+        date = (df["date"].max() + pd.Timedelta(days=1)).date().isoformat()
+
+        def server_side():
+            row = store.lookup(7, "BEVERAGES", date)
+            row["onpromotion"] = 2
+            return preprocessor.build_xgboost_rows([row])
+
+        history = list(np.random.default_rng(0).gamma(2.0, 50.0, 40))
+        server_us = per_call_us(server_side)
+        client_us = per_call_us(lambda: client_side_features(history), repeat=200)
+
+        id_body = json.dumps({"model_type": "xgboost", "items": [{"store_nbr": 7, "family": "BEVERAGES", "date": date}]})
+        vector_body = json.dumps({"model_type": "xgboost", "data": server_side().tolist()})
+
+    print(f"{len(store.stats()['features'])} stored features, {store.stats()['rows']:,} (series, day) rows")
+    print(f"server-side lookup + model row: {server_us:8.1f} us")
+    print(f"client-side pandas features:    {client_us:8.1f} us")
+    print(f"request body: {len(id_body)} bytes by ID vs {len(vector_body)} bytes as a feature vector")
@@ -0,0 +1,61 @@
+"""
+Benchmark: daily feature refresh, incremental (IncrementalFeatureBuilder) vs full recompute.
+
+Builds the state from all but the last --new-days days, then times featurising only those days
+against add_lag_features over the whole history.
+
+Usage (from the repo root):
+    python benchmarks/incremental_features.py --days 1700 --new-days 1
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features, FeatureSpec
+from src.features.incremental_features import IncrementalFeatureBuilder
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    parser.add_argument("--new-days", type=int, default=1)
+    args = parser.parse_args()
+
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    df = add_date_features(clean_data(df))
+    cutoff = df["date"].max() - pd.Timedelta(days=args.new_days - 1)
+    history, new_days = df[df["date"] < cutoff], df[df["date"] >= cutoff]
+    spec = FeatureSpec.from_dict({"lags": [1, 7, 14, 28], "rolling": {7: ["mean", "std"], 28: ["mean"]},
+                                  "ewm_spans": [7], "horizon": 16})
+    print(f"{len(history):,} history rows, {len(new_days):,} new rows")
+
+    start = time.perf_counter()
+    full = add_lag_features(df, spec=spec)
+    full_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as state_dir:
+        builder = IncrementalFeatureBuilder(state_dir, spec)
+        start = time.perf_counter()
+        builder.update(history)
+        bootstrap_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fresh = builder.update(new_days)
+        incremental_s = time.perf_counter() - start
+
+    expected = full[full["date"] >= cutoff].reset_index(drop=True)
+    pd.testing.assert_frame_equal(fresh.reset_index(drop=True), expected, check_exact=False, rtol=1e-9)
+
+    print(f"{'full recompute':>22}: {full_s:8.3f}s")
+    print(f"{'bootstrap (one-off)':>22}: {bootstrap_s:8.3f}s")
+    print(f"{'incremental update':>22}: {incremental_s:8.3f}s  ({full_s / incremental_s:.0f}x)")
@@ -0,0 +1,65 @@
+"""
+Benchmark: raw CSV loading modes (inferred dtypes vs typed, chunked and pyarrow).
+
+Each mode runs in a fresh interpreter so its peak RSS is measured in isolation.
+Peak RSS is reported right after the load and again after clean_data.
+
+Usage (from the repo root):
+    python benchmarks/load_modes.py --days 1700          # ~3M rows
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(os.getcwd())
+
+MODES = {
+    "inferred": {"typed": False},
+    "typed": {"typed": True},
+    "typed+chunked": {"typed": True, "chunksize": 500_000},
+    "typed+pyarrow": {"typed": True, "engine": "pyarrow"},
+}
+
+CHILD = """
+import json, sys, time
+sys.path.append({cwd!r})
+from src.data_processing.load import load_data, peak_rss_mb
+from src.data_processing.clean import clean_data
+start = time.perf_counter()
+df = load_data({path!r}, **{kwargs!r})
+loaded = time.perf_counter() - start
+load_peak = peak_rss_mb()
+df = clean_data(df)
+print(json.dumps({{"rows": len(df), "load_s": loaded, "load_peak_mb": load_peak, "peak_rss_mb": peak_rss_mb(),
+                  "frame_mb": df.memory_usage(deep=True).sum() / 1024**2}}))
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Generated in its own process: ru_maxrss survives exec, so children of a
+        # parent that built the frame would all report the parent's peak
+        path = os.path.join(tmp, "sales_data.csv")
+        subprocess.run([sys.executable, os.path.join("benchmarks", "synthetic_data.py"),
+                        "--stores", str(args.stores), "--families", str(args.families),
+                        "--days", str(args.days), "--out", path], check=True, capture_output=True)
+        print(f"File: {os.path.getsize(path) / 1024**2:.0f} MB")
+        print(f"{'mode':>15} {'rows/s':>12} {'load peak MB':>13} {'clean peak MB':>14} {'clean frame MB':>15}")
+
+        for label, kwargs in MODES.items():
+            code = CHILD.format(cwd=os.getcwd(), path=path, kwargs=kwargs)
+            result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+            if result.returncode != 0:
+                print(f"{label:>15} failed: {result.stderr.strip().splitlines()[-1]}")
+                continue
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{label:>15} {stats['rows'] / stats['load_s']:>12,.0f} "
+                  f"{stats['load_peak_mb']:>13.0f} {stats['peak_rss_mb']:>14.0f} {stats['frame_mb']:>15.1f}")
@@ -0,0 +1,78 @@
+"""
+Benchmark: LSTM training with the splits loaded into NumPy vs streamed through tf.data
+(--input-pipeline memory / stream). Each mode runs src/training/lstm_train_eval_script.py
+in its own process for one epoch and reports the epoch time and its peak RSS.
+Needs TensorFlow.
+
+Usage (from the repo root):
+    python benchmarks/lstm_input_pipeline.py --days 1700
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.save_split_data import split_data_time_series
+from src.data_processing.storage import save_splits, save_frame
+from src.data_processing.transform import get_nn_preprocessor, to_index_form
+from src.features.calendar_features import add_date_features
+
+TRAIN_SCRIPT = os.path.join("src", "training", "lstm_train_eval_script.py")
+REPORT_LINES = re.compile(r"^(\[INFO\] Input Shape|\d+/\d+ - |Test RMSE|\[INFO\] Peak memory)")
+
+def write_splits(save_dir: str, args):
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    train_df, test_df = split_data_time_series(add_date_features(clean_data(df)))
+    del df
+
+    preprocessor = get_nn_preprocessor(sparse_output=True)
+    X_train = preprocessor.fit_transform(train_df.drop(columns=["sales", "date"]))
+    X_test = preprocessor.transform(test_df.drop(columns=["sales", "date"]))
+    names = preprocessor.get_feature_names_out()
+    save_splits(save_dir, names, X_train, train_df["sales"], X_test, test_df["sales"])
+    for name, X in (("train_index", X_train), ("test_index", X_test)):
+        frame, vocab = to_index_form(X, preprocessor, names)
+        save_frame(frame, save_dir, name)
+    with open(os.path.join(save_dir, "index_vocab.json"), "w") as f:
+        json.dump(vocab, f)
+    print(f"{X_train.shape[0]:,} x {X_train.shape[1]} training matrix written to {save_dir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--input-form", choices=["one_hot", "index"], default="one_hot")
+    args = parser.parse_args()
+
+    if os.environ.get("BENCH_WRITE_SPLITS"):
+        write_splits(os.environ["BENCH_WRITE_SPLITS"], args)
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Split generation runs in a child process so its memory does not linger in this one
+        subprocess.run([sys.executable] + sys.argv, env={**os.environ, "BENCH_WRITE_SPLITS": tmp}, check=True)
+
+        for pipeline in ("memory", "stream"):
+            result = subprocess.run(
+                [sys.executable, TRAIN_SCRIPT, "--model-dir", tmp, "--train", tmp, "--test", tmp,
+                 "--epochs", "1", "--batch_size", str(args.batch_size),
+                 "--input-form", args.input_form, "--input-pipeline", pipeline],
+                capture_output=True, text=True, env={**os.environ, "TF_CPP_MIN_LOG_LEVEL": "3"}
+            )
+            report = [line for line in result.stdout.splitlines() if REPORT_LINES.match(line)]
+            print(f"\n{pipeline}")
+            for line in report:
+                print(f"  {line.split(' - val_')[0]}")
+            if not any(line.startswith("[INFO] Peak memory") for line in report):
+                print(result.stderr[-2000:])
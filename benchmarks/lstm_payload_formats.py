@@ -0,0 +1,60 @@
+"""
+Benchmark: LSTM request/response encoding, stdlib JSON vs orjson vs float32 .npy.
+
+Times Preprocessor.preprocess_lstm (request) and Postprocessor.postprocess_lstm
+(response) and reports payload sizes.
+
+Usage (from the repo root):
+    python benchmarks/lstm_payload_formats.py
+"""
+import io
+import json
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src.inference import preprocess, postprocess
+from src.inference.preprocess import Preprocessor
+from src.inference.postprocess import Postprocessor
+
+def make_response(predictions, payload_format):
+    if payload_format == "npy":
+        buffer = io.BytesIO()
+        np.save(buffer, predictions.astype(np.float32), allow_pickle=False)
+        return buffer.getvalue()
+    return json.dumps({"predictions": predictions.tolist()}).encode("utf-8")
+
+if __name__ == "__main__":
+    orjson_module = preprocess.orjson
+    preprocessor = Preprocessor()
+    preprocessor.nn_scaler = None
+    postprocessor = Postprocessor()
+    rng = np.random.default_rng(42)
+
+    modes = [("json (stdlib)", "json", None), ("npy", "npy", orjson_module)]
+    if orjson_module is not None:
+        modes.insert(1, ("json (orjson)", "json", orjson_module))
+
+    print(f"{'rows':>6} {'mode':>14} {'request KB':>11} {'encode ms':>10} {'response KB':>12} {'decode ms':>10}")
+    for n_rows in (1_000, 10_000):
+        rows = rng.random((n_rows, 60)).tolist()
+        predictions = rng.random((n_rows, 1)) * 1000
+
+        for label, payload_format, json_module in modes:
+            preprocess.orjson = json_module
+            postprocess.orjson = json_module
+            preprocessor.lstm_payload_format = payload_format
+
+            request = preprocessor.preprocess_lstm(rows)
+            response = make_response(predictions, payload_format)
+            encode = timeit.timeit(lambda: preprocessor.preprocess_lstm(rows), number=5) / 5
+            decode = timeit.timeit(lambda: postprocessor.postprocess_lstm(response), number=5) / 5
+
+            print(f"{n_rows:>6} {label:>14} {len(request) / 1024:>11.1f} {encode * 1e3:>10.2f} "
+                  f"{len(response) / 1024:>12.1f} {decode * 1e3:>10.2f}")
+
+    preprocess.orjson = orjson_module
+    postprocess.orjson = orjson_module
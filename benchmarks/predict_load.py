@@ -0,0 +1,88 @@
+"""
+Load test for the async predictor path against a local stub SageMaker endpoint.
+
+Starts an HTTP server that mimics the SageMaker runtime `/invocations` route
+with a fixed latency, points ModelPredictor at it via `endpoint_url`, and
+measures throughput as the number of concurrent clients grows.
+
+Usage (from the repo root):
+    python benchmarks/predict_load.py --latency-ms 50 --requests 64
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.getcwd())
+
+from src.inference.predictor import ModelPredictor
+
+class StubEndpointHandler(BaseHTTPRequestHandler):
+    latency = 0.05
+
+    def do_POST(self):
+        # POST /endpoints/<name>/invocations
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+
+        body = b"1.0"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubEndpointServer(ThreadingHTTPServer):
+    # Default listen backlog (5) drops SYNs once many clients connect at once
+    request_queue_size = 128
+
+def start_stub_endpoint(latency):
+    StubEndpointHandler.latency = latency
+    server = StubEndpointServer(("127.0.0.1", 0), StubEndpointHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def run_clients(predictor, n_clients, n_requests):
+    queue = asyncio.Queue()
+    for _ in range(n_requests):
+        queue.put_nowait("1,2,3")
+
+    async def client():
+        while not queue.empty():
+            payload = queue.get_nowait()
+            await predictor.predict_async("stub-endpoint", payload, "text/csv")
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(n_clients)])
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    # boto3 signs every request, so it needs (any) credentials
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "stub")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "stub")
+
+    server = start_stub_endpoint(args.latency_ms / 1000)
+    endpoint_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Stub endpoint at {endpoint_url} (latency {args.latency_ms:.0f} ms)")
+
+    print(f"{'clients':>8} {'seconds':>9} {'req/s':>9}")
+    for n_clients in args.clients:
+        predictor = ModelPredictor(max_concurrency=n_clients, endpoint_url=endpoint_url)
+        elapsed = asyncio.run(run_clients(predictor, n_clients, args.requests))
+        predictor.close()
+        print(f"{n_clients:>8} {elapsed:>9.3f} {args.requests / elapsed:>9.1f}")
+
+    server.shutdown()
@@ -0,0 +1,68 @@
+"""
+Benchmark: processed train split as CSV vs Parquet vs Feather (file size, write and load time).
+
+The matrix mimics data/post/xgboost/train.csv: 33 one-hot family columns plus 10 numeric features.
+"csv (float64)" is the original to_csv of the dense float64 transformer output.
+
+Usage (from the repo root):
+    python benchmarks/processed_formats.py --rows 2000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from src.data_processing.storage import save_frame, read_frame
+
+def make_processed_matrix(n_rows: int, n_families: int = 33, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    one_hot = np.zeros((n_rows, n_families))
+    one_hot[np.arange(n_rows), rng.integers(0, n_families, n_rows)] = 1.0
+    numeric = np.column_stack([
+        rng.gamma(2.0, 50.0, (n_rows, 5)).round(3),  # lags / rolling means
+        rng.poisson(0.5, n_rows),                     # onpromotion
+        rng.integers(1, 55, n_rows),                  # store_nbr
+        rng.integers(0, 7, n_rows),                   # day_of_week
+        rng.integers(1, 13, n_rows),                  # month
+        rng.integers(2013, 2018, n_rows),             # year
+    ])
+    columns = [f"cat_trans__family_{i}" for i in range(n_families)] + [
+        "num_trans__lag_1", "num_trans__lag_7", "num_trans__lag_14", "num_trans__roll_7_mean",
+        "num_trans__roll_14_mean", "num_trans__onpromotion", "num_trans__store_nbr",
+        "num_trans__day_of_week", "num_trans__month", "num_trans__year",
+    ]
+    return pd.DataFrame(np.hstack([one_hot, numeric]), columns=columns)
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df64 = make_processed_matrix(args.rows)
+    df32 = df64.astype("float32")
+    print(f"{args.rows:,} rows x {df64.shape[1]} columns")
+    print(f"{'format':>16} {'size MB':>9} {'write s':>9} {'load s':>9}")
+
+    cases = [("csv (float64)", df64, "csv"), ("csv", df32, "csv"),
+             ("parquet (zstd)", df32, "parquet"), ("feather", df32, "feather")]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, frame, fmt in cases:
+            write_s, path = timed(lambda: save_frame(frame, tmp, "train", fmt), repeat=1)
+            load_s, loaded = timed(lambda: read_frame(path))
+            assert loaded.shape == frame.shape
+            print(f"{label:>16} {os.path.getsize(path) / 1024**2:>9.1f} {write_s:>9.2f} {load_s:>9.2f}")
+            os.remove(path)
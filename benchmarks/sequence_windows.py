@@ -0,0 +1,109 @@
+"""
+Benchmark: sliding-window LSTM sequences (LSTM_WINDOW) built from zero-copy views.
+
+1. Builder: walks every (window, features) sample of a full-history-sized matrix through
+   iter_window_batches and reports throughput and the peak traced allocation, next to
+   the size of the same windows materialised as one (n, window, features) array.
+2. Training (--train, needs TensorFlow): runs process_and_save_nn on synthetic data, then one
+   epoch of src/training/lstm_train_eval_script.py per input pipeline with --window, each in
+   its own process, reporting the epoch time and peak RSS.
+
+Usage (from the repo root):
+    python benchmarks/sequence_windows.py --days 1700 --window 56
+    python benchmarks/sequence_windows.py --days 400 --window 56 --train
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.features.sequence_windows import positions_from_lengths, iter_window_batches
+
+TRAIN_SCRIPT = os.path.join(os.getcwd(), "src", "training", "lstm_train_eval_script.py")
+REPORT_LINES = re.compile(r"^(\[INFO\] Input Shape|\d+/\d+ - |Test RMSE|\[INFO\] Peak memory)")
+
+def bench_builder(args):
+    n_series = args.stores * args.families
+    n_rows = n_series * args.days
+    rng = np.random.default_rng(0)
+    values = rng.random((n_rows, args.features), dtype=np.float32)
+    targets = rng.random(n_rows, dtype=np.float32)
+    positions = positions_from_lengths(np.full(n_series, args.days))
+    n_windows = int((positions >= args.window - 1).sum())
+
+    materialised_mb = n_windows * args.window * args.features * 4 / 2**20
+    print(f"{n_rows:,} rows x {args.features} features ({values.nbytes / 2**20:.0f} MB), "
+          f"window {args.window}: {n_windows:,} samples")
+    print(f"  materialised (n, window, features) array: {materialised_mb:,.0f} MB")
+
+    for shuffle in (False, True):
+        tracemalloc.start()
+        start = time.perf_counter()
+        for X, y in iter_window_batches(values, targets, positions, args.window, args.batch_size, shuffle=shuffle):
+            pass
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  generator (shuffle={shuffle}): {n_windows / seconds:,.0f} windows/s, "
+              f"peak {peak / 2**20:.0f} MB on top of the rows")
+
+def write_splits(save_dir: str, args):
+    from src.data_processing.clean import clean_data
+    from src.data_processing.save_split_data import process_and_save_nn
+    from src.features.calendar_features import add_date_features
+
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    df = add_date_features(clean_data(df))
+    # process_and_save_nn writes to ./data/post/nn and ./artifacts
+    os.chdir(save_dir)
+    os.makedirs(os.path.join("data", "post", "nn"), exist_ok=True)
+    process_and_save_nn(df)
+
+def bench_training(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        # Split generation runs in a child process so its memory does not linger in this one
+        subprocess.run([sys.executable] + sys.argv, env={**os.environ, "BENCH_WRITE_SPLITS": tmp, "LSTM_WINDOW": str(args.window)}, check=True)
+        split_dir = os.path.join(tmp, "data", "post", "nn")
+
+        for pipeline in ("memory", "stream"):
+            result = subprocess.run(
+                [sys.executable, TRAIN_SCRIPT, "--model-dir", tmp, "--train", split_dir, "--test", split_dir,
+                 "--epochs", "1", "--batch_size", str(args.batch_size), "--window", str(args.window),
+                 "--input-form", "index", "--input-pipeline", pipeline],
+                capture_output=True, text=True, env={**os.environ, "TF_CPP_MIN_LOG_LEVEL": "3"}
+            )
+            report = [line for line in result.stdout.splitlines() if REPORT_LINES.match(line)]
+            print(f"\n{pipeline}")
+            for line in report:
+                print(f"  {line.split(' - val_')[0]}")
+            if not any(line.startswith("[INFO] Peak memory") for line in report):
+                print(result.stderr[-2000:])
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    parser.add_argument("--features", type=int, default=12, help="Columns of the builder matrix (index form: ~12)")
+    parser.add_argument("--window", type=int, default=56)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--train", action="store_true", help="Also time one training epoch per input pipeline")
+    args = parser.parse_args()
+
+    if os.environ.get("BENCH_WRITE_SPLITS"):
+        write_splits(os.environ["BENCH_WRITE_SPLITS"], args)
+        sys.exit(0)
+
+    bench_builder(args)
+    if args.train:
+        bench_training(args)
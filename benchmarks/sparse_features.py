@@ -0,0 +1,111 @@
+"""
+Benchmark: dense vs sparse (CSR) preprocessor output.
+XGBoost: matrix memory, file size, fit time. NN: memory/size of one-hot dense,
+one-hot CSR and the integer-index form; LSTM fit time when TensorFlow is installed.
+
+Usage (from the repo root):
+    python benchmarks/sparse_features.py --days 400
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.save_split_data import split_data_time_series
+from src.data_processing.storage import save_frame, save_sparse_matrix
+from src.data_processing.transform import get_xgboost_preprocessor, get_nn_preprocessor, xgboost_matrix, to_index_form
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features
+
+def matrix_mb(X) -> float:
+    if sparse.issparse(X):
+        return (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / 1024**2
+    if isinstance(X, pd.DataFrame):
+        return X.memory_usage(index=False).sum() / 1024**2
+    return X.nbytes / 1024**2
+
+def file_mb(X, names, tmp, tag) -> float:
+    if sparse.issparse(X):
+        path = save_sparse_matrix(X, tmp, tag, names)
+    else:
+        frame = X if isinstance(X, pd.DataFrame) else pd.DataFrame(X, columns=names)
+        path = save_frame(frame, tmp, tag, "parquet")
+    return os.path.getsize(path) / 1024**2
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def fit_lstm(X, y, vocab=None) -> float:
+    import tensorflow as tf
+    sys.path.append(os.path.join(os.getcwd(), "src", "training"))
+    from lstm_train_eval_script import embedding_inputs
+
+    inputs = tf.keras.Input(shape=(1, X.shape[1]))
+    x = embedding_inputs(inputs, vocab) if vocab else inputs
+    x = tf.keras.layers.LSTM(64, return_sequences=True)(x)
+    x = tf.keras.layers.LSTM(32)(x)
+    model = tf.keras.Model(inputs, tf.keras.layers.Dense(1)(tf.keras.layers.Dense(32, activation="relu")(x)))
+    model.compile(optimizer="adam", loss="mean_squared_error")
+    _, seconds = timed(lambda: model.fit(X.reshape(len(X), 1, -1), y, epochs=1, batch_size=1024, verbose=0))
+    return seconds
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--n-estimators", type=int, default=50)
+    args = parser.parse_args()
+
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days)
+    df["date"] = pd.to_datetime(df["date"])
+    df = add_date_features(clean_data(df))
+    train_df, _ = split_data_time_series(add_lag_features(df))
+    X_train, y_train = train_df.drop(columns=["sales", "date"]), train_df["sales"].to_numpy()
+    print(f"{len(X_train):,} training rows")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("\nXGBoost")
+        results = {}
+        for label, sparse_output in (("dense", False), ("csr", True)):
+            preprocessor = get_xgboost_preprocessor(sparse_output=sparse_output)
+            X = xgboost_matrix(preprocessor.fit_transform(X_train), preprocessor)
+            names = list(preprocessor.get_feature_names_out())
+            model = xgb.XGBRegressor(n_estimators=args.n_estimators, max_depth=6, tree_method="hist", n_jobs=-1)
+            _, fit_s = timed(lambda: model.fit(X, y_train))
+            results[label] = model.predict(X)
+            print(f"{label:>12}: {X.shape[1]} cols  {matrix_mb(X):7.1f} MB in memory  "
+                  f"{file_mb(X, names, tmp, 'xgb_' + label):6.1f} MB on disk  fit {fit_s:5.2f}s")
+        print(f"max |prediction difference| dense vs csr: {np.abs(results['dense'] - results['csr']).max():.2e}")
+
+        print("\nNN / LSTM")
+        preprocessor = get_nn_preprocessor(sparse_output=True)
+        csr = preprocessor.fit_transform(X_train).astype(np.float32)
+        names = list(preprocessor.get_feature_names_out())
+        index_frame, vocab = to_index_form(csr, preprocessor, names)
+        forms = {"one-hot dense": (csr.toarray(), None), "one-hot csr": (csr, None), "index": (index_frame, vocab)}
+
+        has_tf = importlib.util.find_spec("tensorflow") is not None
+
+        for label, (X, form_vocab) in forms.items():
+            columns = list(X.columns) if isinstance(X, pd.DataFrame) else names
+            disk_mb = file_mb(X, columns, tmp, "nn_" + label.replace(" ", "_").replace("-", "_"))
+            line = f"{label:>13}: {X.shape[1]:3d} cols  {matrix_mb(X):7.1f} MB in memory  {disk_mb:6.1f} MB on disk"
+            if has_tf and label != "one-hot csr":
+                dense = X.to_numpy(np.float32) if isinstance(X, pd.DataFrame) else X
+                line += f"  1 epoch {fit_lstm(dense, y_train, form_vocab):5.1f}s"
+            print(line)
+        if not has_tf:
+            print("(LSTM fit times skipped: tensorflow is not installed)")
@@ -0,0 +1,75 @@
+"""
+Startup-time benchmark for the API process (one uvicorn worker's cold start).
+
+1. `python -X importtime -c "import app"` in a fresh interpreter: total import
+   time plus the slowest top-level packages (self + children).
+2. Lifespan startup and background artifact preload, timed in-process.
+
+Usage (from the repo root):
+    python benchmarks/startup_time.py --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+def measure_imports():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        capture_output=True, text=True, check=True
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            cumulative[match.group(4)] = (int(match.group(2)), depth)
+    return cumulative
+
+def measure_lifespan():
+    sys.path.append(os.getcwd())
+    os.environ["PRELOAD_ARTIFACTS"] = "true"
+    from fastapi.testclient import TestClient
+    import app
+
+    start = time.perf_counter()
+    with TestClient(app.app) as client:
+        started = time.perf_counter() - start
+        body = client.get("/ready").json()
+        while body["preload"] == "running":
+            time.sleep(0.01)
+            body = client.get("/ready").json()
+    return started, body
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure_imports() for _ in range(args.runs)]
+    totals = [run["app"][0] / 1000 for run in runs]
+    print(f"import app: median {statistics.median(totals):.1f} ms over {args.runs} runs "
+          f"(min {min(totals):.1f}, max {max(totals):.1f})")
+
+    print("\nSlowest packages imported by app (median cumulative ms):")
+    direct = {name for name, (_, depth) in runs[0].items() if depth == 1}
+    medians = {
+        name: statistics.median(run[name][0] for run in runs if name in run) / 1000
+        for name in direct
+    }
+    for name, ms in sorted(medians.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<30} {ms:8.1f}")
+
+    started, ready = measure_lifespan()
+    print(f"\nLifespan startup: {started * 1000:.1f} ms")
+    print(f"Background preload: {ready['preload']} in {(ready['preload_seconds'] or 0) * 1000:.1f} ms")
+    for name, artifact in ready.get("artifacts", {}).items():
+        load = artifact["load_seconds"]
+        load_text = f"{load * 1000:.1f} ms" if load is not None else "not found"
+        print(f"  {name:<8} {load_text}")
@@ -0,0 +1,52 @@
+"""
+Synthetic raw sales data in the Kaggle schema, for the pipeline benchmarks.
+
+    python benchmarks/synthetic_data.py --stores 54 --families 33 --days 1700 --out data/raw/sales_data.csv
+
+54 stores x 33 families x 1700 days is ~3M rows, about the size of the full history.
+"""
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+FAMILIES = [
+    "AUTOMOTIVE", "BABY CARE", "BEAUTY", "BEVERAGES", "BOOKS", "BREAD/BAKERY", "CELEBRATION",
+    "CLEANING", "DAIRY", "DELI", "EGGS", "FROZEN FOODS", "GROCERY I", "GROCERY II", "HARDWARE",
+    "HOME AND KITCHEN I", "HOME AND KITCHEN II", "HOME APPLIANCES", "HOME CARE", "LADIESWEAR",
+    "LAWN AND GARDEN", "LINGERIE", "LIQUOR,WINE,BEER", "MAGAZINES", "MEATS", "PERSONAL CARE",
+    "PET SUPPLIES", "PLAYERS AND ELECTRONICS", "POULTRY", "PREPARED FOODS", "PRODUCE",
+    "SCHOOL AND OFFICE SUPPLIES", "SEAFOOD",
+]
+
+def make_sales_frame(stores: int = 54, families: int = 33, days: int = 1700, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2013-01-01", periods=days, freq="D")
+    family_names = [FAMILIES[i % len(FAMILIES)] + ("" if i < len(FAMILIES) else f" {i}") for i in range(families)]
+
+    n_rows = days * stores * families
+    df = pd.DataFrame({
+        "id": np.arange(n_rows),
+        "date": np.repeat(dates.strftime("%Y-%m-%d"), stores * families),
+        "store_nbr": np.tile(np.repeat(np.arange(1, stores + 1), families), days),
+        "family": np.tile(family_names, stores * days),
+        "sales": np.round(rng.gamma(2.0, 50.0, n_rows), 3),
+        "onpromotion": rng.poisson(0.5, n_rows),
+    })
+    return df
+
+def write_sales_csv(path: str, **kwargs) -> str:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    make_sales_frame(**kwargs).to_csv(path, index=False)
+    return path
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    parser.add_argument("--out", type=str, default=os.path.join("data", "raw", "sales_data.csv"))
+    args = parser.parse_args()
+
+    write_sales_csv(args.out, stores=args.stores, families=args.families, days=args.days)
+    print(f"Wrote {args.out}")
@@ -0,0 +1,78 @@
+"""
+Benchmark: validate + clean with the original schema (coerced copy discarded,
+clean_data converts dtypes again) vs each VALIDATION_MODE, whose coerced
+frame clean_data reuses. Then a chunked load followed by a separate validation
+pass vs load_data(validate=True), which validates each chunk as it is read.
+
+Usage (from the repo root):
+    python benchmarks/validation_modes.py --days 1700
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+import pandera as pa
+from pandera import Column, Check
+
+sys.path.append(os.getcwd())
+
+from benchmarks.synthetic_data import make_sales_frame
+from src.data_processing.clean import clean_data
+from src.data_processing.load import load_data
+from src.data_processing.validate import validate_data, VALIDATION_MODES
+
+LegacySchema = pa.DataFrameSchema({
+    "date": Column(pa.DateTime, coerce=True),
+    "store_nbr": Column(pa.Int, Check.greater_than_or_equal_to(1), coerce=True),
+    "family": Column(pa.String, coerce=True),
+    "sales": Column(pa.Float, Check.greater_than_or_equal_to(0.0), coerce=True),
+    "onpromotion": Column(pa.Int, Check.greater_than_or_equal_to(0), coerce=True),
+})
+
+def loaded_frame(args) -> pd.DataFrame:
+    """
+    What load_data(typed=True) returns for a file that passes the schema.
+    """
+    df = make_sales_frame(stores=args.stores, families=args.families, days=args.days).drop(columns=["id"])
+    df["date"] = pd.to_datetime(df["date"])
+    df["sales"] = df["sales"].fillna(0.0).clip(lower=0.0)
+    df["onpromotion"] = df["onpromotion"].fillna(0)
+    return df.astype({"store_nbr": "int32", "family": "category", "sales": "float32", "onpromotion": "float32"})
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--stores", type=int, default=54)
+    parser.add_argument("--families", type=int, default=33)
+    parser.add_argument("--days", type=int, default=1700)
+    args = parser.parse_args()
+
+    df = loaded_frame(args)
+    print(f"{len(df):,} rows")
+
+    _, validate_s = timed(lambda: LegacySchema.validate(df, lazy=True))
+    _, clean_s = timed(lambda: clean_data(df.copy(deep=False)))
+    print(f"{'original':>9}: validate {validate_s:5.2f}s  clean {clean_s:5.2f}s  total {validate_s + clean_s:5.2f}s")
+
+    for mode in VALIDATION_MODES:
+        validated, validate_s = timed(lambda: validate_data(df, mode=mode))
+        _, clean_s = timed(lambda: clean_data(validated))
+        print(f"{mode:>9}: validate {validate_s:5.2f}s  clean {clean_s:5.2f}s  total {validate_s + clean_s:5.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales_data.csv")
+        df.to_csv(path, index=False)
+
+        def load_then_validate():
+            loaded = load_data(path, typed=True, chunksize=500_000)
+            LegacySchema.validate(loaded, lazy=True)
+
+        _, separate_s = timed(load_then_validate)
+        _, streamed_s = timed(lambda: load_data(path, typed=True, chunksize=500_000, validate=True))
+        print(f"load + validate pass: {separate_s:5.2f}s   validate per chunk while loading: {streamed_s:5.2f}s")
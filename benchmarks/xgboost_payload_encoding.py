@@ -0,0 +1,61 @@
+"""
+Micro-benchmark: XGBoost CSV payload encoding per request.
+
+- pandas: the original list -> DataFrame -> to_csv round-trip
+- repr join: float array -> ",".join(map(repr, row)) text (the first array-based encoder)
+- bytes: Preprocessor.preprocess_xgboost, one float32 %-format into a bytes body
+
+All three must give XGBoost the same float32 values.
+
+Usage (from the repo root):
+    python benchmarks/xgboost_payload_encoding.py
+"""
+import io
+import os
+import sys
+import timeit
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.getcwd())
+
+from src.inference.preprocess import Preprocessor
+
+N_COLUMNS = 43  # width of the XGBoost feature layout
+
+def pandas_preprocess_xgboost(input_data):
+    df = pd.DataFrame(input_data)
+    return df.to_csv(header=False, index=False).strip().encode("utf-8")
+
+def repr_join_preprocess_xgboost(input_data):
+    rows = np.asarray(input_data, dtype=np.float64).tolist()
+    return "\n".join([",".join(map(repr, row)) for row in rows]).encode("utf-8")
+
+def as_float32(payload):
+    return pd.read_csv(io.BytesIO(payload), header=None, dtype=np.float32).to_numpy()
+
+def per_call_us(func, rows):
+    number = max(1, 2000 // len(rows))
+    return min(timeit.repeat(lambda: func(rows), number=number, repeat=5)) / number * 1e6
+
+if __name__ == "__main__":
+    preprocessor = Preprocessor()
+    preprocessor.xgb_scaler = None
+    rng = np.random.default_rng(42)
+
+    print(f"{'rows':>7} {'pandas (us)':>12} {'repr join (us)':>15} {'bytes (us)':>11} {'vs pandas':>10} {'vs repr':>8}")
+    for n_rows in (1, 100, 10_000):
+        # Scaled numeric columns plus 0/1 one-hot columns, as the fitted preprocessor outputs
+        values = rng.standard_normal((n_rows, N_COLUMNS))
+        values[:, 10:] = values[:, 10:] > 1.5
+        rows = values.tolist()
+
+        expected = as_float32(pandas_preprocess_xgboost(rows))
+        np.testing.assert_array_equal(as_float32(repr_join_preprocess_xgboost(rows)), expected)
+        np.testing.assert_array_equal(as_float32(preprocessor.preprocess_xgboost(rows)), expected)
+
+        legacy = per_call_us(pandas_preprocess_xgboost, rows)
+        repr_join = per_call_us(repr_join_preprocess_xgboost, rows)
+        fast = per_call_us(preprocessor.preprocess_xgboost, rows)
+        print(f"{n_rows:>7} {legacy:>12.1f} {repr_join:>15.1f} {fast:>11.1f} "
+              f"{legacy / fast:>9.1f}x {repr_join / fast:>7.1f}x")
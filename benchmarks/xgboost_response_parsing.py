@@ -0,0 +1,42 @@
+"""
+Benchmark: parsing an XGBoost endpoint response of 100k predictions.
+
+Compares the previous str.replace/split/float() loop with the bulk NumPy
+parser (as a float32 buffer and as the list handed to the API response).
+
+Usage (from the repo root):
+    python benchmarks/xgboost_response_parsing.py
+"""
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.append(os.getcwd())
+
+from src.inference.postprocess import Postprocessor
+
+def legacy_postprocess_xgboost(raw_response):
+    response_str = raw_response.decode("utf-8")
+    clean_str = response_str.replace('[', '').replace(']', '').replace('\n', ',')
+    return [float(x) for x in clean_str.split(',') if x.strip()]
+
+if __name__ == "__main__":
+    postprocessor = Postprocessor()
+    predictions = np.random.default_rng(42).random(100_000).astype(np.float32) * 1000
+    raw_response = "\n".join(map(repr, predictions.tolist())).encode("utf-8")
+    print(f"Response: {len(predictions):,} predictions, {len(raw_response) / 1024:.0f} KB")
+
+    cases = [
+        ("legacy float() loop", lambda: legacy_postprocess_xgboost(raw_response)),
+        ("numpy -> list", lambda: postprocessor.postprocess_xgboost(raw_response)),
+        ("numpy float32 buffer", lambda: postprocessor.postprocess_xgboost_array(raw_response)),
+    ]
+    for label, fn in cases:
+        seconds = timeit.timeit(fn, number=10) / 10
+        print(f"{label:>22}: {seconds * 1e3:7.2f} ms")
+
+    buffer = postprocessor.postprocess_xgboost_array(raw_response)
+    as_list = postprocessor.postprocess_xgboost(raw_response)
+    list_bytes = sys.getsizeof(as_list) + sum(sys.getsizeof(x) for x in as_list)
+    print(f"Memory: float32 buffer {buffer.nbytes / 1024:.0f} KB vs list of floats {list_bytes / 1024:.0f} KB")
@@ -3,6 +3,15 @@ import numpy as np
 import sys
 from src.utils.logger import logger
 from src.utils.exception import CustomException
+from src.data_processing.frame_order import sort_frame
+
+SORT_KEYS = ['store_nbr', 'family', 'date']
+CLEAN_DTYPES = {
+    'store_nbr': 'int32',
+    'onpromotion': 'int32',
+    'sales': 'float32',
+    'family': 'category',
+}
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -19,18 +28,32 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     try:
         # --- 1. STRING NORMALIZATION ---
         if 'family' in df.columns:
-            if df['family'].dtype == 'object':
+            if isinstance(df['family'].dtype, pd.CategoricalDtype):
+                # Typed loads: normalise the few categories, not every row
+                categories = df['family'].cat.categories
+                normalized = categories.str.strip().str.upper()
+                if not normalized.equals(categories):
+                    unique = normalized.unique().sort_values()
+                    remap = unique.get_indexer(normalized)  # old code -> new code
+                    codes = df['family'].cat.codes.to_numpy()
+                    df['family'] = pd.Categorical.from_codes(
+                        np.where(codes >= 0, remap[codes], -1), categories=unique
+                    )
+            elif pd.api.types.is_object_dtype(df['family']) or pd.api.types.is_string_dtype(df['family']):
+                # object (pandas < 3) or the default str dtype (pandas >= 3)
                 df['family'] = df['family'].str.strip().str.upper()
 
         # --- 2. REMOVE DUPLICATES ---
-        initial_rows = df.shape[0]
-        df = df.drop_duplicates()
-        if df.shape[0] != initial_rows:
-            logger.info(f"Removed {initial_rows - df.shape[0]} duplicate rows.")
+        # Only materialise a filtered frame when there is something to drop
+        duplicated = df.duplicated()
+        if duplicated.any():
+            df = df[~duplicated.to_numpy()]
+            logger.info(f"Removed {int(duplicated.sum())} duplicate rows.")
         
         # --- 4. FILL NULLS ---
-        df['sales'] = df['sales'].fillna(0.0)
-        df['onpromotion'] = df['onpromotion'].fillna(0)
+        for col, fill in (('sales', 0.0), ('onpromotion', 0)):
+            if df[col].hasnans:
+                df[col] = df[col].fillna(fill)
 
         # --- 5. NEGATIVE SALES HANDLING ---
         min_sales = df['sales'].min()
@@ -39,17 +62,18 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
             df['sales'] = df['sales'].clip(lower=0.0)
 
         # --- 6. TYPE CONVERSION ---
-        df['store_nbr'] = df['store_nbr'].astype('int32')
-        df['onpromotion'] = df['onpromotion'].astype('int32')
-        df['sales'] = df['sales'].astype('float32')
-        df['family'] = df['family'].astype('category') 
+        # Columns already in their target dtype (typed loads) are left untouched
+        for col, dtype in CLEAN_DTYPES.items():
+            if df[col].dtype != dtype:
+                df[col] = df[col].astype(dtype)
         
         # Drop ID if present
         if 'id' in df.columns:
             df = df.drop(columns=['id'])
 
         # --- 7. FINAL SORTING (CRITICAL) ---
-        df = df.sort_values(by=['store_nbr', 'family', 'date'])
+        # Skipped when the input is already in this order
+        df = sort_frame(df, SORT_KEYS)
 
         logger.info(f"Cleaning complete. Final Shape: {df.shape}")
         return df
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from src.utils.logger import logger
+
+def _key_values(series: pd.Series) -> np.ndarray:
+    # Categoricals sort by category order, i.e. by their codes
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy()
+    return series.to_numpy()
+
+def is_sorted_by(df: pd.DataFrame, keys: list) -> bool:
+    """
+    True when rows are already in ascending lexicographic order of `keys`.
+    One vectorized pass per key (O(n)), much cheaper than a multi-key sort.
+    """
+    if len(df) < 2:
+        return True
+    tied = np.ones(len(df) - 1, dtype=bool)  # rows equal to their predecessor on all keys so far
+    for key in keys:
+        values = _key_values(df[key])
+        if pd.isna(values).any():
+            return False
+        current, previous = values[1:], values[:-1]
+        if (tied & (current < previous)).any():
+            return False
+        tied &= current == previous
+        if not tied.any():
+            break
+    return True
+
+def sort_frame(df: pd.DataFrame, keys: list, stable_key: str = None) -> pd.DataFrame:
+    """
+    Sorts by `keys` unless the frame is already in that order (then returns it as is).
+    stable_key: when the frame is already sorted by the remaining keys, a stable sort on this
+    single key alone gives the full order (e.g. (store, family, date) -> (date, store, family)).
+    """
+    if is_sorted_by(df, keys):
+        logger.info(f"Already sorted by {keys}; skipping sort.")
+        return df
+
+    if stable_key is not None and keys[0] == stable_key and is_sorted_by(df, keys[1:]):
+        order = np.argsort(_key_values(df[stable_key]), kind="stable")
+        return df.iloc[order]
+
+    return df.sort_values(by=keys)
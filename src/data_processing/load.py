@@ -1,23 +1,109 @@
 import pandas as pd
 import os
 import sys
+import time
 from src.utils.logger import logger
 from src.utils.exception import CustomException
+from src.utils.profiling import peak_rss_mb
+from src.data_processing.validate import validate_chunks, validate_data
 
-def load_data(file_path: str) -> pd.DataFrame:
+# Raw Kaggle sales schema, read straight into the dtypes clean_data works with.
+# sales/onpromotion stay float on read so missing values survive until clean_data fills them.
+RAW_COLUMNS = ["date", "store_nbr", "family", "sales", "onpromotion"]
+RAW_DTYPES = {
+    "store_nbr": "int32",
+    "family": "category",
+    "sales": "float32",
+    "onpromotion": "float32",
+}
+
+def typed_read_kwargs(usecols=None, dtypes=None) -> dict:
+    """
+    read_csv arguments for the typed loader: column pruning, explicit dtypes, date parsing.
+    """
+    usecols = usecols or RAW_COLUMNS
+    return {
+        "usecols": usecols,
+        "dtype": {col: dtype for col, dtype in (dtypes or RAW_DTYPES).items() if col in usecols},
+        "parse_dates": ["date"] if "date" in usecols else None,
+    }
+
+def iter_data_chunks(file_path: str, chunksize: int = 500_000, usecols=None, dtypes=None):
+    """
+    Yields typed DataFrame chunks of the raw sales file.
+    """
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, **typed_read_kwargs(usecols, dtypes)):
+        yield chunk
+
+def concat_chunks(chunks) -> pd.DataFrame:
+    """
+    Concatenates chunks while keeping categorical columns categorical
+    (pd.concat falls back to object when chunks saw different categories).
+    """
+    chunks = list(chunks)
+    if not chunks:
+        raise ValueError("No data read from file.")
+
+    for col in chunks[0].select_dtypes(include="category").columns:
+        categories = pd.api.types.union_categoricals(
+            [chunk[col] for chunk in chunks], sort_categories=True
+        ).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+
+    return pd.concat(chunks, ignore_index=True)
+
+def load_data(file_path: str, typed: bool = False, chunksize: int = None, engine: str = "c",
+              usecols=None, dtypes=None, validate: bool = False) -> pd.DataFrame:
+    """
+    Loads the raw sales CSV.
+
+    typed=False: plain read_csv with inferred dtypes (original behaviour).
+    typed=True:  explicit dtypes (RAW_DTYPES), date parsing and usecols pruning on read,
+                 optionally in `chunksize` row chunks, or with engine='pyarrow'
+                 (multi-threaded, reads the whole file at once).
+    validate=True: also validates against SalesSchema (VALIDATION_MODE) and returns the
+                 coerced frame; chunked reads validate each chunk as it arrives.
+    Logs rows/s and the process peak RSS.
+    """
     logger.info(f"Initiating data load from: {file_path}")
-    
+
     try:
-        
+
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"The file '{file_path}' does not exist. Check your path.")
 
-        df = pd.read_csv(file_path)
-        
-        original_mem = df.memory_usage().sum() / 1024**2
+        start = time.perf_counter()
+        validated = False
+
+        if not typed:
+            df = pd.read_csv(file_path)
+        elif engine == "pyarrow":
+            if chunksize:
+                logger.warning("pyarrow engine does not support chunked reads; reading whole file.")
+            df = pd.read_csv(file_path, engine="pyarrow", **typed_read_kwargs(usecols, dtypes))
+        elif chunksize:
+            chunks = iter_data_chunks(file_path, chunksize, usecols, dtypes)
+            if validate:
+                chunks, validated = validate_chunks(chunks), True
+            df = concat_chunks(chunks)
+        else:
+            df = pd.read_csv(file_path, **typed_read_kwargs(usecols, dtypes))
+
+        if validate and not validated:
+            df = validate_data(df)
+
+        elapsed = time.perf_counter() - start
+        original_mem = df.memory_usage(deep=typed).sum() / 1024**2
         logger.info(f"Initial Memory Usage: {original_mem:.2f} MB")
-        
+
+        rss = peak_rss_mb()
+        logger.info(
+            f"Loaded {len(df):,} rows in {elapsed:.2f}s ({len(df) / max(elapsed, 1e-9):,.0f} rows/s)"
+            + (f", peak RSS {rss:.0f} MB" if rss is not None else "")
+        )
+
         return df
 
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
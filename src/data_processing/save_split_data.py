@@ -1,23 +1,43 @@
 import os
 import sys
+import hashlib
+import shutil
 import pandas as pd
 import numpy as np
 import joblib
-from src.data_processing.transform import get_xgboost_preprocessor, get_nn_preprocessor
+import json
+from scipy import sparse
+from src.data_processing.transform import (
+    get_xgboost_preprocessor, get_nn_preprocessor, xgboost_matrix, to_index_form, category_vocabulary,
+    is_sparse_one_hot
+)
+from src.data_processing.storage import save_splits, save_frame, save_category_vocab
+from src.data_processing.frame_order import sort_frame
+from src.features.sequence_windows import series_lengths
 from src.utils.logger import logger
 from src.utils.exception import CustomException
 
-def split_data_time_series(df, test_days=16):
+DATE_ORDER = ['date', 'store_nbr', 'family']
+SERIES_ORDER = ['store_nbr', 'family', 'date']
+
+XGB_PREPROCESSOR_PATH = os.path.join("artifacts", "preprocessor_xgboost.pkl")
+
+def split_data_time_series(df, test_days=16, order=DATE_ORDER):
     """
     Splits data based on time. The last 'test_days' become the test set.
+    order: row order of both splits, DATE_ORDER or SERIES_ORDER (each series contiguous, for windowing).
     """
-    df = df.sort_values(by=['date', 'store_nbr', 'family'])
+    # Frames coming from clean_data / add_lag_features are already in (store, family, date)
+    # order, so a stable sort on date alone gives (date, store, family) and SERIES_ORDER needs no sort
+    df = sort_frame(df, order, stable_key='date')
     
     max_date = df['date'].max()
     cutoff_date = max_date - pd.Timedelta(days=test_days)
     
-    train_df = df[df['date'] <= cutoff_date].copy()
-    test_df = df[df['date'] > cutoff_date].copy()
+    # Boolean selection already returns new frames; no extra .copy()
+    in_train = (df['date'] <= cutoff_date).to_numpy()
+    train_df = df[in_train]
+    test_df = df[~in_train]
     
     logger.info(f"Time Split - Cutoff: {cutoff_date}")
     logger.info(f"Train Shape: {train_df.shape}, Test Shape: {test_df.shape}")
@@ -29,7 +49,8 @@ def process_and_save_xgboost(df: pd.DataFrame):
     1. Splits data (Train/Test).
     2. Fits XGBoost Preprocessor on Train.
     3. Transforms both.
-    4. Saves to data/post/xgboost/ WITH HEADER NAMES.
+    4. Saves to data/post/xgboost/ WITH HEADER NAMES (PROCESSED_DATA_FORMAT, or sparse .npz with SPARSE_FEATURES=true).
+       With XGBOOST_FEATURE_MODE=categorical: integer-coded 'family'/'store_nbr' plus category_vocab.json.
     """
     logger.info("Starting XGBoost Data Processing...")
     try:
@@ -49,8 +70,9 @@ def process_and_save_xgboost(df: pd.DataFrame):
         logger.info("Fitting XGBoost Preprocessor on Train data...")
         
         # Fit on Train ONLY to avoid leakage
-        X_train_processed = preprocessor.fit_transform(X_train)
-        X_test_processed = preprocessor.transform(X_test)
+        # CSR keeps every numeric value (zeros included): XGBoost reads absent entries as missing
+        X_train_processed = xgboost_matrix(preprocessor.fit_transform(X_train), preprocessor)
+        X_test_processed = xgboost_matrix(preprocessor.transform(X_test), preprocessor)
 
         # --- NEW: Get Feature Names ---
         feature_names = preprocessor.get_feature_names_out()
@@ -58,35 +80,153 @@ def process_and_save_xgboost(df: pd.DataFrame):
 
         # 4. Save Artifacts
         os.makedirs("artifacts", exist_ok=True)
-        joblib.dump(preprocessor, "artifacts/preprocessor_xgboost.pkl")
+        joblib.dump(preprocessor, XGB_PREPROCESSOR_PATH)
 
-        # Save Data (CSV)
+        # Save Data (PROCESSED_DATA_FORMAT: parquet, feather or csv)
         save_dir = os.path.join("data", "post", "xgboost")
-        os.makedirs(save_dir, exist_ok=True)
-        
-        # Save with columns names
-        pd.DataFrame(X_train_processed, columns=feature_names).to_csv(os.path.join(save_dir, "train.csv"), index=False)
-        pd.DataFrame(y_train).to_csv(os.path.join(save_dir, "train_target.csv"), index=False)
         
-        pd.DataFrame(X_test_processed, columns=feature_names).to_csv(os.path.join(save_dir, "test.csv"), index=False)
-        pd.DataFrame(y_test).to_csv(os.path.join(save_dir, "test_target.csv"), index=False)
+        # Save with columns names, as float32
+        save_splits(save_dir, feature_names, X_train_processed, y_train, X_test_processed, y_test)
+        # Tells the training script which columns to treat as categorical (none in one_hot mode)
+        save_category_vocab(save_dir, category_vocabulary(preprocessor))
         
         logger.info(f"XGBoost data saved to {save_dir}")
 
     except Exception as e:
         raise CustomException(e, sys)
 
+def preprocessor_fits(fitted, features: pd.DataFrame) -> bool:
+    """
+    True when a fitted XGBoost preprocessor transforms `features` the way a refit would:
+    same configuration (columns, encoders, sparse / categorical mode) and no unseen categories.
+    """
+    def configuration(column_transformer):
+        return column_transformer.sparse_threshold, [
+            (name, repr(pipeline), list(columns)) for name, pipeline, columns in column_transformer.transformers
+        ]
+
+    if configuration(fitted) != configuration(get_xgboost_preprocessor()):
+        return False
+    for _, pipeline, columns in fitted.transformers_:
+        steps = {} if isinstance(pipeline, str) else dict(pipeline.steps)
+        encoder = steps.get("one_hot") or steps.get("ordinal")
+        if encoder is None:
+            continue
+        for column, categories in zip(columns, encoder.categories_):
+            if not np.isin(np.asarray(features[column].dropna().unique()), categories).all():
+                return False
+    return True
+
+def file_sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def processed_part_path(cache_dir: str, part: str, matrix=None) -> str:
+    """
+    Cached XGBoost matrix of a feature part: <part>.npz (CSR) or <part>.npy (dense).
+    Without `matrix`, the existing file (None when the part is not processed yet).
+    """
+    base = os.path.join(cache_dir, os.path.splitext(os.path.basename(part))[0])
+    if matrix is not None:
+        return base + (".npz" if sparse.issparse(matrix) else ".npy")
+    return next((path for path in (base + ".npz", base + ".npy") if os.path.exists(path)), None)
+
+def processed_cache_is_current(cache_dir: str) -> bool:
+    tag_path = os.path.join(cache_dir, "preprocessor.sha256")
+    if not os.path.exists(tag_path):
+        return False
+    with open(tag_path) as f:
+        return f.read() == file_sha256(XGB_PREPROCESSOR_PATH)
+
+def reset_processed_cache(cache_dir: str):
+    """
+    Empties the processed-part cache and tags it with the current preprocessor.
+    """
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.makedirs(cache_dir)
+    with open(os.path.join(cache_dir, "preprocessor.sha256"), "w") as f:
+        f.write(file_sha256(XGB_PREPROCESSOR_PATH))
+
+def process_and_save_xgboost_incremental(builder):
+    """
+    Step 6 for incremental runs (INCREMENTAL_FEATURES): transforms only the feature parts not
+    processed yet, with the persisted XGBoost preprocessor, and caches each part's matrix in
+    <state_dir>/processed. The splits are then cut from the cached matrices by date.
+    Refits on all parts (process_and_save_xgboost) when there is no persisted preprocessor or
+    the new rows need a different one (configuration changed, unseen categories).
+    """
+    logger.info("Starting incremental XGBoost Data Processing...")
+    try:
+        cache_dir = os.path.join(builder.state_dir, "processed")
+        parts = builder.feature_parts()
+
+        fitted = joblib.load(XGB_PREPROCESSOR_PATH) if os.path.exists(XGB_PREPROCESSOR_PATH) else None
+        if fitted is not None and not processed_cache_is_current(cache_dir):
+            # Cached matrices from another preprocessor: rebuild them with this one
+            reset_processed_cache(cache_dir)
+
+        pending = [part for part in parts if fitted is None or processed_part_path(cache_dir, part) is None]
+        new_features = {part: pd.read_parquet(part) for part in pending}
+        if fitted is None or not all(preprocessor_fits(fitted, frame) for frame in new_features.values()):
+            logger.info("No reusable XGBoost preprocessor: refitting on all feature parts.")
+            process_and_save_xgboost(builder.load_features())
+            fitted = joblib.load(XGB_PREPROCESSOR_PATH)
+            reset_processed_cache(cache_dir)
+            pending, new_features = parts, None
+
+        for part in pending:
+            features = new_features[part] if new_features is not None else pd.read_parquet(part)
+            if features.empty:
+                # A run with no new days: an empty block keeps parts and matrices aligned
+                width = len(fitted.get_feature_names_out())
+                matrix = sparse.csr_matrix((0, width), dtype=np.float32) if is_sparse_one_hot(fitted) else np.empty((0, width), dtype=np.float32)
+            else:
+                X = features.drop(columns=['sales', 'id', 'date'], errors='ignore')
+                matrix = xgboost_matrix(fitted.transform(X), fitted)
+            path = processed_part_path(cache_dir, part, matrix)
+            if sparse.issparse(matrix):
+                sparse.save_npz(path, matrix, compressed=False)
+            else:
+                np.save(path, matrix, allow_pickle=False)
+        logger.info(f"Transformed {len(pending)} of {len(parts)} feature parts.")
+        if new_features is None:
+            # process_and_save_xgboost has already written the splits
+            return
+
+        # Same rows and order as process_and_save_xgboost(builder.load_features())
+        keys = builder.load_features(columns=['date', 'store_nbr', 'family', 'sales'])
+        train_keys, test_keys = split_data_time_series(keys.assign(_row=np.arange(len(keys))))
+        matrices = [
+            sparse.load_npz(path) if path.endswith(".npz") else np.load(path)
+            for path in (processed_part_path(cache_dir, part) for part in parts)
+        ]
+        X_all = sparse.vstack(matrices, format="csr") if sparse.issparse(matrices[0]) else np.concatenate(matrices)
+        X_train, X_test = X_all[train_keys['_row'].to_numpy()], X_all[test_keys['_row'].to_numpy()]
+
+        save_dir = os.path.join("data", "post", "xgboost")
+        save_splits(save_dir, fitted.get_feature_names_out(), X_train, train_keys['sales'], X_test, test_keys['sales'])
+        save_category_vocab(save_dir, category_vocabulary(fitted))
+        logger.info(f"XGBoost data saved to {save_dir}")
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
 def process_and_save_nn(df: pd.DataFrame):
     """
     1. Splits data (Train/Test).
     2. Fits NN Preprocessor (StandardScaler) on Train.
     3. Transforms both.
-    4. Saves to data/post/nn/ WITH HEADER NAMES.
+    4. Saves to data/post/nn/ WITH HEADER NAMES (PROCESSED_DATA_FORMAT, or sparse .npz with SPARSE_FEATURES=true),
+       plus train_index/test_index: the same rows with one integer index per one-hot column (for embeddings).
+    With LSTM_WINDOW > 1, rows are in (store, family, date) order and train_series/test_series hold
+    each series' row count, so the LSTM script can build sliding windows over them. Otherwise rows
+    keep the (date, store, family) order.
     """
     logger.info("Starting Neural Network Data Processing...")
     try:
-        # 1. Split Data
-        train_df, test_df = split_data_time_series(df)
+        # 1. Split Data (series by series for windowing, so consecutive rows are consecutive days)
+        windowed = int(os.getenv("LSTM_WINDOW", "1")) > 1
+        train_df, test_df = split_data_time_series(df, order=SERIES_ORDER if windowed else DATE_ORDER)
 
         # 2. Separate X and y
         target_col = 'sales'
@@ -111,16 +251,23 @@ def process_and_save_nn(df: pd.DataFrame):
         os.makedirs("artifacts", exist_ok=True)
         joblib.dump(preprocessor, "artifacts/preprocessor_nn.pkl")
 
-        # Save Data
+        # Save Data (PROCESSED_DATA_FORMAT: parquet, feather or csv)
         save_dir = os.path.join("data", "post", "nn")
-        os.makedirs(save_dir, exist_ok=True)
-        
-        # Save with columns names
-        pd.DataFrame(X_train_processed, columns=feature_names).to_csv(os.path.join(save_dir, "train.csv"), index=False)
-        pd.DataFrame(y_train).to_csv(os.path.join(save_dir, "train_target.csv"), index=False)
         
-        pd.DataFrame(X_test_processed, columns=feature_names).to_csv(os.path.join(save_dir, "test.csv"), index=False)
-        pd.DataFrame(y_test).to_csv(os.path.join(save_dir, "test_target.csv"), index=False)
+        # Save with columns names, as float32
+        save_splits(save_dir, feature_names, X_train_processed, y_train, X_test_processed, y_test)
+
+        # Embedding-friendly form: <column>_idx integer columns instead of one-hot blocks
+        for name, X in (("train_index", X_train_processed), ("test_index", X_test_processed)):
+            frame, vocab = to_index_form(X, preprocessor, feature_names)
+            save_frame(frame, save_dir, name)
+        with open(os.path.join(save_dir, "index_vocab.json"), "w") as f:
+            json.dump(vocab, f)
+
+        # Series boundaries for sliding windows (store_nbr, family, rows)
+        if windowed:
+            save_frame(series_lengths(train_df), save_dir, "train_series")
+            save_frame(series_lengths(test_df), save_dir, "test_series")
         
         logger.info(f"Neural Network data saved to {save_dir}")
 
@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from src.utils.logger import logger
+from src.utils.exception import CustomException
+
+# Processed train/test splits: format -> file extension.
+# Parquet/Feather keep float32 columns and are read back without parsing text.
+PROCESSED_FORMATS = {"parquet": ".parquet", "feather": ".feather", "csv": ".csv"}
+PARQUET_COMPRESSION = "zstd"
+# Row groups are the unit the training script streams (--data-mode quantile/external):
+# smaller groups bound its peak memory, at a somewhat larger file (PARQUET_ROW_GROUP_ROWS)
+PARQUET_ROW_GROUP_ROWS = int(os.getenv("PARQUET_ROW_GROUP_ROWS", 250_000))
+
+# Sparse (CSR) feature matrices: scipy .npz, with the column names in FEATURE_NAMES_FILE
+SPARSE_EXTENSION = ".npz"
+FEATURE_NAMES_FILE = "feature_names.json"
+
+# Native categorical features: {column: categories}, code i = categories[i]
+CATEGORY_VOCAB_FILE = "category_vocab.json"
+
+def get_processed_format(fmt: str = None) -> str:
+    """
+    Resolves the processed-data format (argument, else PROCESSED_DATA_FORMAT, default parquet).
+    """
+    fmt = (fmt or os.getenv("PROCESSED_DATA_FORMAT", "parquet")).lower()
+    if fmt not in PROCESSED_FORMATS:
+        raise ValueError(f"Unsupported processed data format '{fmt}'. Use one of {list(PROCESSED_FORMATS)}.")
+    return fmt
+
+def save_frame(df: pd.DataFrame, save_dir: str, name: str, fmt: str = None) -> str:
+    """
+    Writes df to save_dir/<name>.<ext> and returns the path.
+    """
+    try:
+        fmt = get_processed_format(fmt)
+        path = os.path.join(save_dir, name + PROCESSED_FORMATS[fmt])
+
+        if fmt == "parquet":
+            df.to_parquet(path, index=False, compression=PARQUET_COMPRESSION, row_group_size=PARQUET_ROW_GROUP_ROWS)
+        elif fmt == "feather":
+            df.reset_index(drop=True).to_feather(path)
+        else:
+            df.to_csv(path, index=False)
+
+        return path
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def save_sparse_matrix(matrix, save_dir: str, name: str, feature_names) -> str:
+    """
+    Writes a float32 CSR matrix to save_dir/<name>.npz (column names to FEATURE_NAMES_FILE).
+    """
+    try:
+        path = os.path.join(save_dir, name + SPARSE_EXTENSION)
+        sparse.save_npz(path, sparse.csr_matrix(matrix, dtype=np.float32), compressed=True)
+        with open(os.path.join(save_dir, FEATURE_NAMES_FILE), "w") as f:
+            json.dump([str(name) for name in feature_names], f)
+        return path
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def read_sparse_matrix(path: str) -> tuple:
+    """
+    Reads a sparse split back as (CSR matrix, column names).
+    """
+    try:
+        with open(os.path.join(os.path.dirname(path), FEATURE_NAMES_FILE)) as f:
+            feature_names = json.load(f)
+        return sparse.load_npz(path).tocsr(), feature_names
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def save_category_vocab(save_dir: str, vocab: dict):
+    """
+    Writes the categorical columns' vocabulary next to the splits, or removes a stale one
+    when vocab is empty (the training script treats every column listed there as categorical).
+    """
+    try:
+        path = os.path.join(save_dir, CATEGORY_VOCAB_FILE)
+        if not vocab:
+            if os.path.exists(path):
+                os.remove(path)
+            return None
+        with open(path, "w") as f:
+            json.dump(vocab, f)
+        logger.info(f"Saved category vocabulary ({', '.join(f'{k}: {len(v)}' for k, v in vocab.items())}) to {path}")
+        return path
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def read_frame(path: str, columns=None) -> pd.DataFrame:
+    """
+    Reads a processed split, picking the reader from the file extension.
+    Sparse splits come back dense, so read only the columns you need.
+    """
+    try:
+        ext = os.path.splitext(path)[1].lower()
+        if ext == SPARSE_EXTENSION:
+            matrix, feature_names = read_sparse_matrix(path)
+            columns = list(columns) if columns is not None else feature_names
+            positions = [feature_names.index(column) for column in columns]
+            return pd.DataFrame(matrix[:, positions].toarray(), columns=columns)
+        if ext == ".parquet":
+            return pd.read_parquet(path, columns=columns)
+        if ext == ".feather":
+            return pd.read_feather(path, columns=columns)
+        return pd.read_csv(path, usecols=columns)
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def find_split_file(directory: str, name: str) -> str:
+    """
+    Returns directory/<name>.<ext> for the first format present (parquet, feather, csv, npz).
+    """
+    for ext in list(PROCESSED_FORMATS.values()) + [SPARSE_EXTENSION]:
+        path = os.path.join(directory, name + ext)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No '{name}' split found in {directory}.")
+
+def save_splits(save_dir: str, feature_names, X_train, y_train, X_test, y_test, fmt: str = None) -> dict:
+    """
+    Saves the transformed train/test matrices (as float32, with column names) and targets.
+    Sparse (CSR) matrices are kept sparse as .npz; targets always use `fmt`.
+    """
+    try:
+        fmt = get_processed_format(fmt)
+        os.makedirs(save_dir, exist_ok=True)
+
+        paths = {}
+        for name, X in (("train", X_train), ("test", X_test)):
+            if sparse.issparse(X):
+                paths[name] = save_sparse_matrix(X, save_dir, name, feature_names)
+            else:
+                frame = pd.DataFrame(X, columns=feature_names).astype("float32")
+                paths[name] = save_frame(frame, save_dir, name, fmt)
+        for name, y in (("train_target", y_train), ("test_target", y_test)):
+            paths[name] = save_frame(pd.DataFrame(y).astype("float32"), save_dir, name, fmt)
+
+        # A split left over in another format would shadow this one in find_split_file
+        for name, path in paths.items():
+            for ext in list(PROCESSED_FORMATS.values()) + [SPARSE_EXTENSION]:
+                stale = os.path.join(save_dir, name + ext)
+                if stale != path and os.path.exists(stale):
+                    os.remove(stale)
+
+        matrix_format = "sparse npz" if sparse.issparse(X_train) else fmt
+        logger.info(f"Saved processed splits ({matrix_format} features, {fmt} targets) to {save_dir}")
+        return paths
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -1,21 +1,52 @@
+import os
 import sys
+import numpy as np
+import pandas as pd
+from scipy import sparse
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder, StandardScaler, MinMaxScaler
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler, MinMaxScaler
 from sklearn.impute import SimpleImputer
+from src.features.lag_features import lag_feature_names
 from src.utils.exception import CustomException
 
-def get_xgboost_preprocessor():
+def sparse_features_enabled(sparse_output=None) -> bool:
+    """
+    Whether the preprocessors emit CSR matrices (argument, else SPARSE_FEATURES, default false).
+    """
+    if sparse_output is not None:
+        return sparse_output
+    return os.getenv("SPARSE_FEATURES", "false").lower() == "true"
+
+XGBOOST_FEATURE_MODES = ("one_hot", "categorical")
+
+def xgboost_feature_mode(mode: str = None) -> str:
+    """
+    How the XGBoost preprocessor encodes categoricals (argument, else XGBOOST_FEATURE_MODE, default one_hot):
+    one_hot expands 'family' into one column per category; categorical emits one integer code
+    per column ('family', 'store_nbr') for XGBoost's native categorical splits.
+    """
+    mode = (mode or os.getenv("XGBOOST_FEATURE_MODE", "one_hot")).lower()
+    if mode not in XGBOOST_FEATURE_MODES:
+        raise ValueError(f"Unknown XGBoost feature mode '{mode}', expected one of {XGBOOST_FEATURE_MODES}")
+    return mode
+
+def get_xgboost_preprocessor(lags=None, windows=None, spec=None, sparse_output=None, feature_mode=None):
     """
     Pipeline for XGBoost (WITH LAGS).
     Features: [lags, rolling, day_of_week, month, year, onpromotion, store_nbr, family]
+    Lag/rolling/EWMA columns follow the add_lag_features FeatureSpec.
+    sparse_output: CSR output with sparse one-hot blocks (see sparse_features_enabled).
+    feature_mode: one_hot or categorical (see xgboost_feature_mode).
     """
     try:
+        if xgboost_feature_mode(feature_mode) == "categorical":
+            return get_xgboost_categorical_preprocessor(lags, windows, spec)
+
+        sparse_output = sparse_features_enabled(sparse_output)
         xgboost_cat_cols = ['family']
         # INCLUDE LAGS HERE
-        xgboost_num_cols = [
-            'lag_1', 'lag_7', 'lag_14', 
-            'roll_7_mean', 'roll_14_mean', 
+        xgboost_num_cols = lag_feature_names(lags, windows, spec) + [
             'onpromotion', 'store_nbr', 'day_of_week', 'month', 'year'
         ]
 
@@ -25,24 +56,71 @@ def get_xgboost_preprocessor():
 
         cat_pipeline = Pipeline(steps=[
             ('imputer', SimpleImputer(strategy='most_frequent')),
-            ('one_hot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            ('one_hot', OneHotEncoder(handle_unknown='ignore', sparse_output=sparse_output))
+        ])
+
+        preprocessor = ColumnTransformer([
+            ('cat_trans', cat_pipeline, xgboost_cat_cols),
+            ('num_trans', num_pipeline, xgboost_num_cols)
+        ], remainder='drop', sparse_threshold=1.0 if sparse_output else 0.0)
+
+        return preprocessor
+    except Exception as e:
+        raise CustomException(e, sys)
+
+def get_xgboost_categorical_preprocessor(lags=None, windows=None, spec=None):
+    """
+    XGBoost pipeline for native categorical support: 'family' and 'store_nbr' become
+    integer codes (the fitted categories_ are the vocabulary, unknown values are missing),
+    so the matrix has one column per feature instead of a one-hot block.
+    """
+    try:
+        xgboost_cat_cols = ['family', 'store_nbr']
+        xgboost_num_cols = lag_feature_names(lags, windows, spec) + [
+            'onpromotion', 'day_of_week', 'month', 'year'
+        ]
+
+        num_pipeline = Pipeline(steps=[
+            ('imputer', SimpleImputer(strategy='median'))
+        ])
+
+        cat_pipeline = Pipeline(steps=[
+            ('imputer', SimpleImputer(strategy='most_frequent')),
+            ('ordinal', OrdinalEncoder(handle_unknown='use_encoded_value', unknown_value=np.nan))
         ])
 
         preprocessor = ColumnTransformer([
             ('cat_trans', cat_pipeline, xgboost_cat_cols),
             ('num_trans', num_pipeline, xgboost_num_cols)
-        ], remainder='drop') 
+        ], remainder='drop', sparse_threshold=0.0)
 
         return preprocessor
     except Exception as e:
         raise CustomException(e, sys)
 
-def get_nn_preprocessor():
+def category_vocabulary(column_transformer) -> dict:
+    """
+    Fitted ColumnTransformer -> {output feature name: categories} for its ordinal-encoded
+    columns, in code order (code i = categories[i]). Empty for one-hot preprocessors.
+    """
+    vocab = {}
+    feature_names = column_transformer.get_feature_names_out()
+    for name, pipeline, columns in column_transformer.transformers_:
+        if isinstance(pipeline, str) or "ordinal" not in dict(pipeline.steps):
+            continue
+        start = column_transformer.output_indices_[name].start
+        for offset, categories in enumerate(dict(pipeline.steps)["ordinal"].categories_):
+            vocab[str(feature_names[start + offset])] = categories.tolist()
+    return vocab
+
+def get_nn_preprocessor(sparse_output=None):
     """
     Pipeline for Neural Networks (NO LAGS).
     Features: [day_of_week, month, year, onpromotion, store_nbr, family]
+    sparse_output: CSR output with sparse one-hot blocks (see sparse_features_enabled).
     """
     try:
+        sparse_output = sparse_features_enabled(sparse_output)
         # NO LAGS HERE
         nn_scale_cols = ['onpromotion']
         
@@ -56,7 +134,7 @@ def get_nn_preprocessor():
 
         cat_pipeline = Pipeline(steps=[
             ('imputer', SimpleImputer(strategy='most_frequent')),
-            ('one_hot', OneHotEncoder(handle_unknown='ignore', sparse_output=False))
+            ('one_hot', OneHotEncoder(handle_unknown='ignore', sparse_output=sparse_output))
         ])
 
         year_pipeline = Pipeline(steps=[
@@ -68,8 +146,81 @@ def get_nn_preprocessor():
             ('num_trans', num_pipeline, nn_scale_cols),
             ('cat_trans', cat_pipeline, nn_cat_cols),
             ('year_trans', year_pipeline, nn_year_col)
-        ], remainder='drop')
+        ], remainder='drop', sparse_threshold=1.0 if sparse_output else 0.0)
 
         return preprocessor
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
+
+def one_hot_blocks(column_transformer) -> list:
+    """
+    Fitted ColumnTransformer -> [(input column, first output index, n categories)] per one-hot encoded column.
+    """
+    blocks = []
+    for name, pipeline, columns in column_transformer.transformers_:
+        if isinstance(pipeline, str) or "one_hot" not in dict(pipeline.steps):
+            continue
+        start = column_transformer.output_indices_[name].start
+        for column, categories in zip(columns, dict(pipeline.steps)["one_hot"].categories_):
+            blocks.append((column, start, len(categories)))
+            start += len(categories)
+    return blocks
+
+def is_sparse_one_hot(column_transformer) -> bool:
+    """
+    True when the fitted preprocessor emits sparse one-hot blocks (models trained on
+    XGBoost CSR matrices then read a one-hot 0 as missing, see xgboost_matrix).
+    """
+    return any(
+        getattr(dict(pipeline.steps)["one_hot"], "sparse_output", False)
+        for _, pipeline, _ in column_transformer.transformers_
+        if not isinstance(pipeline, str) and "one_hot" in dict(pipeline.steps)
+    )
+
+def xgboost_matrix(matrix, column_transformer):
+    """
+    Transformer output -> float32 CSR for XGBoost. XGBoost reads entries absent from a CSR
+    matrix as missing, so every non-one-hot value is stored, zeros included; only the
+    one-hot blocks are sparse. Dense input is returned as float32 unchanged.
+    """
+    if not sparse.issparse(matrix):
+        return np.asarray(matrix, dtype=np.float32)
+
+    n_rows, width = matrix.shape
+    is_one_hot = np.zeros(width, dtype=bool)
+    for _, start, n_categories in one_hot_blocks(column_transformer):
+        is_one_hot[start:start + n_categories] = True
+    dense_cols = np.flatnonzero(~is_one_hot)
+
+    one_hot = matrix.tocoo()
+    keep = is_one_hot[one_hot.col]
+    rows = np.concatenate([one_hot.row[keep], np.repeat(np.arange(n_rows), len(dense_cols))])
+    cols = np.concatenate([one_hot.col[keep], np.tile(dense_cols, n_rows)])
+    values = np.concatenate([one_hot.data[keep], matrix[:, dense_cols].toarray().ravel()])
+    return sparse.csr_matrix((values.astype(np.float32), (rows, cols)), shape=matrix.shape)
+
+def to_index_form(matrix, column_transformer, feature_names) -> tuple:
+    """
+    One-hot encoded matrix -> embedding-friendly frame: the non-one-hot columns as float32,
+    plus one int32 '<column>_idx' per one-hot column (0 = unknown category, i + 1 = category i).
+    Returns (frame, {'<column>_idx': vocabulary size incl. the unknown slot}).
+    """
+    matrix = sparse.csr_matrix(matrix)
+    blocks = one_hot_blocks(column_transformer)
+    is_one_hot = np.zeros(matrix.shape[1], dtype=bool)
+    columns, vocab = {}, {}
+
+    for column, start, n_categories in blocks:
+        is_one_hot[start:start + n_categories] = True
+        block = matrix[:, start:start + n_categories]
+        hot = np.asarray(block.sum(axis=1)).ravel() > 0
+        index = np.where(hot, np.asarray(block.argmax(axis=1)).ravel() + 1, 0)
+        columns[f"{column}_idx"] = index.astype(np.int32)
+        vocab[f"{column}_idx"] = n_categories + 1
+
+    dense_cols = np.flatnonzero(~is_one_hot)
+    dense = matrix[:, dense_cols].toarray().astype(np.float32)
+    frame = pd.DataFrame(dense, columns=[feature_names[i] for i in dense_cols])
+    for name, values in columns.items():
+        frame[name] = values
+    return frame, vocab
@@ -8,39 +8,130 @@ import sys
 from pandera import Column, Check
 
 # --- 1. Define the Schema ---
+# Coerces straight into the dtypes clean_data works with, so the validated frame is reused as-is
 SalesSchema = pa.DataFrameSchema({
     "date": Column(pa.DateTime, coerce=True),
-    "store_nbr": Column(pa.Int, Check.greater_than_or_equal_to(1), coerce=True),
-    "family": Column(pa.String, coerce=True),
-    "sales": Column(pa.Float, Check.greater_than_or_equal_to(0.0), coerce=True),
-    "onpromotion": Column(pa.Int, Check.greater_than_or_equal_to(0), coerce=True),
+    "store_nbr": Column(pa.Int32, Check.greater_than_or_equal_to(1), coerce=True),
+    "family": Column(pa.Category, coerce=True),
+    "sales": Column(pa.Float32, Check.greater_than_or_equal_to(0.0), coerce=True),
+    "onpromotion": Column(pa.Int32, Check.greater_than_or_equal_to(0), coerce=True),
 })
 
+# Same checks without coercion, for slices of a frame that SalesSchema.coerce_dtype already converted
+_CheckSchema = SalesSchema.update_columns({name: {"coerce": False} for name in SalesSchema.columns})
+
+# full:    whole frame in one pandera pass
+# chunked: coerce once, check every row in VALIDATION_CHUNK_ROWS slices (or per loaded chunk)
+# sample:  coerce once, check a random VALIDATION_SAMPLE_FRAC of the rows
+VALIDATION_MODES = ("full", "chunked", "sample")
+
+def get_validation_config(mode=None, chunk_rows=None, sample_frac=None) -> tuple:
+    """
+    Resolves (mode, chunk_rows, sample_frac): arguments first, then env vars, then defaults.
+    """
+    mode = (mode or os.getenv("VALIDATION_MODE", "chunked")).lower()
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unsupported validation mode '{mode}'. Use one of {list(VALIDATION_MODES)}.")
+    chunk_rows = chunk_rows or int(os.getenv("VALIDATION_CHUNK_ROWS", "500000"))
+    sample_frac = sample_frac or float(os.getenv("VALIDATION_SAMPLE_FRAC", "0.05"))
+    return mode, chunk_rows, sample_frac
+
+def _failure_cases(df: pd.DataFrame):
+    """
+    Checks an already-coerced frame (no second coercion); returns pandera's failure cases, or None if it passes.
+    """
+    try:
+        _CheckSchema.validate(df, lazy=True, inplace=True)
+        return None
+    except pa.errors.SchemaErrors as err:
+        return err.failure_cases
+
+def _report(failures: list, checked_rows: int, mode: str):
+    """
+    Logs the outcome and raises if any checked slice failed.
+    """
+    if failures:
+        failure_cases = pd.concat(failures, ignore_index=True)
+        logger.error("Schema validation failed!")
+        logger.error(f"Validation Errors Summary:\n{failure_cases}")
+        if mode == "sample":
+            invalid = failure_cases["index"].nunique()
+            logger.error(f"~{invalid / max(checked_rows, 1):.2%} of {checked_rows:,} sampled rows are invalid.")
+        raise ValueError(f"Schema validation failed with {len(failure_cases)} failure cases.")
+
+    if mode == "sample" and checked_rows:
+        # Rule of three: no failures in n random rows -> < 3/n invalid at 95% confidence
+        logger.info(f"Schema validation passed on a {checked_rows:,}-row sample "
+                    f"(< {3 / checked_rows:.3%} invalid rows at 95% confidence).")
+    else:
+        logger.info("Schema validation passed successfully.")
+
 # --- 2. Validation Function ---
-def validate_data(df: pd.DataFrame):
+def validate_data(df: pd.DataFrame, mode: str = None, chunk_rows: int = None, sample_frac: float = None,
+                  seed: int = 0) -> pd.DataFrame:
     """
-    Validates the dataframe against the SalesSchema.
-    Returns the dataframe if successful (potentially with coerced types).
+    Validates the dataframe against the SalesSchema (mode: see VALIDATION_MODES).
+    Returns the dataframe coerced to the schema dtypes.
     Raises CustomException if validation fails.
     """
-    logger.info("Validating data schema...")
     try:
-        validated_df = SalesSchema.validate(df, lazy=True)
-        
-        logger.info("Schema validation passed successfully.")
+        mode, chunk_rows, sample_frac = get_validation_config(mode, chunk_rows, sample_frac)
+        logger.info(f"Validating data schema ({mode})...")
+        if mode == "full":
+            validated_df = SalesSchema.validate(df, lazy=True)
+            _report([], len(df), mode)
+            return validated_df
+
+        validated_df = SalesSchema.coerce_dtype(df)
+        if mode == "chunked":
+            frames = (validated_df.iloc[start:start + chunk_rows] for start in range(0, len(df), chunk_rows))
+        else:
+            frames = [validated_df.sample(frac=sample_frac, random_state=seed)]
+
+        failures, checked_rows = [], 0
+        for frame in frames:
+            checked_rows += len(frame)
+            failure_cases = _failure_cases(frame)
+            if failure_cases is not None:
+                failures.append(failure_cases)
+
+        _report(failures, checked_rows, mode)
         return validated_df
 
     except pa.errors.SchemaErrors as err:
-        
+        # Full-mode failures, or values that cannot be coerced at all
         logger.error("Schema validation failed!")
-        
-        failure_cases = err.failure_cases
-        logger.error(f"Validation Errors Summary:\n{failure_cases}")
-        
+        logger.error(f"Validation Errors Summary:\n{err.failure_cases}")
         raise CustomException(err, sys)
-        
+
     except Exception as e:
         raise CustomException(e, sys)
-    
 
+def validate_chunks(chunks, mode: str = None, sample_frac: float = None, seed: int = 0):
+    """
+    Validates chunks as they are read (e.g. from iter_data_chunks) and yields them coerced.
+    Every row is checked, except in 'sample' mode (a random sample_frac of each chunk).
+    Failures from all chunks are collected and raised once the stream is exhausted.
+    """
+    try:
+        mode, _, sample_frac = get_validation_config(mode, sample_frac=sample_frac)
+        logger.info(f"Validating data schema per chunk ({mode})...")
+        failures, checked_rows = [], 0
+        for chunk in chunks:
+            chunk = SalesSchema.coerce_dtype(chunk)
+            frame = chunk.sample(frac=sample_frac, random_state=seed) if mode == "sample" else chunk
+            checked_rows += len(frame)
+            failure_cases = _failure_cases(frame)
+            if failure_cases is not None:
+                failures.append(failure_cases)
+            yield chunk
+
+        _report(failures, checked_rows, mode)
+
+    except pa.errors.SchemaErrors as err:
+        logger.error("Schema validation failed!")
+        logger.error(f"Validation Errors Summary:\n{err.failure_cases}")
+        raise CustomException(err, sys)
 
+    except Exception as e:
+        raise CustomException(e, sys)
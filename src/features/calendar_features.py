@@ -1,22 +1,117 @@
+import hashlib
+import os
 import pandas as pd
 import numpy as np
 from src.utils.logger import logger
 from src.utils.exception import CustomException
 import sys
 
-def add_date_features(df: pd.DataFrame) -> pd.DataFrame:
+# Base features (model inputs) and extra 0/1 flags, with their dtypes
+CALENDAR_COLUMNS = {"year": "int16", "month": "int8", "day_of_week": "int8"}
+FLAG_COLUMNS = ["is_weekend", "is_payday", "is_month_start", "is_month_end", "is_holiday"]
+
+def holidays_path(path: str = None) -> str:
+    return path or os.getenv("HOLIDAYS_PATH", os.path.join("data", "raw", "holidays_events.csv"))
+
+def holidays_signature(path: str = None) -> str:
+    """
+    SHA-256 of the holidays file ('' if absent). Stored with the cached calendar table,
+    so editing or replacing the file invalidates it.
+    """
+    path = holidays_path(path)
+    if not os.path.exists(path):
+        return ""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_holidays(path: str = None) -> np.ndarray:
+    """
+    National holiday dates (datetime64[D]) from the Kaggle holidays_events.csv
+    (HOLIDAYS_PATH, default data/raw/holidays_events.csv). Empty if the file is absent.
+    Transferred holidays and 'Work Day' entries are not days off.
+    """
+    path = holidays_path(path)
+    if not os.path.exists(path):
+        return np.array([], dtype="datetime64[D]")
+
+    events = pd.read_csv(path, parse_dates=["date"])
+    days_off = (events["locale"] == "National") & (events["type"] != "Work Day")
+    if "transferred" in events.columns:
+        days_off &= ~events["transferred"].astype(str).str.lower().eq("true")
+    return np.unique(events.loc[days_off, "date"].to_numpy().astype("datetime64[D]"))
+
+def build_calendar_table(start, end, holidays: np.ndarray = None) -> pd.DataFrame:
+    """
+    One row per day from start to end (inclusive) with every calendar feature.
+    """
+    dates = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D")
+    day_of_month = dates.day.to_numpy()
+    holidays = holidays if holidays is not None else np.array([], dtype="datetime64[D]")
+
+    table = pd.DataFrame({
+        "date": dates,
+        "year": dates.year.astype("int16"),
+        "month": dates.month.astype("int8"),
+        "day_of_week": dates.dayofweek.astype("int8"),  # 0=Mon, 6=Sun
+        "is_weekend": (dates.dayofweek >= 5).astype("int8"),
+        # Public sector wages are paid on the 15th and the last day of the month
+        "is_payday": ((day_of_month == 15) | dates.is_month_end).astype("int8"),
+        "is_month_start": dates.is_month_start.astype("int8"),
+        "is_month_end": dates.is_month_end.astype("int8"),
+        "is_holiday": np.isin(dates.to_numpy().astype("datetime64[D]"), holidays).astype("int8"),
+    })
+    return table
+
+def get_calendar_table(start, end, cache_path: str = None, holidays_path: str = None) -> pd.DataFrame:
+    """
+    Calendar table covering [start, end]. With cache_path (or CALENDAR_CACHE_PATH) it is
+    read from / saved to a Parquet file, and only rebuilt when the range is not covered
+    or the holidays file changed (see holidays_signature).
     """
-    Extracts Year, Month, Day, DayOfWeek from 'date'.
+    cache_path = cache_path or os.getenv("CALENDAR_CACHE_PATH")
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    signature = holidays_signature(holidays_path) if cache_path else None
+
+    if cache_path and os.path.exists(cache_path):
+        table = pd.read_parquet(cache_path)
+        covered = len(table) and table["date"].iloc[0] <= start and table["date"].iloc[-1] >= end
+        if covered and table.attrs.get("holidays_sha256") == signature:
+            return table
+        if len(table):
+            # Rebuild over the union so earlier ranges stay covered
+            start, end = min(start, table["date"].iloc[0]), max(end, table["date"].iloc[-1])
+
+    table = build_calendar_table(start, end, load_holidays(holidays_path))
+    if cache_path:
+        table.attrs["holidays_sha256"] = signature
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        table.to_parquet(cache_path, index=False)
+        logger.info(f"Calendar table ({len(table)} days) cached to {cache_path}")
+    return table
+
+def add_date_features(df: pd.DataFrame, flags: bool = False, cache_path: str = None) -> pd.DataFrame:
+    """
+    Adds Year, Month, DayOfWeek (and with flags=True the FLAG_COLUMNS) from 'date'.
+    Features are computed once per calendar day and gathered back by day offset,
+    so the cost per row is one integer index. Adds the columns to df itself (no copy).
     """
     try:
-        df = df.copy()
         if not pd.api.types.is_datetime64_any_dtype(df['date']):
             df['date'] = pd.to_datetime(df['date'])
-            
-        df['year'] = df['date'].dt.year.astype('int16')
-        df['month'] = df['date'].dt.month.astype('int8')
-        df['day_of_week'] = df['date'].dt.dayofweek.astype('int8') # 0=Mon, 6=Sun
-        
+
+        days = df['date'].to_numpy().astype("datetime64[D]")
+        if len(days) == 0:
+            for col, dtype in CALENDAR_COLUMNS.items():
+                df[col] = pd.Series(dtype=dtype)
+            return df
+
+        table = get_calendar_table(days.min(), days.max(), cache_path)
+        offsets = (days - table["date"].to_numpy().astype("datetime64[D]")[0]).astype(np.int64)
+
+        columns = list(CALENDAR_COLUMNS) + (FLAG_COLUMNS if flags else [])
+        for col in columns:
+            df[col] = table[col].to_numpy()[offsets]
+
         return df
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
@@ -0,0 +1,194 @@
+import os
+import sys
+import json
+import glob
+import numpy as np
+import pandas as pd
+from src.data_processing.load import concat_chunks
+from src.features.lag_features import FeatureSpec, GROUP_COLS, compute_history_features, series_positions
+from src.utils.logger import logger
+from src.utils.exception import CustomException
+
+TAIL_COLS = GROUP_COLS + ['date', 'sales']
+
+def ewm_seed_rows(combined: pd.DataFrame, ewm_state: pd.DataFrame, spec: FeatureSpec, is_last: np.ndarray) -> dict:
+    """
+    Per-row EWMA seeds for compute_history_features: each series' stored EWMA value,
+    placed on its last stored (non-new) row.
+    """
+    if ewm_state is None or not spec.ewm_spans:
+        return None
+    is_new = combined['_is_new'].to_numpy()
+    last_stored = ~is_new & np.r_[is_new[1:] | is_last[:-1], True]
+    seeds = combined[GROUP_COLS].join(ewm_state.set_index(GROUP_COLS), on=GROUP_COLS)
+    return {
+        span: np.where(last_stored, seeds[f'ewm_{span}'].to_numpy(dtype=np.float64), np.nan)
+        for span in spec.ewm_spans
+    }
+
+def future_features(history: pd.DataFrame, spec: FeatureSpec, ewm_state: pd.DataFrame = None, steps: int = None) -> pd.DataFrame:
+    """
+    History features for the next `steps` days (at most spec.horizon) after each series' last date.
+    These only depend on sales already in `history`, so they can be served online as-is.
+    `history` may be the full cleaned frame, or the builder's tails plus `ewm_state`.
+    """
+    try:
+        steps = min(steps or spec.horizon, spec.horizon)
+        history = history[TAIL_COLS]
+        last = history.groupby(GROUP_COLS, observed=True)['date'].max().reset_index()
+
+        future = last.loc[last.index.repeat(steps)].reset_index(drop=True)
+        future['date'] = future['date'] + pd.to_timedelta(np.tile(np.arange(1, steps + 1), len(last)), unit='D')
+        future['sales'] = np.float32(np.nan)
+
+        combined = concat_chunks([history.assign(_is_new=False), future.assign(_is_new=True)])
+        combined = combined.sort_values(GROUP_COLS + ['date'], kind='stable').reset_index(drop=True)
+        _, position = series_positions(combined)
+        is_last = np.r_[position[1:] == 0, True][:len(combined)]
+
+        features = compute_history_features(combined, spec, ewm_seed_rows(combined, ewm_state, spec, is_last))
+        is_new = combined['_is_new'].to_numpy()
+        result = combined.loc[is_new, GROUP_COLS + ['date']].reset_index(drop=True)
+        for name, values in features.items():
+            result[name] = values[is_new]
+        return result
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+class IncrementalFeatureBuilder:
+    """
+    Computes lag/rolling/EWMA features for newly arrived days only.
+
+    Per store/family series it keeps, in state_dir:
+      tails.parquet   - the last spec.history_length() rows (store_nbr, family, date, sales)
+      ewm.parquet     - the EWMA value at each series' last row, one column per span
+      spec.json       - the FeatureSpec the state was built with
+    and appends each batch of computed feature rows to state_dir/features/part-*.parquet.
+    """
+    def __init__(self, state_dir: str, spec: FeatureSpec = None):
+        self.state_dir = state_dir
+        self.spec = spec or FeatureSpec()
+        self.tails_path = os.path.join(state_dir, "tails.parquet")
+        self.ewm_path = os.path.join(state_dir, "ewm.parquet")
+        self.spec_path = os.path.join(state_dir, "spec.json")
+        self.features_dir = os.path.join(state_dir, "features")
+
+    def has_state(self) -> bool:
+        return os.path.exists(self.tails_path)
+
+    def _load_state(self):
+        with open(self.spec_path) as f:
+            saved_spec = json.load(f)
+        if saved_spec != self.spec.to_dict():
+            raise ValueError(
+                f"Feature state in {self.state_dir} was built with {saved_spec}, not {self.spec.to_dict()}. "
+                "Rebuild it from the full history."
+            )
+        tails = pd.read_parquet(self.tails_path)
+        ewm_state = pd.read_parquet(self.ewm_path) if self.spec.ewm_spans else None
+        return tails, ewm_state
+
+    def _save_state(self, combined: pd.DataFrame, features: dict, is_last: np.ndarray):
+        os.makedirs(self.state_dir, exist_ok=True)
+
+        # Keep the last history_length rows of every series
+        position_from_end = combined.groupby(GROUP_COLS, observed=True).cumcount(ascending=False).to_numpy()
+        tails = combined.loc[position_from_end < self.spec.history_length(), TAIL_COLS]
+        tails.reset_index(drop=True).to_parquet(self.tails_path, index=False)
+
+        if self.spec.ewm_spans:
+            ewm_state = combined.loc[is_last, GROUP_COLS].reset_index(drop=True)
+            for span in self.spec.ewm_spans:
+                ewm_state[f'ewm_{span}'] = features[f'ewm_{span}'][is_last]
+            ewm_state.to_parquet(self.ewm_path, index=False)
+
+        with open(self.spec_path, "w") as f:
+            json.dump(self.spec.to_dict(), f)
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Appends new cleaned rows (with calendar features) to the per-series state and
+        returns them with their history features; rows without enough history are dropped.
+        Without saved state, df is treated as the full history (same result as add_lag_features).
+        """
+        try:
+            spec = self.spec
+            new_rows = df.sort_values(GROUP_COLS + ['date']).reset_index(drop=True)
+
+            if self.has_state():
+                tails, ewm_state = self._load_state()
+
+                # Skip days already folded into the state
+                last_dates = tails.groupby(GROUP_COLS, observed=True)['date'].max().rename('_last_date')
+                known = new_rows.join(last_dates, on=GROUP_COLS)['_last_date']
+                stale = (known.notna() & (new_rows['date'] <= known)).to_numpy()
+                if stale.any():
+                    logger.warning(f"Skipping {stale.sum()} rows already in the feature state.")
+                    new_rows = new_rows[~stale].reset_index(drop=True)
+            else:
+                tails, ewm_state = new_rows[TAIL_COLS].iloc[:0], None
+
+            tails = tails.assign(_is_new=False)
+            core = new_rows[TAIL_COLS].assign(_is_new=True)
+            combined = concat_chunks([tails, core]).sort_values(GROUP_COLS + ['date'], kind='stable').reset_index(drop=True)
+
+            _, position = series_positions(combined)
+            is_last = np.r_[position[1:] == 0, True][:len(combined)]
+
+            features = compute_history_features(combined, spec, ewm_seed_rows(combined, ewm_state, spec, is_last))
+            self._save_state(combined, features, is_last)
+
+            is_new = combined['_is_new'].to_numpy()
+            result = new_rows.copy()
+            for name, values in features.items():
+                result[name] = values[is_new]
+
+            initial_rows = result.shape[0]
+            result = result.dropna()
+            logger.info(
+                f"Incremental features: {initial_rows} new rows, {initial_rows - result.shape[0]} dropped "
+                f"for missing history; state holds {spec.history_length()} rows per series."
+            )
+            return result
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def future_features(self, steps: int = None) -> pd.DataFrame:
+        """
+        Features for the days after the stored state (see future_features).
+        """
+        tails, ewm_state = self._load_state()
+        return future_features(tails, self.spec, ewm_state, steps)
+
+    def append_features(self, features: pd.DataFrame) -> str:
+        """
+        Saves a batch of computed feature rows as a new Parquet part.
+        """
+        try:
+            os.makedirs(self.features_dir, exist_ok=True)
+            stamp = pd.Timestamp(features['date'].max()).strftime("%Y%m%d") if len(features) else "empty"
+            path = os.path.join(self.features_dir, f"part-{len(glob.glob(os.path.join(self.features_dir, 'part-*.parquet'))):05d}-{stamp}.parquet")
+            features.to_parquet(path, index=False)
+            return path
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def feature_parts(self) -> list:
+        """
+        Paths of the appended feature parts, oldest first.
+        """
+        parts = sorted(glob.glob(os.path.join(self.features_dir, "part-*.parquet")))
+        if not parts:
+            raise FileNotFoundError(f"No feature parts in {self.features_dir}.")
+        return parts
+
+    def load_features(self, columns=None) -> pd.DataFrame:
+        """
+        All feature rows computed so far (every appended part), optionally only `columns`.
+        """
+        try:
+            return concat_chunks([pd.read_parquet(part, columns=columns) for part in self.feature_parts()])
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -1,30 +1,183 @@
+import os
 import pandas as pd
 import numpy as np
+from pandas.api.indexers import BaseIndexer
+from src.data_processing.frame_order import sort_frame
 from src.utils.logger import logger
 from src.utils.exception import CustomException
 import sys
 
-def add_lag_features(df: pd.DataFrame) -> pd.DataFrame:
+# Defaults: lags/windows are counted back from the forecast horizon,
+# so lag_1 is sales(t - HORIZON - 1). Override with FEATURE_LAGS / FEATURE_WINDOWS / FORECAST_HORIZON.
+LAGS = [1, 7, 14]
+WINDOWS = [7, 14]
+HORIZON = 16
+GROUP_COLS = ['store_nbr', 'family']
+
+ROLLING_STATS = ("mean", "std", "min", "max")
+
+def _str_list(value: str) -> list:
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+def _int_list(value: str) -> list:
+    return [int(v) for v in _str_list(value)]
+
+def get_lag_config(lags=None, windows=None, horizon=None) -> tuple:
+    """
+    Resolves (lags, windows, horizon): arguments first, then env vars, then module defaults.
+    """
+    lags = lags if lags is not None else _int_list(os.getenv("FEATURE_LAGS", ",".join(map(str, LAGS))))
+    windows = windows if windows is not None else _int_list(os.getenv("FEATURE_WINDOWS", ",".join(map(str, WINDOWS))))
+    horizon = horizon if horizon is not None else int(os.getenv("FORECAST_HORIZON", HORIZON))
+    return list(lags), list(windows), horizon
+
+class FeatureSpec:
+    """
+    Declarative set of history features, all counted back from `horizon`:
+      lags:      [k, ...]                      -> lag_k = sales(t - horizon - k)
+      rolling:   {window: [stat, ...]} or [w]  -> roll_<window>_<stat>, stat in ROLLING_STATS
+      ewm_spans: [span, ...]                   -> ewm_<span> (adjust=False EWMA)
+    Unset parts come from FEATURE_LAGS / FEATURE_WINDOWS / FEATURE_ROLLING_STATS /
+    FEATURE_EWM_SPANS / FORECAST_HORIZON, then from the defaults (the original 5 features).
+    """
+    def __init__(self, lags=None, rolling=None, ewm_spans=None, horizon=None):
+        windows = list(rolling) if rolling is not None else None
+        self.lags, windows, self.horizon = get_lag_config(lags, windows, horizon)
+
+        if isinstance(rolling, dict):
+            self.rolling = {int(window): list(stats) for window, stats in rolling.items()}
+        else:
+            stats = _str_list(os.getenv("FEATURE_ROLLING_STATS", "mean"))
+            self.rolling = {window: list(stats) for window in windows}
+
+        self.ewm_spans = list(ewm_spans) if ewm_spans is not None else _int_list(os.getenv("FEATURE_EWM_SPANS", ""))
+
+        unknown = {stat for stats in self.rolling.values() for stat in stats} - set(ROLLING_STATS)
+        if unknown:
+            raise ValueError(f"Unsupported rolling statistics {sorted(unknown)}. Use {list(ROLLING_STATS)}.")
+
+    @classmethod
+    def from_dict(cls, spec: dict) -> "FeatureSpec":
+        return cls(spec.get("lags"), spec.get("rolling"), spec.get("ewm_spans"), spec.get("horizon"))
+
+    def to_dict(self) -> dict:
+        return {"lags": self.lags, "rolling": {str(w): stats for w, stats in self.rolling.items()},
+                "ewm_spans": self.ewm_spans, "horizon": self.horizon}
+
+    def history_length(self) -> int:
+        """
+        Rows of past sales needed per series to compute every feature for a new row.
+        """
+        reach = [0] + list(self.lags) + [window - 1 for window in self.rolling]
+        return self.horizon + max(reach)
+
+    def feature_names(self) -> list:
+        return (
+            [f'lag_{lag}' for lag in self.lags]
+            + [f'roll_{window}_{stat}' for window, stats in self.rolling.items() for stat in stats]
+            + [f'ewm_{span}' for span in self.ewm_spans]
+        )
+
+    def __repr__(self):
+        return f"FeatureSpec(lags={self.lags}, rolling={self.rolling}, ewm_spans={self.ewm_spans}, horizon={self.horizon})"
+
+def lag_feature_names(lags=None, windows=None, spec: FeatureSpec = None) -> list:
+    """
+    Column names produced by add_lag_features for this config.
     """
-    Generates Lag and Rolling Window features.
-    Sorts data -> GroupBy Store/Family -> Shift.
+    return (spec or FeatureSpec(lags, windows)).feature_names()
+
+class GroupWindowIndexer(BaseIndexer):
+    """
+    Trailing windows of `window_size` rows that stop at the start of each series.
+    `group_start` holds, per row, the position of the first row of its series.
+    """
+    def get_window_bounds(self, num_values=0, min_periods=None, center=None, closed=None, step=None):
+        end = np.arange(1, num_values + 1, dtype=np.int64)
+        start = np.maximum(end - self.window_size, self.group_start)
+        return start, end
+
+def series_positions(df: pd.DataFrame, group_cols=GROUP_COLS) -> tuple:
+    """
+    For a frame sorted by group_cols: (first row of each row's series, position within it).
+    """
+    n_rows = len(df)
+    is_start = np.zeros(n_rows, dtype=bool)
+    is_start[:1] = True
+    for col in group_cols:
+        values = df[col].cat.codes.to_numpy() if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col].to_numpy()
+        is_start[1:] |= values[1:] != values[:-1]
+
+    starts = np.flatnonzero(is_start)
+    group_start = starts[np.cumsum(is_start) - 1]
+    return group_start, np.arange(n_rows) - group_start
+
+def shift_within_series(values: np.ndarray, position: np.ndarray, periods: int) -> np.ndarray:
+    """
+    groupby().shift(periods) on contiguous series blocks, as one array gather.
+    """
+    out = np.full(len(values), np.nan, dtype=values.dtype if values.dtype.kind == "f" else np.float64)
+    rows = np.flatnonzero(position >= periods)
+    out[rows] = values[rows - periods]
+    return out
+
+def compute_history_features(df: pd.DataFrame, spec: FeatureSpec, ewm_seed: dict = None) -> dict:
+    """
+    Feature arrays (name -> array, in row order) for a frame already sorted by series then date.
+    ewm_seed: optional {span: per-row array}. A non-NaN value restarts that series' EWMA at
+    that row from the stored state; its earlier rows are then ignored (used by incremental updates).
+    """
+    values = df['sales'].to_numpy()
+    group_start, position = series_positions(df)
+    features = {}
+
+    for lag in spec.lags:
+        features[f'lag_{lag}'] = shift_within_series(values, position, spec.horizon + lag)
+
+    # Positional index: results are written back by position, and groupby().ewm is much cheaper without the frame index
+    shifted = pd.Series(shift_within_series(values, position, spec.horizon))
+    for window, stats in spec.rolling.items():
+        indexer = GroupWindowIndexer(window_size=window, group_start=group_start)
+        rolling = shifted.rolling(indexer, min_periods=window)
+        for stat in stats:
+            features[f'roll_{window}_{stat}'] = getattr(rolling, stat)().to_numpy()
+
+    if spec.ewm_spans:
+        series_id = np.cumsum(position == 0) - 1
+        for span in spec.ewm_spans:
+            observations = shifted
+            if ewm_seed is not None:
+                seed = ewm_seed[span]
+                seeded = ~np.isnan(seed)
+                seed_position = np.full(series_id[-1] + 1, -1)
+                np.maximum.at(seed_position, series_id[seeded], position[seeded])
+
+                observations = np.array(shifted, dtype=np.float64)  # copy; seeds are float64 EWMA states
+                observations[position < seed_position[series_id]] = np.nan
+                observations[seeded] = seed[seeded]
+                observations = pd.Series(observations)
+
+            grouped = observations.groupby(series_id, sort=False)
+            features[f'ewm_{span}'] = grouped.ewm(span=span, adjust=False).mean().to_numpy()
+
+    return features
+
+def add_lag_features(df: pd.DataFrame, lags=None, windows=None, horizon=None, spec: FeatureSpec = None) -> pd.DataFrame:
+    """
+    Generates Lag, Rolling Window and EWMA features (see FeatureSpec).
+    Sorts data -> finds Store/Family series blocks -> shifts once -> every statistic in one pass
+    over the whole column, using pandas' online (O(n)) kernels bounded per series.
+    Same output as per-group shift/rolling.
     """
     try:
-        logger.info("Generating Lag & Rolling features...")
-        df = df.copy()
-        
-        df = df.sort_values(['store_nbr', 'family', 'date'])
+        spec = spec or FeatureSpec(lags, windows, horizon=horizon)
+        logger.info(f"Generating Lag & Rolling features ({spec})...")
+        # No-op when clean_data already sorted the frame; the shallow copy keeps
+        # the new columns off the caller's frame without copying any data
+        df = sort_frame(df, GROUP_COLS + ['date']).copy(deep=False)
         
-        HORIZON = 16 
-        target_col = 'sales'
-        
-        grouped = df.groupby(['store_nbr', 'family'])[target_col]
-
-        for lag in [1, 7, 14]:
-            df[f'lag_{lag}'] = grouped.shift(HORIZON + lag)
-            
-        df['roll_7_mean'] = grouped.transform(lambda x: x.shift(HORIZON).rolling(7).mean())
-        df['roll_14_mean'] = grouped.transform(lambda x: x.shift(HORIZON).rolling(14).mean())
+        for name, values in compute_history_features(df, spec).items():
+            df[name] = values
 
         initial_rows = df.shape[0]
         df = df.dropna()
@@ -34,4 +187,4 @@ def add_lag_features(df: pd.DataFrame) -> pd.DataFrame:
         return df
         
     except Exception as e:
-        raise CustomException(e, sys)
\ No newline at end of file
+        raise CustomException(e, sys)
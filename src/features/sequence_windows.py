@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from src.features.lag_features import GROUP_COLS, series_positions
+
+def series_lengths(df: pd.DataFrame, group_cols=GROUP_COLS) -> pd.DataFrame:
+    """
+    For a frame sorted by group_cols: one row per series (group_cols + 'rows'), in frame order.
+    Saved next to series-ordered splits so the rows can be windowed without the key columns.
+    """
+    group_start, _ = series_positions(df, group_cols)
+    starts = np.unique(group_start)
+    lengths = df[group_cols].iloc[starts].reset_index(drop=True)
+    lengths["rows"] = np.diff(np.append(starts, len(df))).astype(np.int64)
+    return lengths
+
+def positions_from_lengths(lengths) -> np.ndarray:
+    """
+    Position of each row within its series, for rows stored series after series.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    series_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.arange(lengths.sum(), dtype=np.int64) - series_start
+
+def window_view(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    (rows, features) -> (rows - window + 1, window, features) view of overlapping windows,
+    view[i] = rows i .. i + window - 1. Strided over `values`: nothing is copied.
+    """
+    return np.moveaxis(sliding_window_view(values, window, axis=0), -1, 1)
+
+def window_ends(positions: np.ndarray, window: int, first_end: int = 0) -> np.ndarray:
+    """
+    Rows (from first_end on) whose window lies entirely inside their own series.
+    """
+    return np.flatnonzero(positions[first_end:] >= window - 1) + first_end
+
+def iter_window_batches(values, targets, positions, window: int, batch_size: int,
+                        shuffle: bool = False, seed=None, first_end: int = 0):
+    """
+    Yields (X (batch, window, features), y (batch, 1)) float32 batches, one window per row with
+    a full history in its series (see window_ends). Windows are gathered from window_view batch
+    by batch, so memory holds one batch of windows whatever the window length or history.
+    first_end: rows before it only serve as history (e.g. the overlap with the previous chunk).
+    positions=None: all rows are one series (e.g. window 1 over rows in date order).
+    """
+    if positions is None:
+        positions = np.arange(len(values))
+    windows = window_view(values, window)
+    targets = np.asarray(targets, dtype=np.float32).reshape(-1, 1)
+    ends = window_ends(positions, window, first_end)
+    if shuffle:
+        np.random.default_rng(seed).shuffle(ends)
+
+    for start in range(0, len(ends), batch_size):
+        batch_ends = ends[start:start + batch_size]
+        yield windows[batch_ends - window + 1].astype(np.float32, copy=False), targets[batch_ends]
@@ -0,0 +1,117 @@
+import io
+import json
+import os
+import sys
+import threading
+import numpy as np
+from src.utils.logger import logger
+from src.utils.exception import CustomException
+
+NPY_CONTENT_TYPE = "application/x-npy"
+
+class PredictionBackend:
+    """
+    Interface behind ModelPredictor: takes an encoded request body and returns
+    the encoded response body, exactly like a SageMaker endpoint would, so the
+    Preprocessor/Postprocessor work unchanged whichever backend serves the call.
+    """
+    def invoke(self, endpoint_name: str, payload, content_type: str, accept: str = None) -> bytes:
+        raise NotImplementedError
+
+    def load(self):
+        """
+        Optional eager initialisation (called by ModelPredictor.warm_up).
+        """
+
+class LocalModelBackend(PredictionBackend):
+    """
+    Serves the trained models in-process instead of over the network.
+
+    - text/csv requests go to the XGBoost Booster (`<model_dir>/xgboost-model`),
+      loaded with the same model_fn SageMaker uses.
+    - application/json and application/x-npy requests go to the saved LSTM
+      (`<model_dir>/00000001`).
+
+    Models are loaded on first use; TensorFlow is only imported if the LSTM is needed.
+    """
+    def __init__(self, model_dir: str = "artifacts", lstm_model_path: str = None):
+        self.model_dir = model_dir
+        self.lstm_model_path = lstm_model_path or os.path.join(model_dir, "00000001")
+        self._booster = None
+        self._lstm_model = None
+        self._lock = threading.Lock()
+
+    # --- Model loading ---
+    def _get_booster(self):
+        if self._booster is None:
+            with self._lock:
+                if self._booster is None:
+                    from src.training.xgboost_train_eval_script import model_fn
+                    self._booster = model_fn(self.model_dir)
+                    logger.info(f"Loaded local XGBoost model from {self.model_dir}")
+        return self._booster
+
+    def _get_lstm_model(self):
+        if self._lstm_model is None:
+            with self._lock:
+                if self._lstm_model is None:
+                    import tensorflow as tf
+                    self._lstm_model = tf.keras.models.load_model(self.lstm_model_path)
+                    logger.info(f"Loaded local LSTM model from {self.lstm_model_path}")
+        return self._lstm_model
+
+    def load(self):
+        if os.path.exists(os.path.join(self.model_dir, "xgboost-model")):
+            self._get_booster()
+        if os.path.exists(self.lstm_model_path):
+            self._get_lstm_model()
+
+    # --- Invocation ---
+    def invoke(self, endpoint_name: str, payload, content_type: str, accept: str = None) -> bytes:
+        try:
+            if content_type == "text/csv":
+                return self._invoke_xgboost(payload)
+            if content_type in ("application/json", NPY_CONTENT_TYPE):
+                return self._invoke_lstm(payload, content_type, accept)
+            raise ValueError(f"Unsupported content type for local backend: {content_type}")
+
+        except Exception as e:
+            logger.error(f"Local prediction failed for {endpoint_name}")
+            raise CustomException(e, sys)
+
+    def _invoke_xgboost(self, payload) -> bytes:
+        features = decode_csv(payload)
+        predictions = self._get_booster().inplace_predict(features)
+        return ",".join(map(repr, predictions.tolist())).encode("utf-8")
+
+    def _invoke_lstm(self, payload, content_type, accept) -> bytes:
+        if content_type == NPY_CONTENT_TYPE:
+            instances = np.load(io.BytesIO(payload), allow_pickle=False)
+        else:
+            instances = np.asarray(json.loads(payload)["instances"], dtype=np.float32)
+
+        # Direct call instead of model.predict(): no per-call tf.data setup for small batches
+        predictions = self._get_lstm_model()(instances, training=False).numpy()
+
+        if accept == NPY_CONTENT_TYPE:
+            buffer = io.BytesIO()
+            np.save(buffer, predictions.astype(np.float32), allow_pickle=False)
+            return buffer.getvalue()
+        return json.dumps({"predictions": predictions.tolist()}).encode("utf-8")
+
+def decode_csv(payload) -> np.ndarray:
+    """
+    Header-less CSV (as built by Preprocessor.preprocess_xgboost) -> 2D float32 array.
+    Empty fields become NaN, which XGBoost treats as missing.
+    """
+    if isinstance(payload, bytes):
+        payload = payload.decode("utf-8")
+    payload = payload.strip()
+    n_rows = payload.count("\n") + 1
+
+    try:
+        values = np.fromstring(payload.replace("\n", ","), dtype=np.float32, sep=",")
+        return values.reshape(n_rows, -1)
+    except ValueError:
+        rows = [[float(x) if x else np.nan for x in line.split(",")] for line in payload.split("\n")]
+        return np.asarray(rows, dtype=np.float32)
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+async def aiter_rows(byte_chunks, content_type: str = "application/x-ndjson"):
+    """
+    Incrementally parses a streamed request body into feature rows.
+
+    - application/x-ndjson: one JSON array of floats per line.
+    - text/csv: one comma-separated row per line, no header.
+
+    Only the current partial line is buffered, so memory does not grow with the body.
+    """
+    is_csv = "csv" in content_type
+    buffer = b""
+    line_no = 0
+
+    async for chunk in byte_chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            row = _parse_line(line, is_csv, line_no)
+            if row is not None:
+                yield row
+
+    if buffer:
+        row = _parse_line(buffer, is_csv, line_no + 1)
+        if row is not None:
+            yield row
+
+def _parse_line(line: bytes, is_csv: bool, line_no: int):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        if is_csv:
+            return [float(x) for x in line.split(b",")]
+        row = json.loads(line)
+        if not isinstance(row, list):
+            raise ValueError("expected a JSON array")
+        return [float(x) for x in row]
+    except ValueError as e:
+        raise ValueError(f"Invalid row on line {line_no}: {e}")
+
+async def aiter_chunks(rows, chunk_size: int):
+    """
+    Groups an async row iterator into (start_offset, rows) chunks.
+    """
+    chunk = []
+    start = 0
+    async for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+async def stream_forecasts(chunks, score_chunk, max_parallel_chunks: int = 4):
+    """
+    Scores chunks with at most `max_parallel_chunks` in flight and yields one
+    NDJSON line per chunk as soon as it completes (completion order, not input order):
+
+        {"start": 0, "count": 1000, "forecast": [...]}
+        {"start": 1000, "count": 1000, "error": "..."}
+
+    New chunks are only pulled from the request once a slot frees up,
+    so a slow endpoint applies back-pressure to the upload.
+    """
+    async def _score(start, rows):
+        try:
+            forecast = await score_chunk(rows)
+            return {"start": start, "count": len(rows), "forecast": forecast}
+        except Exception as e:
+            return {"start": start, "count": len(rows), "error": str(e)}
+
+    chunk_iter = chunks.__aiter__()
+    pending = set()
+    next_chunk = None
+    exhausted = False
+    input_error = None
+    try:
+        while True:
+            # Wait for the next chunk and the chunks in flight together, so results go out
+            # as soon as they are ready, even while the upload is still arriving
+            if next_chunk is None and not exhausted and len(pending) < max_parallel_chunks:
+                next_chunk = asyncio.ensure_future(chunk_iter.__anext__())
+            waiting = pending | ({next_chunk} if next_chunk is not None else set())
+            if not waiting:
+                break
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done & pending:
+                pending.discard(task)
+                yield json.dumps(task.result()) + "\n"
+
+            if next_chunk in done:
+                task, next_chunk = next_chunk, None
+                try:
+                    start, rows = task.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                except ValueError as e:
+                    # Malformed input: finish the chunks already sent, then report it in-band
+                    # (the response status has already gone out)
+                    exhausted, input_error = True, str(e)
+                else:
+                    pending.add(asyncio.ensure_future(_score(start, rows)))
+
+        if input_error is not None:
+            yield json.dumps({"error": input_error}) + "\n"
+    finally:
+        # Client went away: stop scoring chunks nobody will read
+        for task in pending | ({next_chunk} if next_chunk is not None else set()):
+            task.cancel()
@@ -0,0 +1,131 @@
+import asyncio
+import sys
+import numpy as np
+from src.utils.logger import logger
+from src.utils.exception import CustomException
+
+async def predict_payload(predictor, preprocessor, postprocessor, model_type: str, endpoint_name: str, payload) -> list:
+    """
+    Preprocessed payload -> endpoint -> postprocessed forecast.
+    Shared by the /predict routes and RequestCoalescer.
+    """
+    try:
+        if model_type == "xgboost":
+            raw_response = await predictor.predict_async(endpoint_name, payload, "text/csv")
+            return postprocessor.postprocess_xgboost(raw_response)
+
+        content_type = preprocessor.lstm_content_type
+        raw_response = await predictor.predict_async(endpoint_name, payload, content_type, accept=content_type)
+        return postprocessor.postprocess_lstm(raw_response)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+class RequestCoalescer:
+    """
+    Micro-batching layer between the API routes and ModelPredictor.
+
+    Payloads submitted for the same (model_type, endpoint) within `max_wait_ms`
+    are joined and sent to the endpoint as ONE payload, and the postprocessed
+    forecast is split back to each waiting caller in submission order.
+    A batch is flushed early once it holds `max_batch_rows` rows.
+    """
+    MODEL_TYPES = ("xgboost", "lstm")
+
+    def __init__(self, predictor, preprocessor, postprocessor, max_wait_ms: float = 5.0, max_batch_rows: int = 256):
+        self.predictor = predictor
+        self.preprocessor = preprocessor
+        self.postprocessor = postprocessor
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_rows = max_batch_rows
+
+        self._pending = {}       # key -> [(rows, future), ...]
+        self._pending_rows = {}  # key -> total queued rows
+        self._timers = {}        # key -> TimerHandle of the scheduled flush
+        self._inflight = set()   # strong refs to running batch tasks
+
+        self.batches_sent = 0
+        self.rows_sent = 0
+
+    async def submit(self, model_type: str, endpoint_name: str, rows: list, payload=None) -> list:
+        """
+        Queues `rows` for the next batch and waits for their forecast.
+        payload: the rows already preprocessed (e.g. for the cache key), so they are not encoded twice.
+        """
+        if model_type not in self.MODEL_TYPES:
+            raise ValueError(f"Unsupported model_type for batching: {model_type}")
+        if not rows:
+            raise ValueError("Cannot forecast an empty row set.")
+        if payload is None:
+            payload = self._preprocess(model_type, rows)
+
+        # Rows (or LSTM windows) of different shapes cannot share one payload
+        key = (model_type, endpoint_name, np.shape(rows[0]))
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append((payload, len(rows), future))
+        self._pending_rows[key] = self._pending_rows.get(key, 0) + len(rows)
+
+        if self._pending_rows[key] >= self.max_batch_rows:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = loop.call_later(self.max_wait_ms / 1000, self._flush, key)
+
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(key, [])
+        self._pending_rows.pop(key, None)
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._run_batch(key, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run_batch(self, key, batch):
+        model_type, endpoint_name, _ = key
+        n_rows = sum(count for _, count, _ in batch)
+
+        try:
+            logger.info(f"Coalesced {len(batch)} requests ({n_rows} rows) for {endpoint_name}")
+            payload = self.preprocessor.combine_payloads(model_type, [caller_payload for caller_payload, _, _ in batch])
+            forecast = await predict_payload(
+                self.predictor, self.preprocessor, self.postprocessor, model_type, endpoint_name, payload
+            )
+
+            if len(forecast) != n_rows:
+                raise ValueError(
+                    f"Endpoint returned {len(forecast)} predictions for {n_rows} rows; cannot split batch."
+                )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches_sent += 1
+        self.rows_sent += n_rows
+
+        offset = 0
+        for _, count, future in batch:
+            if not future.done():
+                future.set_result(forecast[offset:offset + count])
+            offset += count
+
+    def _preprocess(self, model_type, rows):
+        if model_type == "xgboost":
+            return self.preprocessor.preprocess_xgboost(rows)
+        return self.preprocessor.preprocess_lstm(rows)
+
+    def stats(self) -> dict:
+        return {
+            "batches_sent": self.batches_sent,
+            "rows_sent": self.rows_sent,
+            "pending_rows": sum(self._pending_rows.values()),
+        }
@@ -0,0 +1,166 @@
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from src.utils.logger import logger
+from src.utils.exception import CustomException
+
+class PredictionCache:
+    """
+    LRU + TTL cache for postprocessed forecasts.
+
+    Entries are keyed on (model_type, endpoint name, sha256 of the preprocessed
+    payload), so identical feature rows skip the endpoint call entirely.
+    An optional SQLite file acts as a shared local backend, letting every
+    uvicorn worker on the host reuse each other's results.
+    """
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 60.0, shared_path: str = None):
+        try:
+            self.max_size = max_size
+            self.ttl_seconds = ttl_seconds
+            self._entries = OrderedDict()  # key -> (expires_at, forecast)
+            self._endpoints = {}           # model_type -> endpoint name currently served
+            self._lock = threading.Lock()
+
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.invalidations = 0
+
+            self._shared = None
+            self._shared_writes = 0
+            if shared_path:
+                self._shared = sqlite3.connect(shared_path, check_same_thread=False, isolation_level=None)
+                self._shared.execute("PRAGMA journal_mode=WAL")
+                self._shared.execute(
+                    "CREATE TABLE IF NOT EXISTS predictions ("
+                    "key TEXT PRIMARY KEY, model_type TEXT, endpoint TEXT, forecast TEXT, expires_at REAL)"
+                )
+                logger.info(f"Prediction cache shared backend: {shared_path}")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @staticmethod
+    def make_key(model_type: str, endpoint_name: str, payload) -> str:
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        digest = hashlib.sha256(payload).hexdigest()
+        return f"{model_type}:{endpoint_name}:{digest}"
+
+    def sync_endpoints(self, endpoints: dict):
+        """
+        Drops cached forecasts for any model whose endpoint name changed,
+        e.g. after XGB_ENDPOINT_NAME / LSTM_ENDPOINT_NAME point at a new deployment.
+        """
+        for model_type, endpoint_name in endpoints.items():
+            previous = self._endpoints.get(model_type)
+            if previous is not None and previous != endpoint_name:
+                self.invalidate(model_type)
+                logger.info(f"Endpoint for {model_type} changed ({previous} -> {endpoint_name}); cache invalidated")
+            self._endpoints[model_type] = endpoint_name
+
+    def invalidate(self, model_type: str = None):
+        with self._lock:
+            if model_type is None:
+                self._entries.clear()
+            else:
+                prefix = f"{model_type}:"
+                for key in [k for k in self._entries if k.startswith(prefix)]:
+                    del self._entries[key]
+            self.invalidations += 1
+
+            if self._shared is not None:
+                if model_type is None:
+                    self._shared.execute("DELETE FROM predictions")
+                else:
+                    self._shared.execute("DELETE FROM predictions WHERE model_type = ?", (model_type,))
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, forecast = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return forecast
+                del self._entries[key]
+                self.expirations += 1
+
+        forecast = self._get_shared(key)
+        if forecast is not None:
+            self._put_local(key, forecast)
+            with self._lock:
+                self.hits += 1
+            return forecast
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, forecast: list):
+        if not self.enabled:
+            return
+        self._put_local(key, forecast)
+
+        if self._shared is not None:
+            model_type, endpoint_name, _ = key.split(":", 2)
+            with self._lock:
+                self._shared.execute(
+                    "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                    (key, model_type, endpoint_name, json.dumps(forecast), time.time() + self.ttl_seconds)
+                )
+                # Rows nobody reads again would otherwise live forever
+                self._shared_writes += 1
+                if self._shared_writes % 256 == 0:
+                    self._shared.execute("DELETE FROM predictions WHERE expires_at <= ?", (time.time(),))
+
+    def _put_local(self, key, forecast):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, forecast)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _get_shared(self, key):
+        if self._shared is None:
+            return None
+        with self._lock:
+            row = self._shared.execute(
+                "SELECT forecast, expires_at FROM predictions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= time.time():
+                self._shared.execute("DELETE FROM predictions WHERE key = ?", (key,))
+                self.expirations += 1
+                return None
+        return json.loads(row[0])
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
@@ -0,0 +1,173 @@
+import datetime
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import numpy as np
+from src.inference.preprocess import ARTIFACTS_DIR
+from src.utils.logger import logger
+from src.utils.exception import CustomException
+
+KEY_COLS = ["store_nbr", "family", "date"]
+
+def normalize_family(family: str) -> str:
+    # Same normalisation clean_data applies
+    return str(family).strip().upper()
+
+def normalize_date(date) -> str:
+    return datetime.date.fromisoformat(str(date)[:10]).isoformat()
+
+class OnlineFeatureStore:
+    """
+    History features (lags, rolling stats, EWMA) per (store_nbr, family, date), so clients
+    can ask for a forecast by ID instead of computing feature vectors themselves.
+
+    The pipeline writes the next `horizon` days of features for every series to an SQLite
+    file (FEATURE_STORE_PATH, default artifacts/online_features.sqlite). The API loads it
+    once into a dict, so a lookup is a hash probe; reload() picks up a newer file, and
+    refresh_due() says when to check the file again (FEATURE_STORE_REFRESH_SECONDS).
+    """
+    def __init__(self, path: str = None):
+        self.path = path or os.getenv("FEATURE_STORE_PATH", os.path.join(ARTIFACTS_DIR, "online_features.sqlite"))
+        self.feature_names = []
+        self.spec = None
+        self._rows = None  # (store_nbr, family, date) -> float32 vector
+        self._mtime = None
+        self._dates = None
+        self._checked = None  # time.monotonic() of the last reload()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self.refresh_seconds = float(os.getenv("FEATURE_STORE_REFRESH_SECONDS", "30"))
+
+        self.lookups = 0
+        self.misses = 0
+
+    @property
+    def available(self) -> bool:
+        return os.path.exists(self.path)
+
+    def write(self, features, spec: dict = None):
+        """
+        Replaces the store with `features` (DataFrame: store_nbr, family, date + feature columns).
+        Written to a temp file and swapped in, so readers never see a partial store.
+        """
+        try:
+            feature_names = [col for col in features.columns if col not in KEY_COLS]
+            vectors = features[feature_names].to_numpy(dtype=np.float32)
+            keys = zip(
+                features["store_nbr"].astype(int).tolist(),
+                features["family"].astype(str).tolist(),
+                [normalize_date(d) for d in features["date"].astype(str).tolist()],
+            )
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+            conn = sqlite3.connect(tmp_path)
+            with conn:
+                conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                conn.execute(
+                    "CREATE TABLE features (store_nbr INTEGER, family TEXT, date TEXT, vector BLOB, "
+                    "PRIMARY KEY (store_nbr, family, date))"
+                )
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("feature_names", json.dumps(feature_names)),
+                    ("spec", json.dumps(spec)),
+                ])
+                conn.executemany(
+                    "INSERT INTO features VALUES (?, ?, ?, ?)",
+                    ((store, family, date, vector.tobytes()) for (store, family, date), vector in zip(keys, vectors))
+                )
+            conn.close()
+            os.replace(tmp_path, self.path)
+
+            logger.info(f"Online feature store written: {len(vectors)} rows x {len(feature_names)} features -> {self.path}")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load(self):
+        """
+        Reads the whole store into memory (tens of thousands of small rows).
+        """
+        try:
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            try:
+                meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+                rows = {
+                    (store, family, date): np.frombuffer(vector, dtype=np.float32)
+                    for store, family, date, vector in conn.execute("SELECT store_nbr, family, date, vector FROM features")
+                }
+            finally:
+                conn.close()
+
+            dates = sorted({key[2] for key in rows})
+            with self._lock:
+                self.feature_names = json.loads(meta["feature_names"])
+                self.spec = json.loads(meta.get("spec") or "null")
+                self._rows = rows
+                self._dates = [dates[0], dates[-1]] if dates else None
+                self._mtime = os.path.getmtime(self.path)
+            logger.info(f"Loaded online feature store ({len(rows)} rows) from {self.path}")
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def reload(self) -> bool:
+        """
+        Loads the store if it is not loaded yet or the file has been replaced since.
+        Blocking (SQLite read): the API calls it from a worker thread.
+        """
+        with self._reload_lock:
+            self._checked = time.monotonic()
+            if not self.available:
+                return False
+            if self._rows is None or os.path.getmtime(self.path) != self._mtime:
+                self.load()
+            return True
+
+    def refresh_due(self) -> bool:
+        """
+        True when the store is not loaded or the file was last checked refresh_seconds ago.
+        """
+        return self._rows is None or self._checked is None or time.monotonic() - self._checked >= self.refresh_seconds
+
+    def lookup(self, store_nbr: int, family: str, date) -> dict:
+        """
+        Model input features for one series and day: stored history features plus
+        store_nbr, family and calendar fields. Raises KeyError when the store has no row for it
+        or is not loaded (see reload()).
+        """
+        if self._rows is None:
+            raise KeyError(f"Online feature store not loaded from {self.path}")
+
+        day = datetime.date.fromisoformat(str(date)[:10])
+        family = normalize_family(family)
+        vector = self._rows.get((int(store_nbr), family, day.isoformat()))
+        self.lookups += 1
+        if vector is None:
+            self.misses += 1
+            raise KeyError(f"No features for store {store_nbr}, family '{family}', date {day.isoformat()}")
+
+        features = dict(zip(self.feature_names, vector.tolist()))
+        features.update({
+            "store_nbr": int(store_nbr),
+            "family": family,
+            "year": day.year,
+            "month": day.month,
+            "day_of_week": day.weekday(),  # 0=Mon, as add_date_features
+        })
+        return features
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "loaded": self._rows is not None,
+            "rows": len(self._rows) if self._rows else 0,
+            "features": self.feature_names,
+            "dates": self._dates,
+            "lookups": self.lookups,
+            "misses": self.misses,
+        }
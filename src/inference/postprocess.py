@@ -1,32 +1,67 @@
+import io
 import json
 import sys
 import numpy as np
 from src.utils.exception import CustomException
 
-class Postprocessor:
-    def postprocess_xgboost(self, raw_response) -> list:
-        try:
-            
-            if isinstance(raw_response, list):
-                return np.array(raw_response).flatten().tolist()
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-            if isinstance(raw_response, bytes):
-                response_str = raw_response.decode("utf-8")
-            else:
-                response_str = str(raw_response)
+NPY_MAGIC = b"\x93NUMPY"
 
-            clean_str = response_str.replace('[', '').replace(']', '').replace('\n', ',')
+# Separators the XGBoost container may put between predictions, all mapped to ','
+_SEPARATORS = bytes.maketrans(b"\n\r\t ", b",,,,")
 
-            predictions = [float(x) for x in clean_str.split(',') if x.strip()]
-            
-            return predictions
+def parse_prediction_buffer(raw_response, dtype=np.float32) -> np.ndarray:
+    """
+    Endpoint bytes -> 1D NumPy array in one C-level pass (no per-token float()).
+    Handles CSV, newline-separated and JSON-array style bodies.
+    """
+    if isinstance(raw_response, str):
+        raw_response = raw_response.encode("utf-8")
+
+    text = raw_response.translate(_SEPARATORS, b"[]").strip(b",")
+    if not text:
+        return np.empty(0, dtype=dtype)
+
+    try:
+        return np.fromstring(text, dtype=dtype, sep=",")
+    except ValueError:
+        # Doubled separators, e.g. "1, 2" -> "1,,2"
+        return np.array([token for token in text.split(b",") if token], dtype=dtype)
+
+class Postprocessor:
+    def postprocess_xgboost_array(self, raw_response, dtype=np.float32) -> np.ndarray:
+        """
+        Predictions as a NumPy buffer, for callers that never need Python floats.
+        """
+        try:
+            if isinstance(raw_response, list):
+                return np.asarray(raw_response, dtype=dtype).ravel()
+            return parse_prediction_buffer(raw_response, dtype=dtype)
 
         except Exception as e:
             raise CustomException(e, sys)
 
+    def postprocess_xgboost(self, raw_response) -> list:
+        """
+        Predictions as a list for the JSON response. Parsed as float64 so values
+        round-trip exactly as the endpoint printed them.
+        """
+        return self.postprocess_xgboost_array(raw_response, dtype=np.float64).tolist()
+
     def postprocess_lstm(self, raw_response: bytes) -> list:
         try:
-            response_json = json.loads(raw_response.decode("utf-8"))
+            # Binary responses (Accept: application/x-npy) carry the tensor as-is
+            if raw_response[:len(NPY_MAGIC)] == NPY_MAGIC:
+                return np.load(io.BytesIO(raw_response), allow_pickle=False).ravel().tolist()
+
+            if orjson is not None:
+                response_json = orjson.loads(raw_response)
+            else:
+                response_json = json.loads(raw_response.decode("utf-8"))
             
             if "predictions" in response_json:
                 predictions = np.array(response_json["predictions"]).flatten().tolist()
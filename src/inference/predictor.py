@@ -1,28 +1,207 @@
-import boto3
+import asyncio
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.inference.backends import LocalModelBackend
 from src.utils.logger import logger
 from src.utils.exception import CustomException
 
 class ModelPredictor:
-    def __init__(self, region_name="us-east-1"):
+    def __init__(
+        self,
+        region_name="us-east-1",
+        max_concurrency=None,
+        endpoint_url=None,
+        client=None,
+        max_pool_connections=None,
+        connect_timeout=None,
+        read_timeout=None,
+        max_retries=None,
+        retry_mode="adaptive",
+        tcp_keepalive=True,
+        backend=None,
+    ):
+        """
+        :param max_concurrency: Cap on in-flight endpoint calls made through predict_async()
+                                (defaults to $PREDICTOR_MAX_CONCURRENCY or 16).
+        :param endpoint_url: Override for the SageMaker runtime URL, e.g. a local stub endpoint
+                             (defaults to $SAGEMAKER_RUNTIME_URL).
+        :param client: Pre-built sagemaker-runtime client shared by all endpoints (used in tests).
+        :param max_pool_connections: HTTP connections kept per endpoint client
+                                     (defaults to $SAGEMAKER_POOL_SIZE or max_concurrency).
+        :param connect_timeout / read_timeout: Seconds, defaults to $SAGEMAKER_CONNECT_TIMEOUT (2)
+                                               and $SAGEMAKER_READ_TIMEOUT (30).
+        :param max_retries: Total attempts per call, defaults to $SAGEMAKER_MAX_RETRIES (3).
+        :param backend: PredictionBackend that serves calls instead of SageMaker.
+                        MODEL_BACKEND=local selects LocalModelBackend($LOCAL_MODEL_DIR or 'artifacts').
+        """
         try:
-            self.client = boto3.client("sagemaker-runtime", region_name=region_name)
+            if max_concurrency is None:
+                max_concurrency = int(os.getenv("PREDICTOR_MAX_CONCURRENCY", "16"))
+            if max_concurrency < 1:
+                raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+            self.max_concurrency = max_concurrency
+
+            if max_pool_connections is None:
+                max_pool_connections = int(os.getenv("SAGEMAKER_POOL_SIZE", str(max_concurrency)))
+            if connect_timeout is None:
+                connect_timeout = float(os.getenv("SAGEMAKER_CONNECT_TIMEOUT", "2"))
+            if read_timeout is None:
+                read_timeout = float(os.getenv("SAGEMAKER_READ_TIMEOUT", "30"))
+            if max_retries is None:
+                max_retries = int(os.getenv("SAGEMAKER_MAX_RETRIES", "3"))
+
+            self.max_pool_connections = max_pool_connections
+            self.region_name = region_name
+            self.endpoint_url = endpoint_url or os.getenv("SAGEMAKER_RUNTIME_URL")
+            self.client_settings = {
+                "max_pool_connections": max_pool_connections,
+                "connect_timeout": connect_timeout,
+                "read_timeout": read_timeout,
+                "retries": {"max_attempts": max_retries, "mode": retry_mode},
+                "tcp_keepalive": tcp_keepalive,
+            }
+
+            if backend is None and os.getenv("MODEL_BACKEND", "sagemaker").lower() == "local":
+                backend = LocalModelBackend(model_dir=os.getenv("LOCAL_MODEL_DIR", "artifacts"))
+            self.backend = backend
+
+            # One warm client (and connection pool) per endpoint.
+            # boto3 is imported on the first real client: it costs ~150ms of startup.
+            self._shared_client = client
+            self._session = None
+            self._clients = {}
+            self._pool_stats = {}
+            self._lock = threading.Lock()
+
+            # Bounded pool: extra async callers wait here instead of blocking the event loop
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_concurrency,
+                thread_name_prefix="sagemaker-invoke"
+            )
         except Exception as e:
             raise CustomException(e, sys)
 
-    def predict(self, endpoint_name: str, payload, content_type: str):
+    def _get_client(self, endpoint_name: str):
+        client = self._clients.get(endpoint_name)
+        if client is not None:
+            return client
+
+        # boto3 sessions are not thread-safe, so client creation is serialized
+        with self._lock:
+            if endpoint_name not in self._clients:
+                if self.backend is not None:
+                    self._clients[endpoint_name] = self.backend
+                elif self._shared_client is not None:
+                    self._clients[endpoint_name] = self._shared_client
+                else:
+                    if self._session is None:
+                        import boto3
+                        from botocore.config import Config
+                        self._session = boto3.session.Session()
+                        self._client_config = Config(**self.client_settings)
+
+                    logger.info(f"Creating SageMaker runtime client for {endpoint_name}")
+                    self._clients[endpoint_name] = self._session.client(
+                        "sagemaker-runtime",
+                        region_name=self.region_name,
+                        endpoint_url=self.endpoint_url,
+                        config=self._client_config
+                    )
+                self._pool_stats[endpoint_name] = {
+                    "in_flight": 0,
+                    "peak_in_flight": 0,
+                    "calls": 0,
+                    "saturated_calls": 0,
+                    "errors": 0,
+                }
+            return self._clients[endpoint_name]
+
+    def warm_up(self, endpoint_names):
+        """
+        Builds the per-endpoint clients (or loads the local models) ahead of the first request.
+        """
+        for endpoint_name in endpoint_names:
+            self._get_client(endpoint_name)
+        if self.backend is not None:
+            self.backend.load()
+
+    def _acquire(self, endpoint_name):
+        with self._lock:
+            stats = self._pool_stats[endpoint_name]
+            # Every pooled connection is busy: this call waits for one to free up
+            if stats["in_flight"] >= self.max_pool_connections:
+                stats["saturated_calls"] += 1
+            stats["in_flight"] += 1
+            stats["calls"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+
+    def _release(self, endpoint_name, failed):
+        with self._lock:
+            stats = self._pool_stats[endpoint_name]
+            stats["in_flight"] -= 1
+            if failed:
+                stats["errors"] += 1
+
+    def predict(self, endpoint_name: str, payload, content_type: str, accept: str = None):
+        client = self._get_client(endpoint_name)
+        self._acquire(endpoint_name)
+        failed = True
         try:
             logger.info(f"Invoking Endpoint: {endpoint_name}")
-            
-            response = self.client.invoke_endpoint(
-                EndpointName=endpoint_name,
-                ContentType=content_type,
-                Body=payload
-            )
-            
+
+            if self.backend is not None:
+                result = self.backend.invoke(endpoint_name, payload, content_type, accept)
+                failed = False
+                return result
+
+            request = {
+                "EndpointName": endpoint_name,
+                "ContentType": content_type,
+                "Body": payload,
+            }
+            if accept:
+                request["Accept"] = accept
+
+            response = client.invoke_endpoint(**request)
+
             result = response["Body"].read()
+            failed = False
             return result
-            
+
         except Exception as e:
             logger.error(f"Prediction failed for {endpoint_name}")
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
+        finally:
+            self._release(endpoint_name, failed)
+
+    async def predict_async(self, endpoint_name: str, payload, content_type: str, accept: str = None):
+        """
+        Non-blocking version of predict() for use inside async routes.
+        The boto3 call runs on the bounded thread pool, so at most
+        `max_concurrency` invocations are in flight at once.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.predict, endpoint_name, payload, content_type, accept
+        )
+
+    def pool_stats(self) -> dict:
+        """
+        Per-endpoint connection pool usage. `utilization` near 1.0 or a growing
+        `saturated_calls` count means the pool (or worker count) is undersized.
+        """
+        with self._lock:
+            report = {}
+            for endpoint_name, stats in self._pool_stats.items():
+                report[endpoint_name] = {
+                    **stats,
+                    "pool_size": self.max_pool_connections,
+                    "utilization": stats["in_flight"] / self.max_pool_connections,
+                    "peak_utilization": stats["peak_in_flight"] / self.max_pool_connections,
+                }
+            return report
+
+    def close(self):
+        self._executor.shutdown(wait=False)
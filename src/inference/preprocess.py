@@ -1,75 +1,318 @@
-import pandas as pd
 import numpy as np
 import joblib
+import io
 import os
 import sys
 import json
+import threading
+import time
 from src.utils.logger import logger
 from src.utils.exception import CustomException
 
-class Preprocessor:
-    def __init__(self):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# LSTM_PAYLOAD_FORMAT -> content type sent to (and requested from) the LSTM endpoint
+LSTM_CONTENT_TYPES = {
+    "json": "application/json",
+    "npy": "application/x-npy",
+}
+
+def encode_csv(data_array: np.ndarray) -> bytes:
+    """
+    2D float array -> header-less text/csv bytes. Values are cast to float32, the precision
+    XGBoost reads them in, and written with 9 significant digits, which round-trips float32
+    exactly. One bytes %-format over a template sized from the row count fills the whole body;
+    NaN becomes an empty field (missing).
+    """
+    values = np.asarray(data_array, dtype=np.float32)
+    n_rows, n_cols = values.shape
+    template = b"\n".join([b",".join([b"%.9g"] * n_cols)] * n_rows)
+    payload = template % tuple(values.ravel().tolist())
+    if np.isnan(values).any():
+        payload = payload.replace(b"nan", b"")
+    return payload
+
+def encode_npy(data_array: np.ndarray) -> bytes:
+    """
+    float32 .npy bytes: a fixed header plus the raw buffer, no per-value text formatting.
+    """
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(data_array, dtype=np.float32), allow_pickle=False)
+    return buffer.getvalue()
+
+def encode_json_instances(data_array: np.ndarray) -> str:
+    """
+    TF Serving {"instances": ...} body. orjson serializes the array natively when
+    installed; the stdlib fallback goes through tolist().
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            {"instances": np.ascontiguousarray(data_array)},
+            option=orjson.OPT_SERIALIZE_NUMPY
+        ).decode("utf-8")
+    return json.dumps({"instances": data_array.tolist()})
 
-        self.xgb_scaler_path = os.path.join("artifacts", "preprocessor_xgboost.pkl")
-        self.nn_scaler_path = os.path.join("artifacts", "preprocessor_nn.pkl")
-        
-        self.nn_scaler = None
-        self.xgb_scaler = None
+def compile_column_layout(column_transformer) -> dict:
+    """
+    Fitted ColumnTransformer (imputer / one-hot pipelines) -> direct output layout, so a dict
+    of raw features becomes a model row without building a DataFrame.
+    numeric: (output index, column, fill value); one_hot: (column, {category: output index}, fill value);
+    categorical: (output index, column, {category: code}, fill value), unknown categories are NaN.
+    one_hot_off: value of the inactive one-hot columns. NaN (missing) for sparse one-hot encoders:
+    XGBoost trained on their CSR output never saw a stored 0 there.
+    """
+    numeric, one_hot, categorical, width, one_hot_off = [], [], [], 0, 0.0
+    for name, pipeline, columns in column_transformer.transformers_:
+        if isinstance(pipeline, str):  # 'drop' / unused remainder
+            continue
+        steps = dict(pipeline.steps)
+        unsupported = set(steps) - {"imputer", "one_hot", "ordinal"}
+        if unsupported:
+            raise ValueError(f"Cannot compile step(s) {sorted(unsupported)} of '{name}'")
 
-        if os.path.exists(self.nn_scaler_path):
-            self.nn_scaler = joblib.load(self.nn_scaler_path)
-            logger.info(f"Loaded NN Preprocessor from {self.nn_scaler_path}")
+        imputer = steps.get("imputer")
+        fills = imputer.statistics_.tolist() if imputer is not None else [None] * len(columns)
+        encoder = steps.get("one_hot")
+        ordinal = steps.get("ordinal")
+        if ordinal is not None:
+            for column, categories, fill in zip(columns, ordinal.categories_, fills):
+                categorical.append((width, column, {c: float(i) for i, c in enumerate(categories.tolist())}, fill))
+                width += 1
+        elif encoder is not None:
+            if getattr(encoder, "sparse_output", False):
+                one_hot_off = np.nan
+            for column, categories, fill in zip(columns, encoder.categories_, fills):
+                one_hot.append((column, {c: width + i for i, c in enumerate(categories.tolist())}, fill))
+                width += len(categories)
         else:
-            logger.warning(f"NN Preprocessor not found at {self.nn_scaler_path}")
+            for column, fill in zip(columns, fills):
+                numeric.append((width, column, fill))
+                width += 1
+    one_hot_columns = [index for _, positions, _ in one_hot for index in positions.values()]
+    return {"width": width, "numeric": numeric, "one_hot": one_hot, "categorical": categorical,
+            "one_hot_columns": one_hot_columns, "one_hot_off": one_hot_off}
+
+# Artifacts live next to the code, not wherever the server was started from
+ARTIFACTS_DIR = os.getenv(
+    "ARTIFACTS_DIR",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "artifacts"))
+)
+
+_NOT_LOADED = object()
+
+class Preprocessor:
+    def __init__(self, artifacts_dir: str = None):
+        """
+        Fitted preprocessors are loaded lazily, on first use per model
+        (or all at once via preload()), so constructing this is free.
+        """
+        artifacts_dir = artifacts_dir or ARTIFACTS_DIR
+        self.xgb_scaler_path = os.path.join(artifacts_dir, "preprocessor_xgboost.pkl")
+        self.nn_scaler_path = os.path.join(artifacts_dir, "preprocessor_nn.pkl")
+
+        self._nn_scaler = _NOT_LOADED
+        self._xgb_scaler = _NOT_LOADED
+        self._xgb_layout = _NOT_LOADED
+        self._lock = threading.Lock()
+        self.load_times = {}  # artifact name -> seconds spent in joblib.load
+
+        # one_hot: scaled one-hot rows; index: one integer per categorical column (embedding models, see to_index_form)
+        self.lstm_input_form = os.getenv("LSTM_INPUT_FORM", "one_hot").lower()
+        self.lstm_payload_format = os.getenv("LSTM_PAYLOAD_FORMAT", "json").lower()
+        if self.lstm_payload_format not in LSTM_CONTENT_TYPES:
+            logger.warning(f"Unknown LSTM_PAYLOAD_FORMAT '{self.lstm_payload_format}', using json")
+            self.lstm_payload_format = "json"
+
+    def _load_artifact(self, name: str, path: str):
+        if not os.path.exists(path):
+            logger.warning(f"{name} Preprocessor not found at {path}")
+            return None
+
+        start = time.perf_counter()
+        artifact = joblib.load(path)
+        self.load_times[name] = time.perf_counter() - start
+        logger.info(f"Loaded {name} Preprocessor from {path} in {self.load_times[name]:.3f}s")
+        return artifact
+
+    @property
+    def nn_scaler(self):
+        if self._nn_scaler is _NOT_LOADED:
+            with self._lock:
+                if self._nn_scaler is _NOT_LOADED:
+                    self._nn_scaler = self._load_artifact("NN", self.nn_scaler_path)
+        return self._nn_scaler
+
+    @nn_scaler.setter
+    def nn_scaler(self, value):
+        self._nn_scaler = value
+
+    @property
+    def xgb_scaler(self):
+        if self._xgb_scaler is _NOT_LOADED:
+            with self._lock:
+                if self._xgb_scaler is _NOT_LOADED:
+                    self._xgb_scaler = self._load_artifact("XGBoost", self.xgb_scaler_path)
+        return self._xgb_scaler
+
+    @xgb_scaler.setter
+    def xgb_scaler(self, value):
+        self._xgb_scaler = value
+        self._xgb_layout = _NOT_LOADED
+
+    @property
+    def xgboost_layout(self):
+        """
+        Output layout of the fitted XGBoost preprocessor (None without the artifact).
+        """
+        if self._xgb_layout is _NOT_LOADED:
+            scaler = self.xgb_scaler
+            self._xgb_layout = compile_column_layout(scaler) if hasattr(scaler, "transformers_") else None
+        return self._xgb_layout
 
-        if os.path.exists(self.xgb_scaler_path):
-            self.xgb_scaler = joblib.load(self.xgb_scaler_path)
-            logger.info(f"Loaded XGBoost Preprocessor from {self.xgb_scaler_path}")
-        
-    def preprocess_xgboost(self, input_data: list) -> str:
+    def build_xgboost_rows(self, feature_rows: list) -> np.ndarray:
+        """
+        Raw feature dicts (e.g. from the online feature store) -> model-ready rows, matching
+        preprocessor_xgboost.pkl's transform: missing values take the imputer's fill,
+        unknown categories encode as all zeros (one-hot) or NaN (categorical codes).
+        """
         try:
-  
-            if input_data and isinstance(input_data[0], list):
-                df = pd.DataFrame(input_data)
-                required_cols = [
-                    'lag_7', 'lag_28', 'rolling_mean_7', 'rolling_std_7', 
-                    'day_of_week', 'month', 'is_weekend'
-                ]
-                if len(df.columns) == len(required_cols):
-                    df.columns = required_cols
-                
-                if self.xgb_scaler:
-                    try:
-                        scaled_values = self.xgb_scaler.transform(df)
-                        df = pd.DataFrame(scaled_values, columns=df.columns)
-                    except Exception as e:
-                        print(f"[WARNING] Scaling failed (Dimension mismatch?): {e}")
-
-                return df.to_csv(header=False, index=False).strip()
-            
-            df = pd.DataFrame(input_data)
-            if df.empty:
+            layout = self.xgboost_layout
+            if layout is None:
+                raise ValueError("The XGBoost preprocessor artifact is required to build rows from features.")
+
+            rows = np.zeros((len(feature_rows), layout["width"]), dtype=np.float64)
+            rows[:, layout["one_hot_columns"]] = layout["one_hot_off"]
+            for i, features in enumerate(feature_rows):
+                for index, column, fill in layout["numeric"]:
+                    value = features.get(column)
+                    rows[i, index] = fill if value is None or value != value else value
+                for column, positions, fill in layout["one_hot"]:
+                    value = features.get(column)
+                    index = positions.get(fill if value is None else value)
+                    if index is not None:
+                        rows[i, index] = 1.0
+                for index, column, codes, fill in layout["categorical"]:
+                    value = features.get(column)
+                    rows[i, index] = codes.get(fill if value is None else value, np.nan)
+            return rows
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def dense_xgboost_rows(self, matrix) -> np.ndarray:
+        """
+        Rows in the model's layout (dense or CSR) -> float rows, with the layout's one_hot_off
+        (NaN for sparse-trained models) in the inactive one-hot columns.
+        """
+        rows = np.asarray(matrix.toarray() if hasattr(matrix, "toarray") else matrix, dtype=np.float64)
+        layout = self.xgboost_layout
+        if layout is not None and layout["one_hot_off"] != 0.0:
+            one_hot = rows[:, layout["one_hot_columns"]]
+            rows[:, layout["one_hot_columns"]] = np.where(one_hot != 0.0, one_hot, layout["one_hot_off"])
+        return rows
+
+    def preload(self):
+        """
+        Loads every artifact now (e.g. from a background thread at startup).
+        """
+        return self.xgb_scaler, self.nn_scaler
+
+    def artifact_status(self) -> dict:
+        return {
+            "XGBoost": {
+                "path": self.xgb_scaler_path,
+                "loaded": self._xgb_scaler is not _NOT_LOADED,
+                "available": self._xgb_scaler is not _NOT_LOADED and self._xgb_scaler is not None,
+                "load_seconds": self.load_times.get("XGBoost"),
+            },
+            "NN": {
+                "path": self.nn_scaler_path,
+                "loaded": self._nn_scaler is not _NOT_LOADED,
+                "available": self._nn_scaler is not _NOT_LOADED and self._nn_scaler is not None,
+                "load_seconds": self.load_times.get("NN"),
+            },
+        }
+
+    def preprocess_xgboost(self, input_data: list) -> bytes:
+        """
+        Encodes feature rows as the text/csv payload of the XGBoost endpoint.
+        Goes straight from a float array to CSV bytes, no DataFrame round-trip.
+        """
+        try:
+            data_array = np.asarray(input_data, dtype=np.float64)
+            if data_array.size == 0:
                 raise ValueError("Preprocessing resulted in empty data.")
-                
-            return df.to_csv(header=False, index=False).strip()
+
+            if data_array.ndim == 1:
+                # A flat list is one column, as pd.DataFrame(list) reads it
+                data_array = data_array.reshape(-1, 1)
+            elif self.xgboost_layout is not None and data_array.shape[1] == self.xgboost_layout["width"]:
+                # Already in the model's feature layout (e.g. build_xgboost_rows output)
+                data_array = self.dense_xgboost_rows(data_array)
+            elif self.xgb_scaler:
+                try:
+                    data_array = self.dense_xgboost_rows(self.xgb_scaler.transform(data_array))
+                except Exception as e:
+                    logger.warning(f"Scaling failed (Dimension mismatch?): {e}")
+
+            return encode_csv(data_array)
 
         except Exception as e:
-            print(f"Preprocessing Error: {e}")
+            logger.error(f"Preprocessing Error: {e}")
             raise CustomException(e, sys)
 
-    def preprocess_lstm(self, input_data: list) -> str:
+    def combine_payloads(self, model_type: str, payloads: list):
+        """
+        Joins preprocessed payloads (same model, same row shape) into one request body,
+        without decoding them back to rows: CSV lines, JSON instances or .npy arrays.
+        """
+        if len(payloads) == 1:
+            return payloads[0]
+        if model_type == "xgboost":
+            return b"\n".join(payloads)
+        if self.lstm_payload_format == "npy":
+            return encode_npy(np.concatenate([np.load(io.BytesIO(payload)) for payload in payloads]))
+        # {"instances": [...]} bodies: keep each list's contents, wrap them in one list
+        instances = [payload[payload.index("[") + 1:payload.rindex("]")] for payload in payloads]
+        return '{"instances": [' + ",".join(instances) + "]}"
 
+    @property
+    def lstm_content_type(self) -> str:
+        return LSTM_CONTENT_TYPES[self.lstm_payload_format]
+
+    def preprocess_lstm(self, input_data: list):
+        """
+        Scales and reshapes rows to (samples, 1, features). Models trained with LSTM_WINDOW > 1
+        take one window of consecutive days per sample: (samples, window, features) input, oldest day first.
+        Returns a JSON string, or float32 .npy bytes when LSTM_PAYLOAD_FORMAT=npy.
+        """
         try:
             data_array = np.array(input_data)
+            # Windows are scaled row by row, then put back into (samples, window, features)
+            window_shape = data_array.shape[:2] if data_array.ndim == 3 else None
+            if window_shape:
+                data_array = data_array.reshape((-1, data_array.shape[2]))
             
             if self.nn_scaler:
                 data_array = self.nn_scaler.transform(data_array)
+                if self.lstm_input_form == "index":
+                    # Imported here: sklearn is already loaded with the artifact, the API stays cheap to start
+                    from src.data_processing.transform import to_index_form
+                    frame, _ = to_index_form(data_array, self.nn_scaler, list(self.nn_scaler.get_feature_names_out()))
+                    data_array = frame.to_numpy(dtype=np.float32)
+                elif hasattr(data_array, "toarray"):
+                    data_array = data_array.toarray()
             
-            if data_array.ndim == 2:
+            if window_shape:
+                data_array = data_array.reshape(window_shape + (data_array.shape[1],))
+            elif data_array.ndim == 2:
                 data_array = data_array.reshape((data_array.shape[0], 1, data_array.shape[1]))
-            
-            payload = json.dumps({"instances": data_array.tolist()})
-            
-            return payload
+
+            if self.lstm_payload_format == "npy":
+                return encode_npy(data_array)
+
+            return encode_json_instances(data_array)
         except Exception as e:
-            raise CustomException(e, sys)
\ No newline at end of file
+            raise CustomException(e, sys)
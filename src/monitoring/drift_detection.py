@@ -3,6 +3,7 @@ import os
 import pandas as pd
 import numpy as np
 from scipy.stats import ks_2samp
+from src.data_processing.storage import read_frame, find_split_file
 from src.utils.logger import logger
 from src.utils.exception import CustomException
 
@@ -15,9 +16,12 @@ class DriftDetector:
         self.threshold = threshold
         self.drift_report = {}
 
-    def load_data(self, path: str) -> pd.DataFrame:
+    def load_data(self, path: str, columns=None) -> pd.DataFrame:
+        """
+        Loads a processed split (.parquet, .feather or .csv).
+        """
         try:
-            return pd.read_csv(path)
+            return read_frame(path, columns=columns)
         except Exception as e:
             raise CustomException(e, sys)
 
@@ -81,10 +85,11 @@ if __name__ == "__main__":
     try:
         detector = DriftDetector()
         
-        ref_path = os.path.join("data", "post", "xgboost", "train.csv")
-        cur_path = os.path.join("data", "post", "xgboost", "test.csv")
+        data_dir = os.path.join("data", "post", "xgboost")
         
-        if os.path.exists(ref_path) and os.path.exists(cur_path):
+        if os.path.isdir(data_dir):
+            ref_path = find_split_file(data_dir, "train")
+            cur_path = find_split_file(data_dir, "test")
             ref = detector.load_data(ref_path)
             cur = detector.load_data(cur_path)
             report = detector.detect_drift(ref, cur)
@@ -3,42 +3,37 @@ import os
 
 sys.path.append(os.getcwd())
 
-from src.data_processing.load import load_data
-from src.data_processing.validate import validate_data
-from src.data_processing.clean import clean_data
-from src.features.calendar_features import add_date_features
 from src.data_processing.save_split_data import process_and_save_nn
+from src.pipeline.shared_stages import RAW_DATA_PATH, prepare_base_frame
+from src.pipeline.stage_cache import StageCache
 from src.utils.logger import logger
+from src.utils.profiling import StageProfiler
 from src.utils.exception import CustomException
 
+def run_branch(df, profiler: StageProfiler):
+    """
+    Steps 5-6 on the prepared (cleaned, calendar-featured) frame.
+    """
+    # --- STEP 5: LAG FEATURES ---
+    # SKIPPED 
+    
+    # --- STEP 6: TRANSFORM, SPLIT & SAVE ---
+    logger.info("Step 6: Splitting, Transforming (Scaling), and Saving...")
+    with profiler.stage("nn_split_save"):
+        process_and_save_nn(df)
+
 def main():
     try:
+        profiler = StageProfiler()
         logger.info(">>>>>>>> STARTING NEURAL NETWORK PIPELINE <<<<<<<<")
 
-        # --- STEP 1: LOAD ---
-        raw_data_path = os.path.join("data", "raw", "sales_data.csv")
-        logger.info(f"Step 1: Loading data from {raw_data_path}...")
-        df = load_data(raw_data_path)
-
-        # --- STEP 2: VALIDATE ---
-        logger.info("Step 2: Validating schema...")
-        validate_data(df)
+        # --- STEPS 1-4: LOAD, VALIDATE, CLEAN, CALENDAR FEATURES ---
+        # Shared with the XGBoost pipeline; served from the stage cache when nothing changed
+        df = prepare_base_frame(RAW_DATA_PATH, profiler, StageCache())
 
-        # --- STEP 3: CLEAN ---
-        logger.info("Step 3: Cleaning data...")
-        df = clean_data(df)
-
-        # --- STEP 4: CALENDAR FEATURES ---
-        logger.info("Step 4: Generating Calendar Features...")
-        df = add_date_features(df)
-
-        # --- STEP 5: LAG FEATURES ---
-        # SKIPPED 
-        
-        # --- STEP 6: TRANSFORM, SPLIT & SAVE ---
-        logger.info("Step 6: Splitting, Transforming (Scaling), and Saving...")
-        process_and_save_nn(df)
+        run_branch(df, profiler)
 
+        profiler.log_report()
         logger.info(">>>>>>>> PIPELINE COMPLETED SUCCESSFULLY <<<<<<<<")
 
     except Exception as e:
@@ -46,4 +41,4 @@ def main():
         raise CustomException(e, sys)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
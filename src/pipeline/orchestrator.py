@@ -0,0 +1,58 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.getcwd())
+
+from src.pipeline import nn_data_feature_pipeline, xgboost_data_feature_pipeline
+from src.pipeline.shared_stages import RAW_DATA_PATH, prepare_base_frame
+from src.pipeline.stage_cache import StageCache
+from src.utils.logger import logger
+from src.utils.profiling import StageProfiler
+from src.utils.exception import CustomException
+
+BRANCHES = ("xgboost", "nn")
+
+def main(branches=BRANCHES, use_cache: bool = True):
+    """
+    Runs the XGBoost and/or NN branches off one load -> validate -> clean -> calendar pass
+    (steps 1-4), which the stage cache skips entirely when the raw data and code are unchanged.
+    """
+    try:
+        profiler = StageProfiler()
+        logger.info(f">>>>>>>> STARTING DATA PIPELINES ({', '.join(branches)}) <<<<<<<<")
+
+        # --- STEPS 1-4: LOAD, VALIDATE, CLEAN, CALENDAR FEATURES (ONCE) ---
+        df = prepare_base_frame(RAW_DATA_PATH, profiler, StageCache() if use_cache else None)
+
+        # --- NN BRANCH ---
+        if "nn" in branches:
+            logger.info(">>> NN branch")
+            nn_data_feature_pipeline.run_branch(df, profiler)
+
+        # --- XGBOOST BRANCH ---
+        if "xgboost" in branches:
+            logger.info(">>> XGBoost branch")
+            builder = None
+            if xgboost_data_feature_pipeline.incremental_enabled():
+                builder = xgboost_data_feature_pipeline.feature_state_builder()
+                if builder.has_state():
+                    # The incremental branch only needs the newly arrived days
+                    new_data_path = os.getenv("NEW_DATA_PATH", os.path.join("data", "raw", "new_sales_data.csv"))
+                    df = prepare_base_frame(new_data_path, profiler)
+            xgboost_data_feature_pipeline.run_branch(df, profiler, builder)
+
+        profiler.log_report()
+        logger.info(">>>>>>>> PIPELINES COMPLETED SUCCESSFULLY <<<<<<<<")
+
+    except Exception as e:
+        logger.error(f"Pipeline Failed: {e}")
+        raise CustomException(e, sys)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--branches", nargs="+", choices=BRANCHES, default=list(BRANCHES))
+    parser.add_argument("--no-cache", action="store_true", help="Recompute steps 1-4 and leave the stage cache untouched")
+    args = parser.parse_args()
+
+    main(branches=args.branches, use_cache=not args.no_cache)
@@ -0,0 +1,85 @@
+import os
+import sys
+import pandas as pd
+import src.data_processing.load as load_module
+import src.data_processing.validate as validate_module
+import src.data_processing.clean as clean_module
+import src.data_processing.frame_order as frame_order_module
+import src.features.calendar_features as calendar_module
+from src.data_processing.load import load_data
+from src.data_processing.clean import clean_data
+from src.features.calendar_features import add_date_features
+from src.pipeline.stage_cache import StageCache
+from src.utils.logger import logger
+from src.utils.profiling import StageProfiler
+from src.utils.exception import CustomException
+
+RAW_DATA_PATH = os.path.join("data", "raw", "sales_data.csv")
+
+# Code whose changes invalidate the cached prepared frame
+PREP_MODULES = [load_module, validate_module, clean_module, frame_order_module, calendar_module, sys.modules[__name__]]
+
+def prep_params() -> dict:
+    """
+    Settings that can change the prepared frame (part of its cache key).
+    """
+    return {
+        "engine": os.getenv("LOAD_ENGINE", "c"),
+        "validation": os.getenv("VALIDATION_MODE", "chunked"),
+        "validation_sample_frac": os.getenv("VALIDATION_SAMPLE_FRAC", "0.05"),
+    }
+
+def load_clean_calendar(raw_data_path: str, profiler: StageProfiler) -> pd.DataFrame:
+    """
+    Steps 1-4, shared by both model branches: load + validate -> clean -> calendar features.
+    """
+    # --- STEP 1: LOAD ---
+    logger.info(f"Step 1: Loading data from {raw_data_path}...")
+    # --- STEP 2: VALIDATE ---
+    logger.info("Step 2: Validating schema while loading...")
+    # Typed, chunked read: final dtypes on load keep peak memory near the final frame size.
+    # Each chunk is validated (VALIDATION_MODE) as it arrives; the coerced frame is kept,
+    # so clean_data has no dtype conversions left to do
+    with profiler.stage("load_validate"):
+        df = load_data(
+            raw_data_path, typed=True, chunksize=500_000,
+            engine=os.getenv("LOAD_ENGINE", "c"), validate=True
+        )
+
+    # --- STEP 3: CLEAN ---
+    logger.info("Step 3: Cleaning data...")
+    with profiler.stage("clean"):
+        df = clean_data(df)
+
+    # --- STEP 4: CALENDAR FEATURES ---
+    logger.info("Step 4: Generating Calendar Features...")
+    with profiler.stage("calendar"):
+        df = add_date_features(df)
+
+    # Same index as a frame read back from the stage cache
+    return df.reset_index(drop=True)
+
+def prepare_base_frame(raw_data_path: str, profiler: StageProfiler, cache: StageCache = None) -> pd.DataFrame:
+    """
+    The cleaned, calendar-featured frame for raw_data_path: from the stage cache when the raw
+    file, the holidays file, the prep code and prep_params() are unchanged, else steps 1-4.
+    """
+    try:
+        if cache is None or not cache.enabled:
+            return load_clean_calendar(raw_data_path, profiler)
+
+        with profiler.stage("cache_key"):
+            holidays_path = os.getenv("HOLIDAYS_PATH", os.path.join("data", "raw", "holidays_events.csv"))
+            key = cache.key(files=[raw_data_path, holidays_path], modules=PREP_MODULES, params=prep_params())
+
+        stage = "prepared-" + os.path.splitext(os.path.basename(raw_data_path))[0]
+        with profiler.stage("cache_read"):
+            df = cache.load(stage, key)
+        if df is None:
+            df = load_clean_calendar(raw_data_path, profiler)
+            with profiler.stage("cache_write"):
+                cache.save(stage, key, df)
+        return df
+
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import os
+import glob
+import pandas as pd
+from src.utils.logger import logger
+
+HASH_BLOCK_SIZE = 1 << 20
+
+def file_digest(path: str) -> str:
+    """
+    sha256 of a file's content ("missing" when the file does not exist).
+    """
+    if not path or not os.path.exists(path):
+        return "missing"
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class StageCache:
+    """
+    Content-addressed cache of stage output frames, stored as Feather (Arrow IPC).
+
+    An entry's key hashes the stage's input files, the source of the modules that
+    compute it and its parameters, so changing the raw data, the stage code or a
+    setting computes (and caches) the stage again. Only the latest entry per stage is kept.
+    STAGE_CACHE_DIR (default data/cache) sets the location, STAGE_CACHE=false disables it.
+    """
+    def __init__(self, cache_dir: str = None, enabled: bool = None):
+        self.cache_dir = cache_dir or os.getenv("STAGE_CACHE_DIR", os.path.join("data", "cache"))
+        self.enabled = enabled if enabled is not None else os.getenv("STAGE_CACHE", "true").lower() == "true"
+
+    def key(self, files=(), modules=(), params: dict = None) -> str:
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(f"{os.path.basename(path)}:{file_digest(path)}".encode())
+        for module in modules:
+            digest.update(file_digest(module.__file__).encode())
+        digest.update(json.dumps({"pandas": pd.__version__, **(params or {})}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{stage}-{key[:16]}.feather")
+
+    def load(self, stage: str, key: str):
+        """
+        The cached frame for (stage, key), or None on a miss.
+        """
+        path = self.path(stage, key)
+        if not self.enabled or not os.path.exists(path):
+            return None
+        logger.info(f"Stage cache hit for '{stage}': {path}")
+        return pd.read_feather(path)
+
+    def save(self, stage: str, key: str, df: pd.DataFrame) -> str:
+        """
+        Writes the entry atomically and removes older entries of the same stage.
+        """
+        path = self.path(stage, key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        df.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, path)
+
+        for old_path in glob.glob(os.path.join(self.cache_dir, f"{stage}-*.feather")):
+            if old_path != path:
+                os.remove(old_path)
+        logger.info(f"Stage '{stage}' cached to {path}")
+        return path
@@ -3,48 +3,82 @@ import os
 
 sys.path.append(os.getcwd())
 
-from src.data_processing.load import load_data
-from src.data_processing.validate import validate_data
-from src.data_processing.clean import clean_data
-from src.features.calendar_features import add_date_features
 from src.features.lag_features import add_lag_features
-from src.data_processing.save_split_data import process_and_save_xgboost
+from src.features.lag_features import FeatureSpec
+from src.features.incremental_features import IncrementalFeatureBuilder, future_features
+from src.inference.feature_store import OnlineFeatureStore
+from src.data_processing.save_split_data import process_and_save_xgboost, process_and_save_xgboost_incremental
+from src.pipeline.shared_stages import RAW_DATA_PATH, prepare_base_frame
+from src.pipeline.stage_cache import StageCache
 from src.utils.logger import logger
+from src.utils.profiling import StageProfiler
 from src.utils.exception import CustomException
 
+def incremental_enabled() -> bool:
+    return os.getenv("INCREMENTAL_FEATURES", "false").lower() == "true"
+
+def feature_state_builder() -> IncrementalFeatureBuilder:
+    return IncrementalFeatureBuilder(os.getenv("FEATURE_STATE_DIR", os.path.join("data", "features")))
+
+def run_branch(df, profiler: StageProfiler, builder: IncrementalFeatureBuilder = None):
+    """
+    Steps 5-7 on the prepared (cleaned, calendar-featured) frame.
+    builder: featurise df as new rows on top of the builder's stored state (INCREMENTAL_FEATURES).
+    """
+    # --- STEP 5: LAG FEATURES ---
+    logger.info("Step 5: Generating Lag & Rolling Features...")
+    with profiler.stage("lags"):
+        if builder is not None:
+            # Only the new rows are featurised; earlier rows stay in the stored parts
+            builder.append_features(builder.update(df))
+            latest_features = builder.future_features()
+        else:
+            latest_features = future_features(df, FeatureSpec())
+            df = add_lag_features(df)
+
+    # --- STEP 6: TRANSFORM, SPLIT & SAVE ---
+    logger.info("Step 6: Splitting, Transforming, and Saving...")
+    with profiler.stage("xgb_split_save"):
+        if builder is not None:
+            # Only the new parts are transformed, with the persisted preprocessor
+            process_and_save_xgboost_incremental(builder)
+        else:
+            process_and_save_xgboost(df)
+
+    # --- STEP 7: ONLINE FEATURE STORE ---
+    logger.info("Step 7: Publishing latest features to the online feature store...")
+    with profiler.stage("store"):
+        OnlineFeatureStore().write(latest_features, spec=FeatureSpec().to_dict())
+
 def main():
     """
     Orchestrates the End-to-End Data Pipeline for XGBoost:
     1. Load -> 2. Validate -> 3. Clean -> 4. Feature Engineering -> 5. Transform & Split -> 6. Save
+    -> 7. Publish the next HORIZON days of features to the online feature store
+    Steps 1-4 are shared with the NN pipeline and served from the stage cache when
+    nothing changed (src/pipeline/shared_stages.py).
+
+    INCREMENTAL_FEATURES=true: once the feature state in FEATURE_STATE_DIR exists, only
+    NEW_DATA_PATH (the newly arrived days) is loaded and featurised; step 6 transforms only
+    those rows with the persisted preprocessor and re-splits the cached matrices.
     """
     try:
+        profiler = StageProfiler()
         logger.info(">>>>>>>> STARTING XGBOOST PIPELINE <<<<<<<<")
 
-        # --- STEP 1: LOAD ---
-        raw_data_path = os.path.join("data", "raw", "sales_data.csv")
-        logger.info(f"Step 1: Loading data from {raw_data_path}...")
-        df = load_data(raw_data_path)
-
-        # --- STEP 2: VALIDATE ---
-        logger.info("Step 2: Validating schema...")
-        validate_data(df)
-
-        # --- STEP 3: CLEAN ---
-        logger.info("Step 3: Cleaning data (Grid expansion & sorting)...")
-        df = clean_data(df)
-
-        # --- STEP 4: CALENDAR FEATURES ---
-        logger.info("Step 4: generating Calendar Features...")
-        df = add_date_features(df)
+        incremental = incremental_enabled()
+        builder = feature_state_builder()
 
-        # --- STEP 5: LAG FEATURES ---
-        logger.info("Step 5: Generating Lag & Rolling Features...")
-        df = add_lag_features(df)
+        # --- STEPS 1-4: LOAD, VALIDATE, CLEAN, CALENDAR FEATURES ---
+        raw_data_path, cache = RAW_DATA_PATH, StageCache()
+        if incremental and builder.has_state():
+            # Only the new days: nothing worth caching
+            raw_data_path, cache = os.getenv("NEW_DATA_PATH", os.path.join("data", "raw", "new_sales_data.csv")), None
+        df = prepare_base_frame(raw_data_path, profiler, cache)
 
-        # --- STEP 6: TRANSFORM, SPLIT & SAVE ---
-        logger.info("Step 6: Splitting, Transforming, and Saving...")
-        process_and_save_xgboost(df)
+        run_branch(df, profiler, builder if incremental else None)
 
+        profiler.log_report()
         logger.info(">>>>>>>> PIPELINE COMPLETED SUCCESSFULLY <<<<<<<<")
 
     except Exception as e:
@@ -52,4 +86,4 @@ def main():
         raise CustomException(e, sys)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,49 @@
+import asyncio
+import numpy as np
+import pytest
+import xgboost as xgb
+from src.inference.backends import LocalModelBackend, decode_csv
+from src.inference.predictor import ModelPredictor
+from src.inference.preprocess import Preprocessor
+from src.inference.postprocess import Postprocessor
+from src.utils.exception import CustomException
+
+@pytest.fixture
+def model_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.random((200, 5))
+    y = X @ np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    booster = xgb.train({"max_depth": 3}, xgb.DMatrix(X, label=y), num_boost_round=10)
+    booster.save_model(str(tmp_path / "xgboost-model"))
+    return tmp_path, booster
+
+def test_decode_csv():
+    assert decode_csv("1.0,2.0\n3.0,4.0").tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    assert np.isnan(decode_csv(b"1.0,,3.0")[0, 1])
+
+def test_offline_xgboost_forecast(model_dir):
+    path, booster = model_dir
+    predictor = ModelPredictor(backend=LocalModelBackend(model_dir=str(path)))
+    preprocessor = Preprocessor()
+    preprocessor.xgb_scaler = None
+
+    rows = [[0.1, 0.2, 0.3, 0.4, 0.5], [0.9, 0.8, 0.7, 0.6, 0.5]]
+    payload = preprocessor.preprocess_xgboost(rows)
+    raw_response = asyncio.run(predictor.predict_async("retail-xgb-endpoint", payload, "text/csv"))
+    forecast = Postprocessor().postprocess_xgboost(raw_response)
+
+    expected = booster.predict(xgb.DMatrix(np.array(rows, dtype=np.float32)))
+    np.testing.assert_allclose(forecast, expected, rtol=1e-6)
+    assert predictor.pool_stats()["retail-xgb-endpoint"]["calls"] == 1
+
+def test_warm_up_loads_models(model_dir):
+    path, _ = model_dir
+    backend = LocalModelBackend(model_dir=str(path))
+    ModelPredictor(backend=backend).warm_up(["retail-xgb-endpoint"])
+    assert backend._booster is not None
+
+def test_unsupported_content_type(model_dir):
+    path, _ = model_dir
+    predictor = ModelPredictor(backend=LocalModelBackend(model_dir=str(path)))
+    with pytest.raises(CustomException):
+        predictor.predict("retail-xgb-endpoint", b"1", "image/png")
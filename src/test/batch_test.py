@@ -0,0 +1,122 @@
+import asyncio
+import json
+from fastapi.testclient import TestClient
+from src.inference.batch import aiter_rows, aiter_chunks, stream_forecasts
+
+async def body_from(parts):
+    for part in parts:
+        yield part
+
+async def collect(async_iter):
+    return [item async for item in async_iter]
+
+def test_rows_split_across_network_chunks():
+    parts = [b"[1.0, 2.0]\n[3.0", b", 4.0]\n\n[5.0, 6.0]"]
+    rows = asyncio.run(collect(aiter_rows(body_from(parts))))
+    assert rows == [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+
+def test_csv_rows():
+    parts = [b"1,2\n3,4\n"]
+    rows = asyncio.run(collect(aiter_rows(body_from(parts), "text/csv")))
+    assert rows == [[1.0, 2.0], [3.0, 4.0]]
+
+def test_stream_respects_parallelism_and_reports_offsets():
+    in_flight = 0
+    peak = 0
+
+    async def score_chunk(rows):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [row[0] for row in rows]
+
+    async def _run():
+        rows = aiter_rows(body_from([b"".join(b"[%d]\n" % i for i in range(10))]))
+        lines = await collect(stream_forecasts(aiter_chunks(rows, 3), score_chunk, max_parallel_chunks=2))
+        return [json.loads(line) for line in lines]
+
+    results = asyncio.run(_run())
+
+    assert peak <= 2
+    assert sorted(r["start"] for r in results) == [0, 3, 6, 9]
+    forecast = {}
+    for r in results:
+        for i, value in enumerate(r["forecast"]):
+            forecast[r["start"] + i] = value
+    assert forecast == {i: float(i) for i in range(10)}
+
+def test_malformed_line_reported_in_band():
+    async def score_chunk(rows):
+        return [0.0] * len(rows)
+
+    async def _run():
+        rows = aiter_rows(body_from([b"[1.0]\nnot json\n"]))
+        return await collect(stream_forecasts(aiter_chunks(rows, 1), score_chunk))
+
+    lines = [json.loads(line) for line in asyncio.run(_run())]
+    assert lines[0] == {"start": 0, "count": 1, "forecast": [0.0]}
+    assert "line 2" in lines[-1]["error"]
+
+def test_batch_route_streams_ndjson(monkeypatch):
+    import app
+    from api.routes import forecast
+
+    async def predict_async(endpoint_name, payload, content_type, accept=None):
+        return b"\n".join(line.split(b",")[0] for line in payload.splitlines())
+
+    body = "".join(f"[{i}.0, 1.0]\n" for i in range(25))
+    with TestClient(app.app) as client:
+        monkeypatch.setattr(forecast.predictor, "predict_async", predict_async)
+        monkeypatch.setattr(forecast.preprocessor, "xgb_scaler", None)
+
+        response = client.post(
+            "/api/v1/predict/batch?model_type=xgboost&chunk_size=10",
+            content=body,
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["count"] for line in lines) == [5, 10, 10]
+    assert sum(len(line["forecast"]) for line in lines) == 25
+
+def test_batch_route_answers_before_the_upload_ends(monkeypatch):
+    import app
+    from api.routes import forecast
+
+    async def predict_async(endpoint_name, payload, content_type, accept=None):
+        return b"\n".join(line.split(b",")[0] for line in payload.splitlines())
+
+    forecast.init_components()
+    monkeypatch.setattr(forecast.predictor, "predict_async", predict_async)
+    monkeypatch.setattr(forecast.preprocessor, "xgb_scaler", None)
+
+    async def _run():
+        first_line_sent = asyncio.Event()
+        parts = [b"[1.0, 0.0]\n", b"[2.0, 0.0]\n"]
+        sent = []
+
+        async def receive():
+            # The rest of the upload only arrives once the first forecast went out
+            if len(parts) == 1:
+                await first_line_sent.wait()
+            return {"type": "http.request", "body": parts.pop(0), "more_body": bool(parts)}
+
+        async def send(message):
+            sent.append(message)
+            if message["type"] == "http.response.body" and message.get("body"):
+                first_line_sent.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0", "spec_version": "2.3"}, "http_version": "1.1",
+            "method": "POST", "scheme": "http", "path": "/api/v1/predict/batch", "raw_path": b"/api/v1/predict/batch",
+            "root_path": "", "query_string": b"model_type=xgboost&chunk_size=1",
+            "headers": [(b"content-type", b"application/x-ndjson")], "client": ("test", 1), "server": ("test", 80),
+        }
+        await asyncio.wait_for(app.app(scope, receive, send), timeout=5)
+        return [json.loads(m["body"]) for m in sent if m["type"] == "http.response.body" and m.get("body")]
+
+    lines = asyncio.run(_run())
+    assert [line["forecast"] for line in lines] == [[1.0], [2.0]]
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import pytest
+from src.inference.batcher import RequestCoalescer
+from src.inference.preprocess import Preprocessor
+from src.inference.postprocess import Postprocessor
+
+class StubPredictor:
+    """
+    Records every payload and 'predicts' the first feature of each CSV row.
+    """
+    def __init__(self, fail=False):
+        self.payloads = []
+        self.fail = fail
+
+    async def predict_async(self, endpoint_name, payload, content_type, accept=None):
+        self.payloads.append(payload)
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("endpoint unavailable")
+        rows = payload.splitlines()
+        return b"\n".join(row.split(b",")[0] for row in rows)
+
+def make_coalescer(predictor, **kwargs):
+    preprocessor = Preprocessor()
+    preprocessor.xgb_scaler = None
+    return RequestCoalescer(predictor, preprocessor, Postprocessor(), **kwargs)
+
+def test_concurrent_requests_share_one_call():
+    predictor = StubPredictor()
+    coalescer = make_coalescer(predictor, max_wait_ms=20, max_batch_rows=100)
+
+    async def _run():
+        return await asyncio.gather(*[
+            coalescer.submit("xgboost", "xgb-endpoint", [[float(i), 0.0, 1.0]])
+            for i in range(10)
+        ])
+
+    results = asyncio.run(_run())
+
+    assert len(predictor.payloads) == 1
+    assert results == [[float(i)] for i in range(10)]
+
+def test_batch_flushes_at_max_rows():
+    predictor = StubPredictor()
+    coalescer = make_coalescer(predictor, max_wait_ms=20, max_batch_rows=4)
+
+    async def _run():
+        return await asyncio.gather(
+            coalescer.submit("xgboost", "xgb-endpoint", [[1.0, 0.0], [2.0, 0.0], [3.0, 0.0]]),
+            coalescer.submit("xgboost", "xgb-endpoint", [[4.0, 0.0], [5.0, 0.0]]),
+            coalescer.submit("xgboost", "xgb-endpoint", [[6.0, 0.0]]),
+        )
+
+    results = asyncio.run(_run())
+
+    assert len(predictor.payloads) == 2
+    assert results == [[1.0, 2.0, 3.0], [4.0, 5.0], [6.0]]
+    assert coalescer.stats()["rows_sent"] == 6
+
+def test_endpoint_error_reaches_every_caller():
+    coalescer = make_coalescer(StubPredictor(fail=True), max_wait_ms=5)
+
+    async def _run():
+        return await asyncio.gather(
+            coalescer.submit("xgboost", "xgb-endpoint", [[1.0]]),
+            coalescer.submit("xgboost", "xgb-endpoint", [[2.0]]),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(_run())
+    assert all(isinstance(r, Exception) for r in results)
+
+def test_empty_rows_rejected():
+    coalescer = make_coalescer(StubPredictor())
+    with pytest.raises(ValueError):
+        asyncio.run(coalescer.submit("xgboost", "xgb-endpoint", []))
+
+def test_given_payload_is_not_preprocessed_again():
+    predictor = StubPredictor()
+    coalescer = make_coalescer(predictor, max_wait_ms=5)
+    coalescer.preprocessor.preprocess_xgboost = lambda rows: pytest.fail("rows preprocessed twice")
+
+    async def _run():
+        return await asyncio.gather(
+            coalescer.submit("xgboost", "xgb-endpoint", [[1.0, 0.0]], payload=b"7,0"),
+            coalescer.submit("xgboost", "xgb-endpoint", [[2.0, 0.0], [3.0, 0.0]], payload=b"8,0\n9,0"),
+        )
+
+    assert asyncio.run(_run()) == [[7.0], [8.0, 9.0]]
+    assert predictor.payloads == [b"7,0\n8,0\n9,0"]
+
+@pytest.mark.parametrize("payload_format", ["json", "npy"])
+def test_lstm_payloads_combine_into_one_body(payload_format):
+    preprocessor = Preprocessor()
+    preprocessor.nn_scaler = None
+    preprocessor.lstm_payload_format = payload_format
+    first, second = [[1.0, 2.0]], [[3.0, 4.0], [5.0, 6.0]]
+
+    combined = preprocessor.combine_payloads(
+        "lstm", [preprocessor.preprocess_lstm(first), preprocessor.preprocess_lstm(second)]
+    )
+    expected = preprocessor.preprocess_lstm(first + second)
+    if payload_format == "json":
+        assert json.loads(combined) == json.loads(expected)
+    else:
+        assert combined == expected
@@ -0,0 +1,66 @@
+import time
+from src.inference.cache import PredictionCache
+
+def test_hit_and_miss_counters():
+    cache = PredictionCache(max_size=10, ttl_seconds=60)
+    key = cache.make_key("xgboost", "xgb-endpoint", "1.0,2.0\n3.0,4.0")
+
+    assert cache.get(key) is None
+    cache.set(key, [10.0, 20.0])
+    assert cache.get(key) == [10.0, 20.0]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+def test_key_depends_on_model_endpoint_and_payload():
+    base = PredictionCache.make_key("xgboost", "xgb-endpoint", "1,2")
+    assert base == PredictionCache.make_key("xgboost", "xgb-endpoint", b"1,2")
+    assert base != PredictionCache.make_key("lstm", "xgb-endpoint", "1,2")
+    assert base != PredictionCache.make_key("xgboost", "xgb-endpoint-v2", "1,2")
+    assert base != PredictionCache.make_key("xgboost", "xgb-endpoint", "1,3")
+
+def test_lru_eviction():
+    cache = PredictionCache(max_size=2, ttl_seconds=60)
+    cache.set("xgboost:e:a", [1.0])
+    cache.set("xgboost:e:b", [2.0])
+    cache.get("xgboost:e:a")          # 'a' is now most recently used
+    cache.set("xgboost:e:c", [3.0])   # evicts 'b'
+
+    assert cache.get("xgboost:e:b") is None
+    assert cache.get("xgboost:e:a") == [1.0]
+    assert cache.stats()["evictions"] == 1
+
+def test_ttl_expiry():
+    cache = PredictionCache(max_size=10, ttl_seconds=0.05)
+    cache.set("xgboost:e:a", [1.0])
+    time.sleep(0.1)
+
+    assert cache.get("xgboost:e:a") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_endpoint_change_invalidates_model():
+    cache = PredictionCache(max_size=10, ttl_seconds=60)
+    cache.sync_endpoints({"xgboost": "xgb-v1", "lstm": "lstm-v1"})
+    cache.set("xgboost:xgb-v1:a", [1.0])
+    cache.set("lstm:lstm-v1:a", [2.0])
+
+    cache.sync_endpoints({"xgboost": "xgb-v2", "lstm": "lstm-v1"})
+
+    assert cache.get("xgboost:xgb-v1:a") is None
+    assert cache.get("lstm:lstm-v1:a") == [2.0]
+
+def test_shared_backend_between_workers(tmp_path):
+    path = str(tmp_path / "predictions.sqlite")
+    worker_a = PredictionCache(max_size=10, ttl_seconds=60, shared_path=path)
+    worker_b = PredictionCache(max_size=10, ttl_seconds=60, shared_path=path)
+
+    worker_a.set("xgboost:e:a", [1.5, 2.5])
+
+    assert worker_b.get("xgboost:e:a") == [1.5, 2.5]
+    assert worker_b.stats()["hits"] == 1
+
+def test_disabled_cache():
+    cache = PredictionCache(max_size=0)
+    cache.set("xgboost:e:a", [1.0])
+    assert cache.get("xgboost:e:a") is None
@@ -0,0 +1,48 @@
+import os
+import pandas as pd
+from src.features.calendar_features import add_date_features, get_calendar_table
+
+def test_matches_dt_accessors():
+    dates = pd.Series(pd.to_datetime(["2017-08-15", "2013-01-01", "2016-02-29", "2017-08-15", "2014-12-31"]))
+    df = add_date_features(pd.DataFrame({"date": dates.astype(str), "sales": 1.0}), flags=True)
+
+    assert df["year"].tolist() == dates.dt.year.tolist() and df["year"].dtype == "int16"
+    assert df["month"].tolist() == dates.dt.month.tolist() and df["month"].dtype == "int8"
+    assert df["day_of_week"].tolist() == dates.dt.dayofweek.tolist()
+    assert df["is_payday"].tolist() == [1, 0, 1, 1, 1]
+    assert df["is_month_start"].tolist() == [0, 1, 0, 0, 0]
+    assert df["is_weekend"].tolist() == [0, 0, 0, 0, 0]
+
+def test_holidays_and_cache(tmp_path):
+    holidays = tmp_path / "holidays_events.csv"
+    holidays.write_text(
+        "date,type,locale,locale_name,description,transferred\n"
+        "2017-01-01,Holiday,National,Ecuador,Primer dia del ano,False\n"
+        "2017-01-02,Transfer,National,Ecuador,Traslado Primer dia del ano,False\n"
+        "2017-01-04,Holiday,Local,Quito,Fundacion,False\n"
+        "2017-01-06,Holiday,National,Ecuador,Dia,True\n"
+    )
+    cache = str(tmp_path / "calendar.parquet")
+
+    table = get_calendar_table("2017-01-01", "2017-01-10", cache_path=cache, holidays_path=str(holidays))
+    assert table.loc[table["is_holiday"] == 1, "date"].dt.day.tolist() == [1, 2]
+
+    # Covered range with an unchanged holidays file is served from the cache
+    written = os.path.getmtime(cache)
+    cached = get_calendar_table("2017-01-02", "2017-01-05", cache_path=cache, holidays_path=str(holidays))
+    assert cached["is_holiday"].sum() == 2 and os.path.getmtime(cache) == written
+
+    # Editing the holidays file invalidates the cached flags
+    holidays.write_text(holidays.read_text() + "2017-01-05,Holiday,National,Ecuador,Nuevo,False\n")
+    edited = get_calendar_table("2017-01-02", "2017-01-05", cache_path=cache, holidays_path=str(holidays))
+    assert edited.loc[edited["is_holiday"] == 1, "date"].dt.day.tolist() == [1, 2, 5]
+
+    # A wider range rebuilds over the union
+    wider = get_calendar_table("2016-12-25", "2017-01-05", cache_path=cache, holidays_path=str(holidays))
+    assert wider["date"].iloc[0] == pd.Timestamp("2016-12-25") and wider["date"].iloc[-1] == pd.Timestamp("2017-01-10")
+
+def test_modifies_frame_in_place():
+    df = pd.DataFrame({"date": pd.date_range("2017-01-01", periods=3)})
+    assert add_date_features(df) is df
+    # Flags are opt-in
+    assert list(df.columns) == ["date", "year", "month", "day_of_week"]
@@ -0,0 +1,100 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from src.data_processing.storage import save_splits, save_category_vocab, CATEGORY_VOCAB_FILE
+from src.data_processing.transform import get_xgboost_preprocessor, category_vocabulary, xgboost_matrix
+from src.inference.preprocess import Preprocessor
+from src.training.xgboost_train_eval_script import (
+    read_split, read_category_vocab, as_categorical, require_xgboost, tree_params
+)
+
+LAG_COLS = ["lag_1", "lag_7", "lag_14", "roll_7_mean", "roll_14_mean"]
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    n_rows = 800
+    df = pd.DataFrame({
+        "family": rng.choice(["BEVERAGES", "DAIRY", "FROZEN FOODS", "PRODUCE"], n_rows),
+        "store_nbr": rng.integers(1, 6, n_rows),
+        "month": rng.integers(1, 13, n_rows),
+        "day_of_week": rng.integers(0, 7, n_rows),
+        "year": rng.integers(2013, 2018, n_rows),
+        "onpromotion": rng.integers(0, 3, n_rows),
+    })
+    for col in LAG_COLS:
+        df[col] = rng.uniform(0, 50, n_rows)
+    df["sales"] = df["lag_7"] * 0.5 + (df["family"] == "DAIRY") * 20 + (df["store_nbr"] == 3) * 10
+    return df
+
+def test_categorical_mode_emits_one_code_per_column(features):
+    preprocessor = get_xgboost_preprocessor(feature_mode="categorical")
+    matrix = preprocessor.fit_transform(features)
+    one_hot = get_xgboost_preprocessor(sparse_output=False, feature_mode="one_hot").fit_transform(features)
+
+    assert matrix.shape[1] == len(LAG_COLS) + 6
+    assert one_hot.shape[1] == matrix.shape[1] - 1 + features["family"].nunique()
+
+    vocab = category_vocabulary(preprocessor)
+    assert vocab == {
+        "cat_trans__family": ["BEVERAGES", "DAIRY", "FROZEN FOODS", "PRODUCE"],
+        "cat_trans__store_nbr": [1, 2, 3, 4, 5],
+    }
+    decoded = np.asarray(vocab["cat_trans__family"])[matrix[:, 0].astype(int)]
+    assert (decoded == features["family"].to_numpy()).all()
+
+    unseen = features.head(2).assign(family="BOOKS", store_nbr=99)
+    assert np.isnan(preprocessor.transform(unseen)[:, :2]).all()
+
+def test_unknown_feature_mode_is_rejected():
+    with pytest.raises(Exception, match="feature mode"):
+        get_xgboost_preprocessor(feature_mode="target")
+
+def test_categorical_model_trains_and_serves_identically(features, tmp_path):
+    preprocessor = get_xgboost_preprocessor(feature_mode="categorical")
+    X = xgboost_matrix(preprocessor.fit_transform(features), preprocessor)
+    names = preprocessor.get_feature_names_out()
+    save_splits(str(tmp_path), names, X, features["sales"], X, features["sales"])
+    save_category_vocab(str(tmp_path), category_vocabulary(preprocessor))
+
+    # As the training script reads them
+    vocab = read_category_vocab(str(tmp_path))
+    X_train = as_categorical(read_split(str(tmp_path), "train"), vocab)
+    assert isinstance(X_train["cat_trans__family"].dtype, pd.CategoricalDtype)
+    assert (X_train["cat_trans__store_nbr"].cat.codes.to_numpy() == X[:, 1]).all()
+
+    model = xgb.XGBRegressor(n_estimators=20, max_depth=4, tree_method="hist", enable_categorical=True)
+    model.fit(X_train, features["sales"])
+    booster = model.get_booster()
+    assert booster.feature_types[:2] == ["c", "c"]
+
+    # The Preprocessor applies the same vocabulary to raw feature dicts
+    serving = Preprocessor()
+    serving.xgb_scaler = preprocessor
+    rows = serving.build_xgboost_rows(features.to_dict("records"))
+    np.testing.assert_allclose(rows, X, rtol=1e-6)
+    np.testing.assert_allclose(booster.inplace_predict(rows), model.predict(X_train), rtol=1e-6)
+
+    unknown = serving.build_xgboost_rows([{**features.iloc[0].to_dict(), "family": "BOOKS"}])
+    assert np.isnan(unknown[0, 0]) and unknown[0, 1] == X[0, 1]
+
+def test_one_hot_splits_remove_stale_vocabulary(tmp_path):
+    save_category_vocab(str(tmp_path), {"cat_trans__family": ["A", "B"]})
+    assert read_category_vocab(str(tmp_path)) == {"cat_trans__family": ["A", "B"]}
+
+    save_category_vocab(str(tmp_path), {})
+    assert not os.path.exists(tmp_path / CATEGORY_VOCAB_FILE)
+    assert read_category_vocab(str(tmp_path)) == {}
+
+def test_categorical_mode_names_the_xgboost_it_needs(monkeypatch):
+    require_xgboost("categorical")  # the installed version is recent enough
+    monkeypatch.setattr(xgb, "__version__", "1.5.1")
+    with pytest.raises(RuntimeError, match=r"needs XGBoost >= 1\.6, found 1\.5\.1"):
+        require_xgboost("categorical")
+
+def test_one_hot_training_keeps_the_default_tree_method():
+    assert tree_params("memory", 256, {}) == {}
+    assert tree_params("memory", 128, {"family": ["A"]}) == {"tree_method": "hist", "max_bin": 128, "enable_categorical": True}
+    assert tree_params("quantile", 128, {}) == {"tree_method": "hist", "max_bin": 128}
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from scipy import sparse
+from src.data_processing.storage import save_frame, save_splits
+from src.training.xgboost_train_eval_script import (
+    read_split, split_path, iter_split_chunks, SplitIter, streamed_dmatrix, as_categorical
+)
+
+@pytest.fixture
+def split_dir(tmp_path):
+    rng = np.random.default_rng(0)
+    n_rows = 1000
+    X = pd.DataFrame({
+        "family": rng.integers(0, 4, n_rows).astype(np.float32),
+        "onpromotion": rng.integers(0, 3, n_rows).astype(np.float32),
+        "lag_7": rng.uniform(0, 50, n_rows).astype(np.float32),
+    })
+    y = X["lag_7"] * 0.5 + (X["family"] == 2) * 20 + X["onpromotion"] * 3
+    save_splits(str(tmp_path), list(X.columns), X.to_numpy(), y, X.to_numpy(), y, fmt="parquet")
+    return tmp_path
+
+# Feather chunks follow the file's record batches (64K rows when written by pandas)
+@pytest.mark.parametrize("fmt, sizes", [
+    ("parquet", [300, 300, 300, 100]), ("csv", [300, 300, 300, 100]), ("feather", [1000])
+])
+def test_chunks_cover_the_split_in_order(tmp_path, fmt, sizes):
+    frame = pd.DataFrame({"a": np.arange(1000, dtype=np.float32), "b": np.ones(1000, dtype=np.float32)})
+    path = save_frame(frame, str(tmp_path), "train", fmt)
+
+    chunks = list(iter_split_chunks(path, 300))
+    assert [len(chunk) for chunk in chunks] == sizes
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), frame, check_dtype=False)
+
+def test_sparse_split_chunks_are_row_slices(tmp_path):
+    matrix = sparse.random(500, 6, density=0.3, format="csr", dtype=np.float32, random_state=0)
+    sparse.save_npz(tmp_path / "train.npz", matrix)
+
+    chunks = list(iter_split_chunks(str(tmp_path / "train.npz"), 200))
+    assert [chunk.shape[0] for chunk in chunks] == [200, 200, 100]
+    assert (sparse.vstack(chunks) != matrix).nnz == 0
+
+@pytest.mark.parametrize("data_mode", ["quantile", "external"])
+def test_streamed_training_matches_in_memory(split_dir, tmp_path, data_mode):
+    params = {"n_estimators": 20, "max_depth": 4, "learning_rate": 0.3, "tree_method": "hist"}
+    X = read_split(str(split_dir), "train")
+    y = read_split(str(split_dir), "train_target").to_numpy().ravel()
+    model = xgb.XGBRegressor(**params).fit(X, y)
+
+    iterator = SplitIter(
+        split_path(str(split_dir), "train"), split_path(str(split_dir), "train_target"), 300,
+        cache_prefix=str(tmp_path / "cache") if data_mode == "external" else None
+    )
+    dtrain = streamed_dmatrix(iterator, data_mode, 256, enable_categorical=False)
+    assert (dtrain.num_row(), dtrain.num_col()) == X.shape
+
+    booster = xgb.train(model.get_xgb_params(), dtrain, num_boost_round=params["n_estimators"])
+    np.testing.assert_allclose(booster.inplace_predict(X), model.predict(X), rtol=1e-4, atol=1e-3)
+
+def test_streamed_chunks_apply_the_category_vocabulary(split_dir):
+    vocab = {"family": ["BEVERAGES", "DAIRY", "EGGS", "PRODUCE"]}
+    iterator = SplitIter(split_path(str(split_dir), "train"), split_path(str(split_dir), "train_target"), 300, vocab)
+    dtrain = streamed_dmatrix(iterator, "quantile", 256, enable_categorical=True)
+    assert dtrain.feature_types == ["c", "float", "float"]
+
+    booster = xgb.train({"tree_method": "hist", "max_depth": 3}, dtrain, num_boost_round=5)
+    X = as_categorical(read_split(str(split_dir), "test"), vocab)
+    assert booster.inplace_predict(X).shape == (len(X),)
+
+@pytest.mark.parametrize("data_mode, version, required", [("quantile", "1.5.1", "1.7"), ("external", "1.7.6", "3.0")])
+def test_streamed_modes_name_the_xgboost_they_need(split_dir, monkeypatch, data_mode, version, required):
+    iterator = SplitIter(split_path(str(split_dir), "train"), split_path(str(split_dir), "train_target"), 300)
+    monkeypatch.setattr(xgb, "__version__", version)
+    with pytest.raises(RuntimeError, match=f"'{data_mode}' needs XGBoost >= {required}, found {version}"):
+        streamed_dmatrix(iterator, data_mode, 256, enable_categorical=False)
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from src.data_processing.transform import get_xgboost_preprocessor
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features, FeatureSpec
+from src.features.incremental_features import IncrementalFeatureBuilder, future_features
+from src.inference.feature_store import OnlineFeatureStore
+from src.inference.preprocess import Preprocessor
+
+SPEC = FeatureSpec.from_dict({"lags": [1, 7], "rolling": {"7": ["mean", "std"]}, "ewm_spans": [7], "horizon": 4})
+
+@pytest.fixture
+def sales_df():
+    rng = np.random.default_rng(11)
+    days = pd.date_range("2017-06-01", periods=60)
+    df = pd.DataFrame({
+        "date": np.tile(days, 3),
+        "store_nbr": np.repeat(np.array([1, 1, 2], dtype="int32"), len(days)),
+        "family": np.repeat(["BEVERAGES", "DAIRY", "BEVERAGES"], len(days)),
+        "sales": rng.gamma(2.0, 30.0, 3 * len(days)).astype("float32"),
+        "onpromotion": rng.integers(0, 3, 3 * len(days)).astype("int32"),
+    })
+    df["family"] = df["family"].astype("category")
+    return add_date_features(df)
+
+def test_future_features_match_full_computation(tmp_path, sales_df):
+    cutoff = pd.Timestamp("2017-07-26")
+    history = sales_df[sales_df["date"] <= cutoff]
+    names = SPEC.feature_names()
+
+    expected = add_lag_features(sales_df, spec=SPEC)
+    expected = expected[expected["date"] > cutoff].reset_index(drop=True)
+
+    result = future_features(history, SPEC)
+    assert len(result) == 3 * SPEC.horizon
+    pd.testing.assert_frame_equal(result[names], expected[names], check_exact=True)
+
+    # Same rows from the incremental state (tails + EWMA), without the full history;
+    # rolling mean/std only differ by running-sum rounding
+    builder = IncrementalFeatureBuilder(str(tmp_path), SPEC)
+    builder.update(history)
+    np.testing.assert_allclose(builder.future_features()[names], expected[names], rtol=1e-9)
+
+def test_lookup_builds_preprocessor_rows(tmp_path, sales_df):
+    features = add_lag_features(sales_df, lags=[1, 7, 14], windows=[7, 14], horizon=2)
+    column_transformer = get_xgboost_preprocessor(lags=[1, 7, 14], windows=[7, 14], sparse_output=True)
+    column_transformer.fit(features)
+
+    store = OnlineFeatureStore(str(tmp_path / "online.sqlite"))
+    store.write(future_features(sales_df, FeatureSpec([1, 7, 14], [7, 14], ewm_spans=[], horizon=2)))
+    with pytest.raises(KeyError):
+        store.lookup(2, "BEVERAGES", "2017-07-31")
+    assert store.reload()
+
+    preprocessor = Preprocessor(artifacts_dir=str(tmp_path))
+    preprocessor.xgb_scaler = column_transformer
+
+    row = store.lookup(2, " beverages ", "2017-07-31")
+    row["onpromotion"] = 1
+    built = preprocessor.build_xgboost_rows([row])
+
+    # Sparse one-hot (SPARSE_FEATURES=true): inactive categories are missing, as in the XGBoost CSR training matrix
+    expected = preprocessor.dense_xgboost_rows(column_transformer.transform(pd.DataFrame([row])))
+    np.testing.assert_allclose(built, expected, rtol=1e-12)
+    assert np.isnan(built).sum() == len(preprocessor.xgboost_layout["one_hot_columns"]) - 1
+    assert row["day_of_week"] == 0 and row["month"] == 7
+
+    # Dense one-hot (the default): inactive categories are 0
+    dense_transformer = get_xgboost_preprocessor(lags=[1, 7, 14], windows=[7, 14]).fit(features)
+    preprocessor.xgb_scaler = dense_transformer
+    np.testing.assert_allclose(
+        preprocessor.build_xgboost_rows([row]), dense_transformer.transform(pd.DataFrame([row])), rtol=1e-12
+    )
+
+    with pytest.raises(KeyError):
+        store.lookup(9, "BEVERAGES", "2017-07-31")
+
+def test_predict_by_series_id(monkeypatch, tmp_path, sales_df):
+    import app
+    from api.routes import forecast
+
+    features = add_lag_features(sales_df)
+    column_transformer = get_xgboost_preprocessor().fit(features)
+    store = OnlineFeatureStore(str(tmp_path / "online.sqlite"))
+    store.write(future_features(sales_df, FeatureSpec()))
+    payloads = []
+
+    async def predict_async(endpoint_name, payload, content_type, accept=None):
+        payloads.append(payload)
+        return "\n".join("42.0" for _ in payload.splitlines()).encode("utf-8")
+
+    with TestClient(app.app) as client:
+        monkeypatch.setattr(forecast.predictor, "predict_async", predict_async)
+        monkeypatch.setattr(forecast.preprocessor, "xgb_scaler", column_transformer)
+        monkeypatch.setattr(forecast, "feature_store", store)
+        # The metrics endpoint only reports; the first series ID request loads the store
+        assert client.get("/api/v1/metrics/feature-store").json()["loaded"] is False
+
+        items = [{"store_nbr": 1, "family": "DAIRY", "date": "2017-08-01"},
+                 {"store_nbr": 2, "family": "BEVERAGES", "date": "2017-08-02", "onpromotion": 2}]
+        response = client.post("/api/v1/predict", json={"model_type": "xgboost", "items": items})
+        missing = client.post("/api/v1/predict", json={"model_type": "xgboost", "items": [dict(items[0], date="2018-01-01")]})
+        lstm = client.post("/api/v1/predict", json={"model_type": "lstm", "items": items})
+        bad_date = client.post("/api/v1/predict", json={"model_type": "xgboost", "items": [dict(items[0], date="08/01/2017")]})
+
+    assert response.status_code == 200
+    assert response.json()["forecast"] == [42.0, 42.0]
+    assert all(len(line.split(b",")) == len(column_transformer.get_feature_names_out()) for line in payloads[0].splitlines())
+    assert missing.status_code == 404
+    assert lstm.status_code == 400
+    assert bad_date.status_code == 422
+
+def test_predict_picks_up_a_republished_store(monkeypatch, tmp_path, sales_df):
+    import os
+    import app
+    from api.routes import forecast
+
+    cutoff = pd.Timestamp("2017-07-10")
+    column_transformer = get_xgboost_preprocessor().fit(add_lag_features(sales_df))
+    store = OnlineFeatureStore(str(tmp_path / "online.sqlite"))
+    store.write(future_features(sales_df[sales_df["date"] <= cutoff], FeatureSpec()))
+
+    async def predict_async(endpoint_name, payload, content_type, accept=None):
+        return "\n".join("42.0" for _ in payload.splitlines()).encode("utf-8")
+
+    new_day = [{"store_nbr": 1, "family": "DAIRY", "date": "2017-08-01"}]
+    with TestClient(app.app) as client:
+        monkeypatch.setattr(forecast.predictor, "predict_async", predict_async)
+        monkeypatch.setattr(forecast.preprocessor, "xgb_scaler", column_transformer)
+        monkeypatch.setattr(forecast, "feature_store", store)
+
+        assert client.post("/api/v1/predict", json={"model_type": "xgboost", "items": new_day}).status_code == 404
+
+        # The pipeline republishes the store; the next request after the refresh interval sees it
+        store.write(future_features(sales_df, FeatureSpec()))
+        os.utime(store.path, (0, os.path.getmtime(store.path) + 1))
+        store.refresh_seconds = 0
+        response = client.post("/api/v1/predict", json={"model_type": "xgboost", "items": new_day})
+
+    assert response.status_code == 200
+    assert store.stats()["dates"][0] == "2017-07-31"
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from src.data_processing.clean import clean_data
+from src.data_processing.frame_order import is_sorted_by, sort_frame
+from src.data_processing.save_split_data import split_data_time_series
+from src.utils.profiling import StageProfiler
+
+def messy_frame(seed=0, n_days=30):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "date": np.tile(pd.date_range("2017-01-01", periods=n_days).strftime("%Y-%m-%d"), 4),
+        "store_nbr": np.repeat([2, 1, 2, 1], n_days),
+        "family": np.repeat([" dairy", "BEVERAGES ", "beverages", "DAIRY"], n_days),
+        "sales": rng.normal(20, 15, 4 * n_days),
+        "onpromotion": rng.integers(0, 3, 4 * n_days).astype(float),
+    })
+    df.loc[[3, 40], "sales"] = np.nan
+    df.loc[7, "onpromotion"] = np.nan
+    df = pd.concat([df, df.iloc[:5]]).sample(frac=1.0, random_state=seed).reset_index(drop=True)
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+def legacy_clean(df):
+    df = df.copy()
+    df["family"] = df["family"].str.strip().str.upper()
+    df = df.drop_duplicates()
+    df["sales"] = df["sales"].fillna(0.0)
+    df["onpromotion"] = df["onpromotion"].fillna(0)
+    df["sales"] = df["sales"].clip(lower=0.0)
+    df = df.astype({"store_nbr": "int32", "onpromotion": "int32", "sales": "float32", "family": "category"})
+    return df.sort_values(by=["store_nbr", "family", "date"])
+
+def test_is_sorted_by_and_sort_frame():
+    df = pd.DataFrame({"a": [1, 1, 2, 2], "b": [3, 4, 1, 1], "c": pd.Categorical(["y", "x", "y", "x"], categories=["y", "x"])})
+    assert is_sorted_by(df, ["a", "b"]) and is_sorted_by(df, ["a", "b", "c"])
+    assert not is_sorted_by(df, ["b"]) and not is_sorted_by(df, ["c"])
+    assert sort_frame(df, ["a", "b"]) is df
+
+    shuffled = df.sample(frac=1.0, random_state=1)
+    pd.testing.assert_frame_equal(sort_frame(shuffled, ["a", "b", "c"]), shuffled.sort_values(["a", "b", "c"]))
+
+def test_clean_matches_legacy_and_is_idempotent():
+    df = messy_frame()
+    cleaned = clean_data(df.copy())
+    pd.testing.assert_frame_equal(cleaned, legacy_clean(df))
+    assert is_sorted_by(cleaned, ["store_nbr", "family", "date"])
+
+    # A second pass finds nothing to fix or sort and hands back the same data
+    again = clean_data(cleaned)
+    pd.testing.assert_frame_equal(again, cleaned)
+
+def test_split_stable_date_order_matches_full_sort():
+    cleaned = clean_data(messy_frame(seed=2))
+    train, test = split_data_time_series(cleaned, test_days=5)
+    expected = cleaned.sort_values(by=["date", "store_nbr", "family"])
+    cutoff = expected["date"].max() - pd.Timedelta(days=5)
+    pd.testing.assert_frame_equal(train, expected[expected["date"] <= cutoff])
+    pd.testing.assert_frame_equal(test, expected[expected["date"] > cutoff])
+
+def test_stage_profiler_records_each_stage():
+    profiler = StageProfiler()
+    with profiler.stage("allocate"):
+        block = np.ones(2_000_000)
+    with profiler.stage("idle"):
+        pass
+    del block
+
+    stages = profiler.report()
+    assert [stage["stage"] for stage in stages] == ["allocate", "idle"]
+    assert all(stage["seconds"] >= 0 for stage in stages)
+    if stages[0]["peak_is_per_stage"]:
+        assert stages[0]["peak_rss_mb"] >= stages[1]["peak_rss_mb"]
@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.features.calendar_features import add_date_features
+from src.features.lag_features import add_lag_features, FeatureSpec
+from src.features.incremental_features import IncrementalFeatureBuilder
+from src.utils.exception import CustomException
+
+SPEC = {"lags": [1, 7], "rolling": {"7": ["mean", "std"], "14": ["min"]}, "ewm_spans": [7], "horizon": 3}
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(3)
+    days = pd.date_range("2017-01-01", periods=90)
+    df = pd.DataFrame({
+        "date": np.tile(days, 4),
+        "store_nbr": np.repeat(np.array([1, 1, 2, 2], dtype="int32"), len(days)),
+        "family": np.repeat(["BEVERAGES", "DAIRY", "BEVERAGES", "DAIRY"], len(days)),
+        "sales": rng.gamma(2.0, 30.0, 4 * len(days)).astype("float32"),
+        "onpromotion": rng.integers(0, 3, 4 * len(days)).astype("int32"),
+    })
+    df["family"] = df["family"].astype("category")
+    return df
+
+def test_incremental_matches_full_recompute(tmp_path, history):
+    spec = FeatureSpec.from_dict(SPEC)
+    expected = add_lag_features(history, spec=spec).reset_index(drop=True)
+
+    builder = IncrementalFeatureBuilder(str(tmp_path), spec)
+    cutoffs = [pd.Timestamp("2017-03-01"), pd.Timestamp("2017-03-02"), pd.Timestamp("2017-03-20")]
+    batches = [history[history["date"] < cutoffs[0]]]
+    batches += [history[(history["date"] >= lo) & (history["date"] < hi)] for lo, hi in zip(cutoffs, cutoffs[1:])]
+    batches.append(history[history["date"] >= cutoffs[-1]])
+
+    for batch in batches:
+        builder.append_features(builder.update(batch))
+
+    result = builder.load_features().sort_values(["store_nbr", "family", "date"]).reset_index(drop=True)
+    assert len(result) == len(expected)
+
+    # Lags, min and EWMA are exact; rolling mean/std only differ by running-sum rounding
+    exact = ["lag_1", "lag_7", "roll_14_min", "ewm_7", "sales", "onpromotion"]
+    pd.testing.assert_frame_equal(result[exact], expected[exact], check_exact=True)
+    np.testing.assert_allclose(result[["roll_7_mean", "roll_7_std"]], expected[["roll_7_mean", "roll_7_std"]], rtol=1e-9)
+
+    # State stays bounded: history_length rows per series
+    assert len(pd.read_parquet(builder.tails_path)) == 4 * spec.history_length()
+
+def test_reprocessed_days_are_skipped(tmp_path, history):
+    builder = IncrementalFeatureBuilder(str(tmp_path), FeatureSpec.from_dict(SPEC))
+    builder.update(history[history["date"] < "2017-03-01"])
+    assert builder.update(history[history["date"] < "2017-03-01"]).empty
+
+def test_spec_change_requires_rebuild(tmp_path, history):
+    IncrementalFeatureBuilder(str(tmp_path), FeatureSpec.from_dict(SPEC)).update(history)
+    with pytest.raises(CustomException):
+        IncrementalFeatureBuilder(str(tmp_path), FeatureSpec(lags=[2], rolling=[7], ewm_spans=[], horizon=3)).update(history)
+
+def read_xgboost_splits(root):
+    from src.data_processing.storage import find_split_file, read_frame
+    split_dir = os.path.join(root, "data", "post", "xgboost")
+    return {name: read_frame(find_split_file(split_dir, name)) for name in ("train", "test", "train_target", "test_target")}
+
+def test_incremental_splits_reuse_the_preprocessor(monkeypatch, tmp_path, history):
+    from src.data_processing.save_split_data import (
+        process_and_save_xgboost, process_and_save_xgboost_incremental, XGB_PREPROCESSOR_PATH, file_sha256
+    )
+
+    history = add_date_features(history)
+    cutoffs = [pd.Timestamp("2017-03-01"), pd.Timestamp("2017-03-10")]
+    batches = [history[history["date"] < cutoffs[0]],
+               history[(history["date"] >= cutoffs[0]) & (history["date"] < cutoffs[1])],
+               history[history["date"] >= cutoffs[1]]]
+
+    incremental_dir, full_dir = tmp_path / "incremental", tmp_path / "full"
+    for directory in (incremental_dir, full_dir):
+        os.makedirs(directory)
+    monkeypatch.chdir(incremental_dir)
+    builder = IncrementalFeatureBuilder(str(incremental_dir / "state"), FeatureSpec())
+
+    fitted_sha = None
+    for batch in batches:
+        builder.append_features(builder.update(batch))
+        process_and_save_xgboost_incremental(builder)
+        # Fitted once, on the first run; later runs only transform their own part
+        fitted_sha = fitted_sha or file_sha256(XGB_PREPROCESSOR_PATH)
+        assert file_sha256(XGB_PREPROCESSOR_PATH) == fitted_sha
+    assert len(os.listdir(incremental_dir / "state" / "processed")) == len(batches) + 1
+
+    # Same splits as a refit over every stored feature row (no NaNs after the history drop,
+    # same categories: the fitted imputers and encoders give identical matrices)
+    monkeypatch.chdir(full_dir)
+    process_and_save_xgboost(builder.load_features())
+    incremental, full = read_xgboost_splits(incremental_dir), read_xgboost_splits(full_dir)
+    for name in full:
+        pd.testing.assert_frame_equal(incremental[name], full[name], check_exact=True)
+
+def test_unseen_category_refits_the_preprocessor(monkeypatch, tmp_path, history):
+    from src.data_processing.save_split_data import (
+        process_and_save_xgboost_incremental, XGB_PREPROCESSOR_PATH, file_sha256
+    )
+
+    history = add_date_features(history)
+    monkeypatch.chdir(tmp_path)
+    builder = IncrementalFeatureBuilder(str(tmp_path / "state"), FeatureSpec())
+    builder.append_features(builder.update(history[history["date"] < "2017-03-20"]))
+    process_and_save_xgboost_incremental(builder)
+    first_sha = file_sha256(XGB_PREPROCESSOR_PATH)
+
+    # A new series with a family the fitted one-hot encoder has not seen
+    new_rows = history[history["date"] >= "2017-03-20"]
+    new_series = history[history["store_nbr"] == 1].assign(store_nbr=np.int32(3), family="PRODUCE")
+    new_rows = pd.concat([new_rows.astype({"family": str}), new_series], ignore_index=True).astype({"family": "category"})
+    builder.append_features(builder.update(new_rows))
+    process_and_save_xgboost_incremental(builder)
+    assert file_sha256(XGB_PREPROCESSOR_PATH) != first_sha
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.features.lag_features import add_lag_features, lag_feature_names, FeatureSpec
+
+def reference_lag_features(df, lags=(1, 7, 14), windows=(7, 14), horizon=16):
+    """The original per-group implementation."""
+    df = df.sort_values(['store_nbr', 'family', 'date']).copy()
+    grouped = df.groupby(['store_nbr', 'family'])['sales']
+    for lag in lags:
+        df[f'lag_{lag}'] = grouped.shift(horizon + lag)
+    for window in windows:
+        df[f'roll_{window}_mean'] = grouped.transform(lambda x: x.shift(horizon).rolling(window).mean())
+    return df.dropna()
+
+@pytest.fixture
+def sales_df():
+    rng = np.random.default_rng(7)
+    frames = []
+    # Series of different lengths, including ones shorter than the horizon
+    for store, family, days in [(1, "A", 60), (1, "B", 45), (2, "A", 10), (2, "B", 80), (3, "C", 31)]:
+        frames.append(pd.DataFrame({
+            "date": pd.date_range("2017-01-01", periods=days),
+            "store_nbr": np.int32(store),
+            "family": family,
+            "sales": rng.gamma(2.0, 30.0, days).astype("float32"),
+            "onpromotion": rng.integers(0, 3, days),
+        }))
+    df = pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=0)
+    df["family"] = df["family"].astype("category")
+    return df
+
+def test_matches_per_group_implementation(sales_df):
+    pd.testing.assert_frame_equal(add_lag_features(sales_df), reference_lag_features(sales_df), check_exact=True)
+
+def test_custom_config(sales_df):
+    result = add_lag_features(sales_df, lags=[1, 2], windows=[3, 28], horizon=1)
+    expected = reference_lag_features(sales_df, lags=(1, 2), windows=(3, 28), horizon=1)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+    assert lag_feature_names([1, 2], [3, 28]) == ["lag_1", "lag_2", "roll_3_mean", "roll_28_mean"]
+
+def test_config_from_env(monkeypatch, sales_df):
+    monkeypatch.setenv("FEATURE_LAGS", "3")
+    monkeypatch.setenv("FEATURE_WINDOWS", "5")
+    monkeypatch.setenv("FORECAST_HORIZON", "2")
+    result = add_lag_features(sales_df)
+    assert {"lag_3", "roll_5_mean"} <= set(result.columns) and "lag_1" not in result.columns
+    pd.testing.assert_frame_equal(result, reference_lag_features(sales_df, (3,), (5,), 2), check_exact=True)
+
+def test_feature_spec_statistics(sales_df):
+    spec = FeatureSpec.from_dict({"lags": [28], "rolling": {"7": ["mean", "std"], "14": ["min", "max"]},
+                                  "ewm_spans": [7], "horizon": 1})
+    result = add_lag_features(sales_df, spec=spec)
+
+    expected = sales_df.sort_values(['store_nbr', 'family', 'date']).copy()
+    grouped = expected.groupby(['store_nbr', 'family'])['sales']
+    expected['lag_28'] = grouped.shift(29)
+    expected['roll_7_mean'] = grouped.transform(lambda x: x.shift(1).rolling(7).mean())
+    expected['roll_7_std'] = grouped.transform(lambda x: x.shift(1).rolling(7).std())
+    expected['roll_14_min'] = grouped.transform(lambda x: x.shift(1).rolling(14).min())
+    expected['roll_14_max'] = grouped.transform(lambda x: x.shift(1).rolling(14).max())
+    expected['ewm_7'] = grouped.transform(lambda x: x.shift(1).ewm(span=7, adjust=False).mean())
+
+    assert spec.feature_names() == ["lag_28", "roll_7_mean", "roll_7_std", "roll_14_min", "roll_14_max", "ewm_7"]
+    pd.testing.assert_frame_equal(result, expected.dropna(), check_exact=True)
+
+def test_feature_spec_rejects_unknown_stat():
+    with pytest.raises(ValueError):
+        FeatureSpec(rolling={7: ["median"]})
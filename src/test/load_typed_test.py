@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+from src.data_processing.load import load_data, iter_data_chunks
+from src.data_processing.clean import clean_data
+
+RAW_CSV = """id,date,store_nbr,family,sales,onpromotion
+0,2023-01-01,1,FOOD,10.0,0
+1,2023-01-01,1, food ,5.5,
+2,2023-01-02,2,BEVERAGES,,3
+3,2023-01-02,2,FOOD,7.25,1
+4,2023-01-03,1,BEVERAGES,1.0,0
+"""
+
+@pytest.fixture
+def raw_path(tmp_path):
+    path = tmp_path / "sales_data.csv"
+    path.write_text(RAW_CSV)
+    return str(path)
+
+def test_typed_load_dtypes(raw_path):
+    df = load_data(raw_path, typed=True)
+
+    assert list(df.columns) == ["date", "store_nbr", "family", "sales", "onpromotion"]
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert df["store_nbr"].dtype == "int32"
+    assert isinstance(df["family"].dtype, pd.CategoricalDtype)
+    assert df["sales"].dtype == "float32"
+
+def test_chunked_load_matches_single_read(raw_path):
+    whole = load_data(raw_path, typed=True)
+    chunked = load_data(raw_path, typed=True, chunksize=2)
+
+    assert len(list(iter_data_chunks(raw_path, chunksize=2))) == 3
+    assert isinstance(chunked["family"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(
+        whole.astype({"family": str}), chunked.astype({"family": str})
+    )
+
+def test_pyarrow_engine(raw_path):
+    pytest.importorskip("pyarrow")
+    df = load_data(raw_path, typed=True, engine="pyarrow")
+    assert len(df) == 5
+    assert df["sales"].dtype == "float32"
+
+def test_typed_load_cleans_like_untyped(raw_path):
+    typed = clean_data(load_data(raw_path, typed=True))
+    untyped = clean_data(load_data(raw_path))
+
+    assert sorted(typed["family"].unique()) == ["BEVERAGES", "FOOD"]
+    assert typed["sales"].tolist() == untyped["sales"].tolist()
+    assert typed["onpromotion"].tolist() == untyped["onpromotion"].tolist()
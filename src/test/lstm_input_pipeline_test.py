@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+tf = pytest.importorskip("tensorflow")
+
+from src.training.lstm_train_eval_script import (
+    SplitReader, split_dataset, positions_from_lengths, windows_with_context
+)
+
+N_ROWS = 1000
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.random((N_ROWS, 4), dtype=np.float32), columns=["a", "b", "c", "d"])
+
+@pytest.fixture
+def target():
+    return pd.DataFrame({"sales": np.arange(N_ROWS, dtype=np.float32)})
+
+def write(frame, path):
+    if path.suffix == ".parquet":
+        frame.to_parquet(path, index=False, row_group_size=300)
+    elif path.suffix == ".feather":
+        frame.to_feather(path, chunksize=300)
+    else:
+        sparse.save_npz(path, sparse.csr_matrix(frame.to_numpy()))
+    return str(path)
+
+@pytest.mark.parametrize("ext", [".parquet", ".feather", ".npz"])
+def test_reader_returns_any_row_range(tmp_path, features, ext):
+    reader = SplitReader(write(features, tmp_path / f"train{ext}"))
+    assert (reader.n_rows, reader.n_cols) == features.shape
+
+    # Within one row group / record batch, across several, and the ragged tail
+    for start, stop in ((0, 10), (250, 650), (900, 1000)):
+        rows = reader.rows(start, stop)
+        assert rows.dtype == np.float32
+        np.testing.assert_array_equal(rows, features.to_numpy()[start:stop])
+
+def test_csv_splits_cannot_be_streamed(tmp_path, features):
+    features.to_csv(tmp_path / "train.csv", index=False)
+    with pytest.raises(ValueError, match="Cannot stream"):
+        SplitReader(str(tmp_path / "train.csv"))
+
+def test_dataset_yields_every_row_once_in_order(tmp_path, features, target):
+    dataset = split_dataset(
+        SplitReader(write(features, tmp_path / "train.parquet")),
+        SplitReader(write(target, tmp_path / "train_target.parquet")),
+        batch_size=64, chunk_rows=300
+    )
+    X = np.concatenate([x.numpy() for x, _ in dataset])
+    y = np.concatenate([y.numpy() for _, y in dataset])
+
+    assert X.shape == (N_ROWS, 1, 4) and y.shape == (N_ROWS, 1)
+    np.testing.assert_array_equal(X[:, 0, :], features.to_numpy())
+    np.testing.assert_array_equal(y.ravel(), target["sales"].to_numpy())
+
+def test_shuffled_dataset_keeps_rows_and_targets_together(tmp_path, features, target):
+    dataset = split_dataset(
+        SplitReader(write(features, tmp_path / "train.npz")),
+        SplitReader(write(target, tmp_path / "train_target.parquet")),
+        batch_size=64, chunk_rows=300, shuffle_buffer=256, cache_path=str(tmp_path / "cache")
+    )
+    for _ in range(2):  # second epoch reads from the cache
+        order = np.concatenate([y.numpy() for _, y in dataset]).ravel().astype(int)
+        assert sorted(order) == list(range(N_ROWS))
+        assert not (order == np.arange(N_ROWS)).all()
+
+    # Each row still carries its own target
+    X, y = next(iter(dataset))
+    np.testing.assert_array_equal(X.numpy()[:, 0, :], features.to_numpy()[y.numpy().ravel().astype(int)])
+
+@pytest.mark.parametrize("ext", [".parquet", ".npz"])
+def test_reader_takes_scattered_rows(tmp_path, features, ext):
+    reader = SplitReader(write(features, tmp_path / f"train{ext}"))
+    index = np.array([0, 5, 299, 300, 301, 950, 999])
+    np.testing.assert_array_equal(reader.take(index), features.to_numpy()[index])
+
+def test_windowed_dataset_spans_chunks_but_not_series(tmp_path, features, target):
+    lengths = [400, 250, 350]  # series boundaries fall inside and across the 300-row chunks
+    positions = positions_from_lengths(lengths)
+    dataset = split_dataset(
+        SplitReader(write(features, tmp_path / "train.parquet")),
+        SplitReader(write(target, tmp_path / "train_target.parquet")),
+        batch_size=64, chunk_rows=300, window=5, positions=positions
+    )
+    X = np.concatenate([x.numpy() for x, _ in dataset])
+    y = np.concatenate([y.numpy() for _, y in dataset]).ravel().astype(int)
+
+    # One window per row with 4 days of history in its own series, in order, ending on its target row
+    ends = np.flatnonzero(positions >= 4)
+    np.testing.assert_array_equal(y, ends)
+    assert X.shape == (len(ends), 5, 4)
+    np.testing.assert_array_equal(X, np.stack([features.to_numpy()[end - 4:end + 1] for end in ends]))
+
+def test_test_windows_take_context_from_the_training_tail():
+    keys = {"store_nbr": [1, 1, 2], "family": ["A", "B", "A"]}
+    train_series = pd.DataFrame({**keys, "rows": [10, 2, 10]})
+    test_series = pd.DataFrame({"store_nbr": [1, 1], "family": ["A", "B"], "rows": [3, 3]})
+    train_X = np.arange(22, dtype=np.float32).reshape(-1, 1)
+    test_X = 100 + np.arange(6, dtype=np.float32).reshape(-1, 1)
+
+    values, targets, positions = windows_with_context(
+        test_X, test_X.ravel(), test_series, train_series, lambda index: train_X[index], window=4
+    )
+    # (1, A): last 3 training rows then its test rows; (1, B) only has 2 training rows
+    assert values.ravel().tolist() == [7, 8, 9, 100, 101, 102, 10, 11, 103, 104, 105]
+    ends = positions >= 3
+    assert targets[ends].tolist() == [100, 101, 102, 104, 105]
@@ -0,0 +1,37 @@
+import io
+import json
+import numpy as np
+from src.inference.postprocess import Postprocessor
+
+def test_lstm_json_response():
+    response = json.dumps({"predictions": [[1.5], [2.5]]}).encode("utf-8")
+    assert Postprocessor().postprocess_lstm(response) == [1.5, 2.5]
+
+def test_lstm_npy_response():
+    buffer = io.BytesIO()
+    np.save(buffer, np.array([[1.5], [2.5]], dtype=np.float32))
+    assert Postprocessor().postprocess_lstm(buffer.getvalue()) == [1.5, 2.5]
+
+def test_lstm_missing_predictions():
+    assert Postprocessor().postprocess_lstm(b'{"error": "bad input"}') == []
+
+def test_xgboost_csv_and_newline_responses():
+    postprocessor = Postprocessor()
+    assert postprocessor.postprocess_xgboost(b"1.5,2.25,3.0") == [1.5, 2.25, 3.0]
+    assert postprocessor.postprocess_xgboost(b"1.5\n2.25\n3.0\n") == [1.5, 2.25, 3.0]
+    assert postprocessor.postprocess_xgboost(b"[1.5, 2.25]\n[3.0]") == [1.5, 2.25, 3.0]
+
+def test_xgboost_matches_token_parsing():
+    values = np.random.default_rng(0).random(1000) * 1000
+    raw = "\n".join(map(repr, values.tolist())).encode("utf-8")
+    assert Postprocessor().postprocess_xgboost(raw) == values.tolist()
+
+def test_xgboost_array_is_float32_buffer():
+    predictions = Postprocessor().postprocess_xgboost_array(b"1.5,2.5")
+    assert predictions.dtype == np.float32
+    assert predictions.tolist() == [1.5, 2.5]
+
+def test_xgboost_list_and_empty_responses():
+    postprocessor = Postprocessor()
+    assert postprocessor.postprocess_xgboost([[1.0], [2.0]]) == [1.0, 2.0]
+    assert postprocessor.postprocess_xgboost(b"") == []
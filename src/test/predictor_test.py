@@ -0,0 +1,109 @@
+import asyncio
+import io
+import threading
+import time
+import pytest
+from src.inference.predictor import ModelPredictor
+from src.utils.exception import CustomException
+
+class StubRuntimeClient:
+    """
+    Stands in for the boto3 sagemaker-runtime client.
+    Sleeps to simulate endpoint latency and echoes a CSV prediction.
+    """
+    def __init__(self, latency=0.05):
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def invoke_endpoint(self, EndpointName, ContentType, Body, Accept=None):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            self.wait()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        return {"Body": io.BytesIO(b"1.5,2.5")}
+
+    def wait(self):
+        time.sleep(self.latency)
+
+class BarrierRuntimeClient(StubRuntimeClient):
+    """
+    Every call waits until `parties` calls are in flight at once (or times out).
+    """
+    def __init__(self, parties):
+        super().__init__()
+        self.barrier = threading.Barrier(parties, timeout=10)
+
+    def wait(self):
+        self.barrier.wait()
+
+def run_concurrent_clients(predictor, n_clients):
+    async def _run():
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            predictor.predict_async("stub-endpoint", "1,2,3", "text/csv")
+            for _ in range(n_clients)
+        ])
+        return time.perf_counter() - start
+    return asyncio.run(_run())
+
+def test_predict_async_returns_body():
+    predictor = ModelPredictor(client=StubRuntimeClient(latency=0), max_concurrency=2)
+    result = asyncio.run(predictor.predict_async("stub-endpoint", "1,2,3", "text/csv"))
+    assert result == b"1.5,2.5"
+
+def test_calls_run_concurrently_up_to_the_limit():
+    serial_client = StubRuntimeClient(latency=0.01)
+    run_concurrent_clients(ModelPredictor(client=serial_client, max_concurrency=1), 8)
+    assert serial_client.calls == 8 and serial_client.peak_in_flight == 1
+
+    # The barrier only opens once all 8 calls are in flight together
+    parallel_client = BarrierRuntimeClient(parties=8)
+    run_concurrent_clients(ModelPredictor(client=parallel_client, max_concurrency=8), 8)
+    assert parallel_client.calls == 8 and parallel_client.peak_in_flight == 8
+
+def test_event_loop_not_blocked():
+    predictor = ModelPredictor(client=StubRuntimeClient(latency=0.2), max_concurrency=4)
+
+    async def _run():
+        task = asyncio.ensure_future(predictor.predict_async("stub-endpoint", "1", "text/csv"))
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        heartbeat = time.perf_counter() - start
+        await task
+        return heartbeat
+
+    # The heartbeat must not wait for the 200ms endpoint call to finish
+    assert asyncio.run(_run()) < 0.1
+
+def test_invalid_concurrency_rejected():
+    with pytest.raises(CustomException):
+        ModelPredictor(client=StubRuntimeClient(), max_concurrency=0)
+
+def test_pool_stats_track_saturation():
+    predictor = ModelPredictor(client=StubRuntimeClient(latency=0.05), max_concurrency=4, max_pool_connections=2)
+    run_concurrent_clients(predictor, 4)
+
+    stats = predictor.pool_stats()["stub-endpoint"]
+    assert stats["calls"] == 4
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == 4
+    assert stats["saturated_calls"] == 2
+    assert stats["peak_utilization"] == 2.0
+
+def test_client_per_endpoint():
+    predictor = ModelPredictor(region_name="us-east-1", max_concurrency=2)
+    predictor.warm_up(["xgb-endpoint", "lstm-endpoint"])
+
+    xgb_client = predictor._get_client("xgb-endpoint")
+    assert xgb_client is not predictor._get_client("lstm-endpoint")
+    assert xgb_client is predictor._get_client("xgb-endpoint")
+    assert xgb_client.meta.config.max_pool_connections == 2
+    assert xgb_client.meta.config.retries["mode"] == "adaptive"
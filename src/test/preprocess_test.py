@@ -0,0 +1,77 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from src.inference.preprocess import Preprocessor, encode_csv
+from src.utils.exception import CustomException
+
+def make_preprocessor():
+    preprocessor = Preprocessor()
+    preprocessor.xgb_scaler = None
+    preprocessor.nn_scaler = None
+    return preprocessor
+
+def read_csv_float32(payload) -> np.ndarray:
+    return pd.read_csv(io.BytesIO(payload), header=None, dtype=np.float32).to_numpy()
+
+def test_csv_matches_pandas_values_at_float32():
+    rows = [[100.5, 20.0, 3.0, 0.0, 1e-07], [105.25, 22.0, 1.0, 1.0, 12345678.9]]
+    expected = pd.DataFrame(rows).to_csv(header=False, index=False).encode("utf-8")
+    payload = make_preprocessor().preprocess_xgboost(rows)
+    assert isinstance(payload, bytes)
+    np.testing.assert_array_equal(read_csv_float32(payload), read_csv_float32(expected))
+
+def test_csv_round_trips_float32_exactly():
+    values = np.random.default_rng(0).standard_normal((200, 9)) * 10.0 ** np.arange(-4, 5)
+    np.testing.assert_array_equal(read_csv_float32(encode_csv(values)), values.astype(np.float32))
+
+def test_nan_written_as_empty_field():
+    assert encode_csv(np.array([[1.0, np.nan, 3.0]])) == b"1,,3"
+
+def test_flat_list_is_single_column():
+    assert make_preprocessor().preprocess_xgboost([1.0, 2.0]) == b"1\n2"
+
+def test_scaler_applied_to_array():
+    class DoubleScaler:
+        def transform(self, X):
+            return X * 2
+
+    preprocessor = make_preprocessor()
+    preprocessor.xgb_scaler = DoubleScaler()
+    assert preprocessor.preprocess_xgboost([[1.0, 2.5]]) == b"2,5"
+
+def test_empty_input_rejected():
+    with pytest.raises(CustomException):
+        make_preprocessor().preprocess_xgboost([])
+
+def test_lstm_json_payload():
+    preprocessor = make_preprocessor()
+    payload = json.loads(preprocessor.preprocess_lstm([[1.0, 2.0], [3.0, 4.0]]))
+    assert payload == {"instances": [[[1.0, 2.0]], [[3.0, 4.0]]]}
+    assert preprocessor.lstm_content_type == "application/json"
+
+def test_lstm_npy_payload():
+    preprocessor = make_preprocessor()
+    preprocessor.lstm_payload_format = "npy"
+
+    payload = preprocessor.preprocess_lstm([[1.0, 2.0], [3.0, 4.0]])
+    tensor = np.load(io.BytesIO(payload))
+
+    assert preprocessor.lstm_content_type == "application/x-npy"
+    assert tensor.dtype == np.float32
+    assert tensor.shape == (2, 1, 2)
+
+def test_lstm_windows_scaled_row_by_row():
+    class ShiftScaler:
+        def transform(self, X):
+            assert X.ndim == 2
+            return np.hstack([X, X + 1])
+
+    preprocessor = make_preprocessor()
+    preprocessor.nn_scaler = ShiftScaler()
+    windows = [[[1.0], [2.0], [3.0]], [[4.0], [5.0], [6.0]]]  # 2 samples x 3 days x 1 feature
+
+    payload = json.loads(preprocessor.preprocess_lstm(windows))
+    assert np.array(payload["instances"]).shape == (2, 3, 2)
+    assert payload["instances"][1] == [[4.0, 5.0], [5.0, 6.0], [6.0, 7.0]]
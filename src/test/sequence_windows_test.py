@@ -0,0 +1,123 @@
+import ast
+import inspect
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processing.clean import clean_data
+import src.features.sequence_windows as sequence_windows
+from src.data_processing.frame_order import is_sorted_by
+from src.data_processing.save_split_data import split_data_time_series, SERIES_ORDER
+from src.features.sequence_windows import (
+    series_lengths, positions_from_lengths, window_view, window_ends, iter_window_batches
+)
+
+@pytest.fixture
+def series_frame():
+    # Three series of different lengths, stored series after series as the NN splits are
+    lengths = [6, 3, 5]
+    frames = [
+        pd.DataFrame({"store_nbr": store, "family": family, "date": pd.date_range("2017-01-01", periods=days)})
+        for (store, family), days in zip([(1, "A"), (1, "B"), (2, "A")], lengths)
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    df["sales"] = np.arange(len(df), dtype=np.float32)
+    return df
+
+def reference_windows(values, positions, window):
+    """Every full in-series window, materialised one by one."""
+    return np.stack([values[end - window + 1:end + 1] for end in range(len(values)) if positions[end] >= window - 1])
+
+def test_series_lengths_and_positions(series_frame):
+    lengths = series_lengths(series_frame)
+    assert lengths[["store_nbr", "family"]].values.tolist() == [[1, "A"], [1, "B"], [2, "A"]]
+    assert lengths["rows"].tolist() == [6, 3, 5]
+    assert positions_from_lengths(lengths["rows"]).tolist() == [0, 1, 2, 3, 4, 5, 0, 1, 2, 0, 1, 2, 3, 4]
+
+def test_window_view_is_a_view():
+    values = np.arange(20, dtype=np.float32).reshape(10, 2)
+    windows = window_view(values, 4)
+    assert windows.shape == (7, 4, 2)
+    assert np.shares_memory(windows, values)
+    np.testing.assert_array_equal(windows[3], values[3:7])
+
+@pytest.mark.parametrize("window", [1, 3, 4])
+def test_batches_cover_every_full_window_within_series(series_frame, window):
+    values = np.stack([series_frame["sales"], -series_frame["sales"]], axis=1)
+    positions = positions_from_lengths(series_lengths(series_frame)["rows"])
+
+    batches = list(iter_window_batches(values, series_frame["sales"], positions, window, batch_size=4))
+    X = np.concatenate([x for x, _ in batches])
+    y = np.concatenate([y for _, y in batches]).ravel()
+
+    assert X.dtype == np.float32 and X.shape[1:] == (window, 2)
+    assert all(len(x) <= 4 for x, _ in batches)
+    np.testing.assert_array_equal(X, reference_windows(values, positions, window))
+    # The target is the last day of its window; no window crosses a series boundary
+    np.testing.assert_array_equal(y, X[:, -1, 0])
+    assert (np.diff(X[:, :, 0], axis=1) == 1).all()
+
+def test_shuffled_batches_keep_windows_and_targets_together(series_frame):
+    values = series_frame[["sales"]].to_numpy(dtype=np.float32)
+    positions = positions_from_lengths(series_lengths(series_frame)["rows"])
+
+    batches = list(iter_window_batches(values, values, positions, 3, batch_size=5, shuffle=True, seed=1))
+    X = np.concatenate([x for x, _ in batches])
+    y = np.concatenate([y for _, y in batches]).ravel()
+    assert sorted(y) == sorted(values[window_ends(positions, 3), 0])
+    np.testing.assert_array_equal(X[:, -1, 0], y)
+
+def test_first_end_skips_leading_history():
+    positions = np.arange(10)
+    assert window_ends(positions, 3).tolist() == list(range(2, 10))
+    assert window_ends(positions, 3, first_end=5).tolist() == list(range(5, 10))
+
+def test_series_ordered_split(series_frame):
+    train, test = split_data_time_series(clean_data(series_frame.assign(onpromotion=0)), test_days=2, order=SERIES_ORDER)
+    assert is_sorted_by(train, SERIES_ORDER) and is_sorted_by(test, SERIES_ORDER)
+    # (1, B) ends before the test period, (2, A) one day into it
+    assert series_lengths(test)["rows"].tolist() == [2, 1]
+
+def test_training_script_copy_matches_the_library():
+    # lstm_train_eval_script.py runs standalone on SageMaker, so it carries its own copy of the window helpers
+    def functions(source):
+        return {node.name: ast.dump(node) for node in ast.parse(source).body if isinstance(node, ast.FunctionDef)}
+
+    library = functions(inspect.getsource(sequence_windows))
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    with open(os.path.join(repo_root, "src", "training", "lstm_train_eval_script.py")) as f:
+        script = functions(f.read())
+    for name in ("positions_from_lengths", "window_view", "window_ends", "iter_window_batches"):
+        assert script[name] == library[name], f"{name} differs between the training script and src/features/sequence_windows.py"
+
+def test_no_positions_is_one_series():
+    values = np.arange(10, dtype=np.float32).reshape(-1, 1)
+    X, y = next(iter_window_batches(values, values, None, 3, batch_size=20, first_end=4))
+    assert y.ravel().tolist() == list(range(4, 10))
+
+@pytest.mark.parametrize("window, order", [(None, ["date", "store_nbr", "family"]), ("3", SERIES_ORDER)])
+def test_nn_splits_are_series_ordered_only_for_windowing(monkeypatch, tmp_path, window, order):
+    from src.data_processing.save_split_data import process_and_save_nn
+    from src.features.calendar_features import add_date_features
+
+    if window is None:
+        monkeypatch.delenv("LSTM_WINDOW", raising=False)
+    else:
+        monkeypatch.setenv("LSTM_WINDOW", window)
+    monkeypatch.setenv("PROCESSED_DATA_FORMAT", "csv")
+    frames = [
+        pd.DataFrame({"store_nbr": store, "family": family, "date": pd.date_range("2017-01-01", periods=40)})
+        for store, family in [(1, "A"), (1, "B"), (2, "A")]
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    df["sales"] = np.arange(len(df), dtype=np.float32)
+    df = add_date_features(clean_data(df.assign(onpromotion=0)))
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("data", "post", "nn"))
+    process_and_save_nn(df)
+
+    split_dir = tmp_path / "data" / "post" / "nn"
+    expected_train, _ = split_data_time_series(df, test_days=16, order=order)
+    saved_target = pd.read_csv(split_dir / "train_target.csv").iloc[:, 0].to_numpy()
+    np.testing.assert_array_equal(saved_target, expected_train["sales"].to_numpy())
+    assert (split_dir / "train_series.csv").exists() == (window is not None)
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xgboost as xgb
+from scipy import sparse
+from src.data_processing.storage import save_splits, read_frame, find_split_file
+from src.data_processing.transform import (
+    get_nn_preprocessor, get_xgboost_preprocessor, xgboost_matrix, to_index_form, one_hot_blocks
+)
+from src.inference.preprocess import Preprocessor
+from src.training.xgboost_train_eval_script import read_split
+
+LAG_COLS = ["lag_1", "lag_7", "lag_14", "roll_7_mean", "roll_14_mean"]
+
+@pytest.fixture
+def features():
+    rng = np.random.default_rng(0)
+    n_rows = 600
+    df = pd.DataFrame({
+        "family": rng.choice(["BEVERAGES", "DAIRY", "FROZEN FOODS"], n_rows),
+        "store_nbr": rng.integers(1, 4, n_rows),
+        "month": rng.integers(1, 13, n_rows),
+        "day_of_week": rng.integers(0, 7, n_rows),
+        "year": rng.integers(2013, 2018, n_rows),
+        "onpromotion": rng.integers(0, 3, n_rows),
+    })
+    for col in LAG_COLS:
+        # Plenty of exact zeros: they must stay zeros, not become missing
+        df[col] = np.where(rng.random(n_rows) < 0.4, 0.0, rng.uniform(0, 50, n_rows))
+    df["sales"] = df["lag_7"] * 0.5 + (df["family"] == "DAIRY") * 20 + df["onpromotion"] * 3
+    return df
+
+def test_preprocessors_emit_csr_matching_dense(features):
+    for get_preprocessor in (get_xgboost_preprocessor, get_nn_preprocessor):
+        sparse_out = get_preprocessor(sparse_output=True).fit_transform(features)
+        dense_out = get_preprocessor(sparse_output=False).fit_transform(features)
+        assert sparse.issparse(sparse_out)
+        np.testing.assert_allclose(sparse_out.toarray(), dense_out)
+
+def test_xgboost_matrix_stores_numeric_zeros(features):
+    preprocessor = get_xgboost_preprocessor(sparse_output=True)
+    matrix = xgboost_matrix(preprocessor.fit_transform(features), preprocessor)
+    dense = preprocessor.transform(features).toarray()
+
+    np.testing.assert_allclose(matrix.toarray(), dense, rtol=1e-6)
+    n_one_hot = sum(n for _, _, n in one_hot_blocks(preprocessor))
+    # One active category per row + every numeric value, zeros included
+    assert matrix.nnz == len(features) * (1 + matrix.shape[1] - n_one_hot)
+    assert matrix.dtype == np.float32
+
+def test_sparse_trained_model_serves_identically(features):
+    preprocessor = get_xgboost_preprocessor(sparse_output=True)
+    matrix = xgboost_matrix(preprocessor.fit_transform(features), preprocessor)
+    model = xgb.XGBRegressor(n_estimators=20, max_depth=4, tree_method="hist").fit(matrix, features["sales"])
+
+    serving = Preprocessor()
+    serving.xgb_scaler = preprocessor
+    rows = serving.build_xgboost_rows(features.to_dict("records"))
+    np.testing.assert_allclose(model.predict(rows), model.predict(matrix), rtol=1e-6)
+
+def test_index_form_recovers_categories(features):
+    preprocessor = get_nn_preprocessor(sparse_output=True)
+    matrix = preprocessor.fit_transform(features)
+    frame, vocab = to_index_form(matrix, preprocessor, list(preprocessor.get_feature_names_out()))
+
+    assert vocab == {"family_idx": 4, "store_nbr_idx": 4, "month_idx": 13, "day_of_week_idx": 8}
+    assert list(frame.columns[-4:]) == list(vocab)
+    family_categories = preprocessor.named_transformers_["cat_trans"].named_steps["one_hot"].categories_[0]
+    decoded = family_categories[frame["family_idx"].to_numpy() - 1]
+    assert (decoded == features["family"].to_numpy()).all()
+
+    unseen = features.head(2).assign(family="PET SUPPLIES")
+    unseen_frame, _ = to_index_form(preprocessor.transform(unseen), preprocessor, list(preprocessor.get_feature_names_out()))
+    assert (unseen_frame["family_idx"] == 0).all()
+
+def test_sparse_splits_roundtrip(tmp_path, features):
+    preprocessor = get_nn_preprocessor(sparse_output=True)
+    matrix = preprocessor.fit_transform(features)
+    names = list(preprocessor.get_feature_names_out())
+
+    # A dense split from an earlier run must not shadow the sparse one
+    pd.DataFrame({"x": [1.0]}).to_parquet(tmp_path / "train.parquet")
+    paths = save_splits(str(tmp_path), names, matrix[:500], features["sales"][:500], matrix[500:], features["sales"][500:])
+
+    assert paths["train"].endswith(".npz") and paths["train_target"].endswith(".parquet")
+    assert find_split_file(str(tmp_path), "train") == paths["train"]
+    assert not (tmp_path / "train.parquet").exists()
+
+    loaded = read_split(str(tmp_path), "train")
+    assert sparse.issparse(loaded)
+    np.testing.assert_allclose(loaded.toarray(), matrix[:500].toarray(), rtol=1e-6)
+
+    subset = read_frame(paths["test"], columns=[names[0], names[-1]])
+    np.testing.assert_allclose(subset.to_numpy(), matrix[500:][:, [0, len(names) - 1]].toarray(), rtol=1e-6)
@@ -0,0 +1,66 @@
+import os
+import pandas as pd
+import pytest
+from src.pipeline.shared_stages import load_clean_calendar, prepare_base_frame
+from src.pipeline.stage_cache import StageCache
+from src.utils.profiling import StageProfiler
+
+RAW_CSV = """date,store_nbr,family,sales,onpromotion
+2023-01-02,2,FOOD,7.25,1
+2023-01-01,1,FOOD,10.0,0
+2023-01-01,1, beverages ,5.5,2
+2023-01-02,1,BEVERAGES,3.0,0
+2023-01-01,2,FOOD,4.0,0
+"""
+
+@pytest.fixture
+def raw_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOLIDAYS_PATH", str(tmp_path / "no_holidays.csv"))
+    monkeypatch.delenv("CALENDAR_CACHE_PATH", raising=False)
+    path = tmp_path / "sales_data.csv"
+    path.write_text(RAW_CSV)
+    return str(path)
+
+def stage_names(profiler):
+    return [stage["stage"] for stage in profiler.report()]
+
+def test_key_tracks_content_and_params(tmp_path):
+    cache = StageCache(str(tmp_path / "cache"), enabled=True)
+    data = tmp_path / "data.csv"
+    data.write_text("a\n1\n")
+    key = cache.key(files=[str(data)], modules=[os], params={"mode": "full"})
+
+    assert key == cache.key(files=[str(data)], modules=[os], params={"mode": "full"})
+    assert key != cache.key(files=[str(data)], modules=[os], params={"mode": "sample"})
+    data.write_text("a\n2\n")
+    assert key != cache.key(files=[str(data)], modules=[os], params={"mode": "full"})
+
+def test_save_load_and_prune(tmp_path):
+    cache = StageCache(str(tmp_path), enabled=True)
+    df = pd.DataFrame({"x": [1.5, 2.5]}, index=[7, 3])
+
+    assert cache.load("stage", "a" * 64) is None
+    cache.save("stage", "a" * 64, df)
+    pd.testing.assert_frame_equal(cache.load("stage", "a" * 64), df.reset_index(drop=True))
+
+    cache.save("stage", "b" * 64, df)
+    assert os.listdir(tmp_path) == [os.path.basename(cache.path("stage", "b" * 64))]
+    assert StageCache(str(tmp_path), enabled=False).load("stage", "b" * 64) is None
+
+def test_prepared_frame_is_reused_until_the_raw_file_changes(raw_path, tmp_path):
+    cache = StageCache(str(tmp_path / "cache"), enabled=True)
+    expected = load_clean_calendar(raw_path, StageProfiler())
+
+    first = StageProfiler()
+    pd.testing.assert_frame_equal(prepare_base_frame(raw_path, first, cache), expected)
+    assert "clean" in stage_names(first) and "cache_write" in stage_names(first)
+
+    second = StageProfiler()
+    pd.testing.assert_frame_equal(prepare_base_frame(raw_path, second, cache), expected)
+    assert "clean" not in stage_names(second)
+
+    with open(raw_path, "a") as f:
+        f.write("2023-01-03,1,FOOD,1.0,0\n")
+    third = StageProfiler()
+    assert len(prepare_base_frame(raw_path, third, cache)) == len(expected) + 1
+    assert "clean" in stage_names(third)
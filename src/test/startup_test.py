@@ -0,0 +1,58 @@
+import os
+import time
+import subprocess
+import sys
+import joblib
+from fastapi.testclient import TestClient
+from sklearn.preprocessing import StandardScaler
+from src.inference.preprocess import Preprocessor
+
+def test_preprocessor_loads_artifacts_lazily(tmp_path):
+    joblib.dump(StandardScaler().fit([[0.0], [2.0]]), tmp_path / "preprocessor_xgboost.pkl")
+    preprocessor = Preprocessor(artifacts_dir=str(tmp_path))
+
+    assert preprocessor.artifact_status()["XGBoost"]["loaded"] is False
+
+    assert preprocessor.xgb_scaler is not None
+    status = preprocessor.artifact_status()
+    assert status["XGBoost"]["available"] is True
+    assert status["XGBoost"]["load_seconds"] is not None
+    assert status["NN"]["loaded"] is False
+
+def test_missing_artifact_loads_as_none(tmp_path):
+    preprocessor = Preprocessor(artifacts_dir=str(tmp_path))
+    preprocessor.preload()
+
+    assert preprocessor.nn_scaler is None
+    assert preprocessor.artifact_status()["NN"] == {
+        "path": os.path.join(str(tmp_path), "preprocessor_nn.pkl"),
+        "loaded": True,
+        "available": False,
+        "load_seconds": None,
+    }
+
+def test_ready_endpoint_after_preload(monkeypatch):
+    import app
+    monkeypatch.setenv("PRELOAD_ARTIFACTS", "true")
+
+    with TestClient(app.app) as client:
+        response = client.get("/ready")
+        for _ in range(100):
+            if response.json()["preload"] != "running":
+                break
+            time.sleep(0.05)
+            response = client.get("/ready")
+
+    body = response.json()
+    assert response.status_code == 200
+    assert body["ready"] is True
+    assert body["preload"] == "done"
+    assert set(body["artifacts"]) == {"XGBoost", "NN"}
+
+def test_logger_import_creates_no_files(tmp_path):
+    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    subprocess.run(
+        [sys.executable, "-c", f"import sys; sys.path.insert(0, {repo_root!r}); import src.utils.logger"],
+        cwd=tmp_path, check=True
+    )
+    assert not (tmp_path / "logs").exists()
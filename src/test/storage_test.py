@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.data_processing.storage import save_splits, read_frame, find_split_file, get_processed_format
+from src.monitoring.drift_detection import DriftDetector
+from src.training.xgboost_train_eval_script import read_split
+from src.utils.exception import CustomException
+
+@pytest.fixture
+def splits():
+    rng = np.random.default_rng(0)
+    names = ["cat_trans__family_A", "cat_trans__family_B", "num_trans__lag_1"]
+    return names, rng.random((50, 3)), pd.Series(rng.random(50), name="sales"), rng.random((10, 3)), pd.Series(rng.random(10), name="sales")
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_save_splits_roundtrip(tmp_path, splits, fmt):
+    names, X_train, y_train, X_test, y_test = splits
+    paths = save_splits(str(tmp_path), names, X_train, y_train, X_test, y_test, fmt=fmt)
+
+    assert paths["train"].endswith("." + fmt)
+    train = read_frame(paths["train"])
+    assert list(train.columns) == names
+    np.testing.assert_allclose(train.to_numpy(), X_train.astype(np.float32), rtol=1e-6)
+    if fmt != "csv":
+        assert (train.dtypes == "float32").all()
+
+    # Training scripts and drift detection pick the same file up
+    assert find_split_file(str(tmp_path), "test") == paths["test"]
+    np.testing.assert_allclose(read_split(str(tmp_path), "test").to_numpy(), X_test.astype(np.float32), rtol=1e-6)
+    assert DriftDetector().load_data(paths["train_target"]).columns.tolist() == ["sales"]
+
+def test_processed_format_from_env(monkeypatch):
+    monkeypatch.setenv("PROCESSED_DATA_FORMAT", "Feather")
+    assert get_processed_format() == "feather"
+    with pytest.raises(ValueError):
+        get_processed_format("xlsx")
+
+def test_read_frame_missing_file(tmp_path):
+    with pytest.raises(CustomException):
+        read_frame(str(tmp_path / "train.parquet"))
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 import pytest
-from src.data_processing.validate import validate_data
+from src.data_processing.clean import clean_data, CLEAN_DTYPES
+from src.data_processing.load import load_data
+from src.data_processing.validate import validate_data, validate_chunks
 from src.utils.exception import CustomException
 
 def test_validation_rejects_negative_sales():
@@ -18,5 +21,68 @@ def test_validation_rejects_negative_sales():
         validate_data(df)
     print("Test Passed: Negative sales were caught!")
 
+def sales_frame(n_rows=1000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'date': pd.date_range("2023-01-01", periods=n_rows).strftime("%Y-%m-%d"),
+        'store_nbr': rng.integers(1, 5, n_rows),
+        'family': rng.choice(['FOOD', 'BEVERAGES'], n_rows),
+        'sales': rng.uniform(0, 100, n_rows),
+        'onpromotion': rng.integers(0, 3, n_rows),
+    })
+
+@pytest.mark.parametrize("mode", ["full", "chunked", "sample"])
+def test_modes_return_frame_coerced_for_clean(mode):
+    df = sales_frame()
+    validated = validate_data(df, mode=mode, chunk_rows=300, sample_frac=0.1)
+
+    assert len(validated) == len(df)
+    assert pd.api.types.is_datetime64_any_dtype(validated['date'])
+    for col, dtype in CLEAN_DTYPES.items():
+        assert validated[col].dtype == dtype
+    pd.testing.assert_frame_equal(validated, validate_data(df, mode="full"))
+
+def test_chunked_mode_checks_every_chunk():
+    df = sales_frame()
+    df.loc[[5, 950], 'sales'] = -1.0
+
+    with pytest.raises(CustomException, match="2 failure cases"):
+        validate_data(df, mode="chunked", chunk_rows=300)
+
+def test_sample_mode_catches_widespread_errors():
+    df = sales_frame()
+    df.loc[df.index[::4], 'store_nbr'] = 0
+
+    with pytest.raises(CustomException):
+        validate_data(df, mode="sample", sample_frac=0.05)
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(CustomException, match="Unsupported validation mode"):
+        validate_data(sales_frame(), mode="fast")
+    with pytest.raises(CustomException, match="Unsupported validation mode"):
+        next(validate_chunks([sales_frame()], mode="fast"))
+
+def test_validate_chunks_raises_after_the_stream():
+    df = sales_frame()
+    df.loc[10, 'onpromotion'] = -2
+    chunks = validate_chunks((df.iloc[start:start + 250] for start in range(0, len(df), 250)), mode="chunked")
+
+    yielded = []
+    with pytest.raises(CustomException):
+        for chunk in chunks:
+            yielded.append(chunk)
+    assert len(yielded) == 4
+
+def test_validated_chunked_load_matches_full_validation(tmp_path):
+    path = tmp_path / "sales_data.csv"
+    sales_frame().to_csv(path, index=False)
+
+    loaded = load_data(str(path), typed=True, chunksize=300, validate=True)
+    expected = validate_data(load_data(str(path), typed=True), mode="full")
+
+    pd.testing.assert_frame_equal(loaded, expected)
+    cols = ['store_nbr', 'family', 'sales', 'onpromotion']
+    pd.testing.assert_frame_equal(clean_data(loaded.copy())[cols], clean_data(load_data(str(path)))[cols])
+
 if __name__ == "__main__":
-    test_validation_rejects_negative_sales()
\ No newline at end of file
+    test_validation_rejects_negative_sales()
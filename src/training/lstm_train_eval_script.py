@@ -1,10 +1,312 @@
 import argparse
+import io
+import json
 import os
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import sparse
 import tensorflow as tf
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 
+# ---------------------------------------------------------
+# SERVING HANDLERS (SageMaker TensorFlow Serving container)
+# ---------------------------------------------------------
+NPY_CONTENT_TYPE = "application/x-npy"
+
+def input_handler(data, context):
+    """
+    Request body -> TF Serving REST request.
+    Accepts float32 .npy tensors (LSTM_PAYLOAD_FORMAT=npy on the API) as well as JSON.
+    """
+    if context.request_content_type == NPY_CONTENT_TYPE:
+        instances = np.load(io.BytesIO(data.read()), allow_pickle=False)
+        return json.dumps({"instances": instances.tolist()})
+
+    if context.request_content_type == "application/json":
+        return data.read().decode("utf-8")
+
+    raise ValueError(f"Unsupported content type: {context.request_content_type}")
+
+def output_handler(data, context):
+    """
+    TF Serving response -> client. Returns .npy bytes when the client asked for them.
+    """
+    if data.status_code != 200:
+        raise ValueError(data.content.decode("utf-8"))
+
+    if context.accept_header == NPY_CONTENT_TYPE:
+        predictions = np.asarray(json.loads(data.content)["predictions"], dtype=np.float32)
+        buffer = io.BytesIO()
+        np.save(buffer, predictions, allow_pickle=False)
+        return buffer.getvalue(), NPY_CONTENT_TYPE
+
+    return data.content, "application/json"
+
+# ---------------------------------------------------------
+# DATA READING (processed splits: .parquet, .feather, .csv or sparse .npz)
+# ---------------------------------------------------------
+SPLIT_EXTENSIONS = (".parquet", ".feather", ".npz", ".csv")
+
+def split_path(directory, name, filename=None):
+    """
+    Path of a processed split: the explicit filename, else the first
+    <name>.parquet / .feather / .npz / .csv found in the directory.
+    """
+    if filename is not None:
+        return os.path.join(directory, filename)
+    candidates = [os.path.join(directory, name + ext) for ext in SPLIT_EXTENSIONS]
+    return next((p for p in candidates if os.path.exists(p)), candidates[-1])
+
+def read_split(directory, name, filename=None):
+    """
+    Reads a processed split. Without an explicit filename, picks the first of
+    <name>.parquet / .feather / .npz / .csv found in the directory.
+    .npz splits are returned as a scipy CSR matrix.
+    """
+    return read_split_file(split_path(directory, name, filename))
+
+def read_split_file(path):
+    """
+    Reads one processed split file (see read_split).
+    """
+    if path.endswith(".npz"):
+        return sparse.load_npz(path).tocsr()
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".feather"):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+def to_dense(X):
+    """
+    Split -> float32 numpy array (Keras LSTMs take dense input; sparse splits are expanded here).
+    """
+    if sparse.issparse(X):
+        return X.toarray().astype(np.float32, copy=False)
+    return X.to_numpy(dtype=np.float32)
+
+# ---------------------------------------------------------
+# STREAMING INPUT (tf.data over row ranges of the processed splits)
+# ---------------------------------------------------------
+class SplitReader:
+    """
+    Reads row ranges of a processed split as float32 without loading the whole file:
+    Parquet by row group, Feather by record batch (memory-mapped), .npz from its compact
+    CSR matrix with only the requested rows densified. CSV cannot be read by row range.
+    """
+    def __init__(self, path):
+        self.path = path
+        if path.endswith(".npz"):
+            self._matrix = sparse.load_npz(path).tocsr()
+            self.n_rows, self.n_cols = self._matrix.shape
+            return
+        if path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            metadata = pq.ParquetFile(path).metadata
+            sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+            self.n_cols = metadata.num_columns
+        elif path.endswith(".feather"):
+            reader = self._feather_reader()
+            sizes = [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+            self.n_cols = len(reader.schema)
+        else:
+            raise ValueError(f"Cannot stream {path}: use Parquet, Feather or .npz splits, or --input-pipeline memory")
+        # Row offset of each row group / record batch, plus the total
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.n_rows = int(self._offsets[-1])
+
+    def _feather_reader(self):
+        import pyarrow as pa
+        return pa.ipc.open_file(pa.memory_map(self.path))
+
+    def rows(self, start, stop):
+        """
+        Rows [start, stop) as a float32 (rows, columns) array. Files are reopened per call,
+        so several tf.data threads can read at once.
+        """
+        if self.path.endswith(".npz"):
+            return self._matrix[start:stop].toarray().astype(np.float32, copy=False)
+
+        first = int(np.searchsorted(self._offsets, start, side="right")) - 1
+        last = int(np.searchsorted(self._offsets, stop, side="left"))
+        if self.path.endswith(".parquet"):
+            import pyarrow.parquet as pq
+            table = pq.ParquetFile(self.path).read_row_groups(list(range(first, last)))
+        else:
+            import pyarrow as pa
+            reader = self._feather_reader()
+            table = pa.Table.from_batches([reader.get_batch(i) for i in range(first, last)])
+        table = table.slice(start - int(self._offsets[first]), stop - start)
+        return table.to_pandas().to_numpy(dtype=np.float32)
+
+    def take(self, index):
+        """
+        Rows at the sorted positions `index` as float32, reading each row group / record batch once.
+        """
+        index = np.asarray(index, dtype=np.int64)
+        if self.path.endswith(".npz"):
+            return self._matrix[index].toarray().astype(np.float32, copy=False)
+
+        groups = np.searchsorted(self._offsets, index, side="right") - 1
+        parts = [np.empty((0, self.n_cols), dtype=np.float32)]
+        for group in np.unique(groups):
+            start, stop = int(self._offsets[group]), int(self._offsets[group + 1])
+            parts.append(self.rows(start, stop)[index[groups == group] - start])
+        return np.concatenate(parts)
+
+# ---------------------------------------------------------
+# SLIDING WINDOWS (copy of src/features/sequence_windows.py: this script runs standalone.
+# sequence_windows_test checks the two copies stay identical.)
+# ---------------------------------------------------------
+def positions_from_lengths(lengths) -> np.ndarray:
+    """
+    Position of each row within its series, for rows stored series after series.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    series_start = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.arange(lengths.sum(), dtype=np.int64) - series_start
+
+def window_view(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    (rows, features) -> (rows - window + 1, window, features) view of overlapping windows,
+    view[i] = rows i .. i + window - 1. Strided over `values`: nothing is copied.
+    """
+    return np.moveaxis(sliding_window_view(values, window, axis=0), -1, 1)
+
+def window_ends(positions: np.ndarray, window: int, first_end: int = 0) -> np.ndarray:
+    """
+    Rows (from first_end on) whose window lies entirely inside their own series.
+    """
+    return np.flatnonzero(positions[first_end:] >= window - 1) + first_end
+
+def iter_window_batches(values, targets, positions, window: int, batch_size: int,
+                        shuffle: bool = False, seed=None, first_end: int = 0):
+    """
+    Yields (X (batch, window, features), y (batch, 1)) float32 batches, one window per row with
+    a full history in its series (see window_ends). Windows are gathered from window_view batch
+    by batch, so memory holds one batch of windows whatever the window length or history.
+    first_end: rows before it only serve as history (e.g. the overlap with the previous chunk).
+    positions=None: all rows are one series (e.g. window 1 over rows in date order).
+    """
+    if positions is None:
+        positions = np.arange(len(values))
+    windows = window_view(values, window)
+    targets = np.asarray(targets, dtype=np.float32).reshape(-1, 1)
+    ends = window_ends(positions, window, first_end)
+    if shuffle:
+        np.random.default_rng(seed).shuffle(ends)
+
+    for start in range(0, len(ends), batch_size):
+        batch_ends = ends[start:start + batch_size]
+        yield windows[batch_ends - window + 1].astype(np.float32, copy=False), targets[batch_ends]
+
+def window_signature(window, n_features):
+    return (
+        tf.TensorSpec(shape=(None, window, n_features), dtype=tf.float32),
+        tf.TensorSpec(shape=(None, 1), dtype=tf.float32),
+    )
+
+def window_dataset(values, targets, positions, window, batch_size, shuffle=False):
+    """
+    In-memory rows -> tf.data of window batches (reshuffled every epoch when shuffle).
+    """
+    return tf.data.Dataset.from_generator(
+        lambda: iter_window_batches(values, targets, positions, window, batch_size, shuffle),
+        output_signature=window_signature(window, values.shape[1])
+    ).prefetch(tf.data.AUTOTUNE)
+
+def windows_with_context(test_X, test_y, test_series, train_series, take_train_rows, window):
+    """
+    Test rows with the last window - 1 training rows of their series in front, so every test day
+    gets a full window. take_train_rows(index) returns training feature rows (sorted positions).
+    Returns (values, targets, positions) ready for iter_window_batches; context rows are never
+    window ends, so their NaN targets are not used.
+    """
+    keys = ["store_nbr", "family"]
+    train_end = train_series[keys].assign(end=np.cumsum(train_series["rows"].to_numpy()), train_rows=train_series["rows"])
+    matched = test_series[keys].merge(train_end, on=keys, how="left")
+    context = np.minimum(window - 1, matched["train_rows"].fillna(0).to_numpy(dtype=np.int64))
+    ends = matched["end"].fillna(0).to_numpy(dtype=np.int64)
+    test_rows = test_series["rows"].to_numpy(dtype=np.int64)
+
+    # Block per series: its training context, then its test rows
+    lengths = context + test_rows
+    positions = positions_from_lengths(lengths)
+    is_context = positions < np.repeat(context, lengths)
+    train_index = np.concatenate([np.arange(end - n, end) for end, n in zip(ends, context)] + [np.empty(0, np.int64)])
+
+    values = np.empty((lengths.sum(), test_X.shape[1]), dtype=np.float32)
+    values[is_context] = take_train_rows(train_index)
+    values[~is_context] = test_X
+    targets = np.full(lengths.sum(), np.nan, dtype=np.float32)
+    targets[~is_context] = np.asarray(test_y, dtype=np.float32).ravel()
+    # Series with less than window - 1 training days keep their first test days without a window
+    return values, targets, positions
+
+def split_dataset(features, target, batch_size, chunk_rows, shuffle_buffer=0, cache_path=None, parallel_reads=2,
+                  window=1, positions=None):
+    """
+    tf.data pipeline over two SplitReaders, yielding ((batch, window, features), (batch, 1)) float32 batches.
+    Chunks of chunk_rows rows are read on up to parallel_reads threads and cut into batches in
+    NumPy, so tf.data never handles single rows. With shuffle_buffer, the chunk order and the
+    rows within each chunk are reshuffled every epoch and batches are mixed across chunks in a
+    buffer of about shuffle_buffer rows. cache_path keeps the parsed batches on disk after the
+    first epoch (reshuffled only through that buffer). Memory holds a few chunks, not the split.
+    window > 1: each chunk is read with the window - 1 rows before it, and every row with a full
+    window inside its series (positions, see positions_from_lengths) yields one sliding window.
+    """
+    n_chunks = -(-features.n_rows // chunk_rows)
+    signature = window_signature(window, features.n_cols)
+
+    def read_chunk(index):
+        start = int(index) * chunk_rows
+        stop = min(start + chunk_rows, features.n_rows)
+        # Overlap with the previous chunk: history only, those rows were window ends there
+        first = max(0, start - window + 1)
+        X, y = features.rows(first, stop), target.rows(first, stop)
+        chunk_positions = positions[first:stop] if positions is not None else None
+        yield from iter_window_batches(
+            X, y, chunk_positions, window, batch_size, shuffle=bool(shuffle_buffer), first_end=start - first
+        )
+
+    chunks = tf.data.Dataset.range(n_chunks)
+    if shuffle_buffer:
+        chunks = chunks.shuffle(n_chunks, reshuffle_each_iteration=True)
+    dataset = chunks.interleave(
+        lambda index: tf.data.Dataset.from_generator(read_chunk, args=(index,), output_signature=signature),
+        cycle_length=parallel_reads,
+        # Unshuffled: a whole chunk per block keeps row order (predictions line up with the targets)
+        block_length=1 if shuffle_buffer else -(-chunk_rows // batch_size),
+        num_parallel_calls=parallel_reads,
+        deterministic=not shuffle_buffer
+    )
+    if cache_path:
+        dataset = dataset.cache(cache_path)
+    if shuffle_buffer:
+        dataset = dataset.shuffle(max(1, shuffle_buffer // batch_size), reshuffle_each_iteration=True)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+def peak_memory_mb():
+    """
+    Peak resident memory of this process so far (MB).
+    """
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def embedding_inputs(inputs, vocab):
+    """
+    Index-form input (numeric columns, then one '<column>_idx' per categorical column) ->
+    numeric columns concatenated with one learned embedding per categorical column.
+    """
+    numeric_dim = inputs.shape[-1] - len(vocab)
+    parts = [tf.keras.layers.Lambda(lambda t: t[..., :numeric_dim], name="numeric")(inputs)]
+    for i, (name, size) in enumerate(vocab.items()):
+        index = tf.keras.layers.Lambda(lambda t, i=i: t[..., numeric_dim + i], name=name)(inputs)
+        # Small vocabularies (family, store, month, weekday): min(16, half the vocabulary) dimensions
+        parts.append(tf.keras.layers.Embedding(size, min(16, (size + 1) // 2), name=f"{name}_embedding")(index))
+    return tf.keras.layers.Concatenate()(parts)
+
 if __name__ == "__main__":
 
     print(f"[Info] TensorFlow Version: {tf.__version__}")
@@ -22,51 +324,116 @@ if __name__ == "__main__":
     parser.add_argument("--test", type=str, default=os.environ.get("SM_CHANNEL_TEST", "data/post/nn"))
 
     # Filenames 
-    parser.add_argument("--train-file", type=str, default="train.csv")
-    parser.add_argument("--train-target-file", type=str, default="train_target.csv")
-    parser.add_argument("--test-file", type=str, default="test.csv")
-    parser.add_argument("--test-target-file", type=str, default="test_target.csv")
+    # Default: auto-detect train.parquet / train.feather / train.npz / train.csv
+    parser.add_argument("--train-file", type=str, default=None)
+    parser.add_argument("--train-target-file", type=str, default=None)
+    parser.add_argument("--test-file", type=str, default=None)
+    parser.add_argument("--test-target-file", type=str, default=None)
+
+    # one_hot: the (sparse) one-hot splits; index: train_index/test_index + index_vocab.json with embeddings
+    parser.add_argument("--input-form", type=str, choices=["one_hot", "index"],
+                        default=os.environ.get("LSTM_INPUT_FORM", "one_hot"))
+
+    # memory: whole splits as NumPy arrays; stream: tf.data reading row chunks lazily (see split_dataset)
+    parser.add_argument("--input-pipeline", type=str, choices=["memory", "stream"],
+                        default=os.environ.get("LSTM_INPUT_PIPELINE", "memory"))
+    parser.add_argument("--chunk-rows", type=int, default=int(os.environ.get("LSTM_CHUNK_ROWS", 250_000)))
+    parser.add_argument("--shuffle-buffer", type=int, default=int(os.environ.get("LSTM_SHUFFLE_BUFFER", 100_000)))
+    parser.add_argument("--parallel-reads", type=int, default=2)
+    # Optional on-disk tf.data cache of the parsed training chunks (e.g. local NVMe when the channel is slow)
+    parser.add_argument("--data-cache", type=str, default=os.environ.get("LSTM_DATA_CACHE"))
+
+    # Days per sample: 1 = one row per sample; > 1 = sliding windows over each store/family series
+    # (needs the series-ordered splits with train_series/test_series)
+    parser.add_argument("--window", type=int, default=int(os.environ.get("LSTM_WINDOW", 1)))
 
     args, _ = parser.parse_known_args()
 
     # 2. Data Loading & Preprocessing
     print("[INFO] Reading data...")
     
-    # Load Training Data
-    X_train = pd.read_csv(os.path.join(args.train, args.train_file))
-    y_train = pd.read_csv(os.path.join(args.train, args.train_target_file))
-    
-    # Load Testing Data
-    X_test = pd.read_csv(os.path.join(args.test, args.test_file))
-    y_test = pd.read_csv(os.path.join(args.test, args.test_target_file))
+    vocab = None
+    split_suffix = ""
+    if args.input_form == "index":
+        with open(os.path.join(args.train, "index_vocab.json")) as f:
+            vocab = json.load(f)
+        split_suffix = "_index"
+
+    train_path = split_path(args.train, "train" + split_suffix, args.train_file)
+    train_target_path = split_path(args.train, "train_target", args.train_target_file)
+    test_path = split_path(args.test, "test" + split_suffix, args.test_file)
+    test_target_path = split_path(args.test, "test_target", args.test_target_file)
+
+    window = args.window
+    if window > 1:
+        if not os.path.exists(split_path(args.train, "train_series")):
+            raise FileNotFoundError(f"--window {window} needs train_series/test_series: build the NN splits with LSTM_WINDOW={window}")
+        train_series, test_series = read_split(args.train, "train_series"), read_split(args.test, "test_series")
+        train_positions = positions_from_lengths(train_series["rows"])
 
-    # Convert to Numpy Arrays
-    X_train = X_train.values
-    y_train = y_train.values
-    X_test = X_test.values
-    y_test = y_test.values
+    if args.input_pipeline == "stream":
+        # Row chunks are read lazily as float32; the splits are never loaded whole
+        train_features, train_target = SplitReader(train_path), SplitReader(train_target_path)
+        test_features, test_target = SplitReader(test_path), SplitReader(test_target_path)
+        train_data = split_dataset(
+            train_features, train_target, args.batch_size, args.chunk_rows,
+            shuffle_buffer=args.shuffle_buffer, cache_path=args.data_cache, parallel_reads=args.parallel_reads,
+            window=window, positions=train_positions if window > 1 else None
+        )
+        if window > 1:
+            # The test split is small: build its windows in memory, with context read from the training split
+            test_values, test_targets, test_positions = windows_with_context(
+                test_features.rows(0, test_features.n_rows), test_target.rows(0, test_target.n_rows),
+                test_series, train_series, train_features.take, window
+            )
+        else:
+            test_data = split_dataset(
+                test_features, test_target, args.batch_size, args.chunk_rows, parallel_reads=args.parallel_reads
+            )
+            y_test = test_target.rows(0, test_target.n_rows)
+        input_shape = (train_features.n_rows, window, train_features.n_cols)
+    else:
+        # Load splits as float32 arrays (no float64 intermediate)
+        X_train = to_dense(read_split_file(train_path))
+        y_train = to_dense(read_split_file(train_target_path))
+        X_test = to_dense(read_split_file(test_path))
+        y_test = to_dense(read_split_file(test_target_path))
 
-    # --- RESHAPE INPUT ---
-    X_train = X_train.reshape((X_train.shape[0], 1, X_train.shape[1]))
-    X_test = X_test.reshape((X_test.shape[0], 1, X_test.shape[1]))
+        if window > 1:
+            # Windows are views over X_train, gathered one batch at a time
+            train_data = window_dataset(X_train, y_train, train_positions, window, args.batch_size, shuffle=True)
+            test_values, test_targets, test_positions = windows_with_context(
+                X_test, y_test, test_series, train_series, lambda index: X_train[index], window
+            )
+        else:
+            # --- RESHAPE INPUT --- (a view, no copy)
+            X_train = X_train.reshape((X_train.shape[0], 1, X_train.shape[1]))
+            X_test = X_test.reshape((X_test.shape[0], 1, X_test.shape[1]))
+        input_shape = (X_train.shape[0], window, X_train.shape[-1])
 
-    input_dim = X_train.shape[2] # Number of features
-    print(f"[INFO] Input Shape: {X_train.shape} (Samples, Timesteps, Features)")
+    if window > 1:
+        # Unshuffled, so predictions line up with y_test (the targets of the window ends)
+        test_data = window_dataset(test_values, test_targets, test_positions, window, args.batch_size)
+        y_test = test_targets[test_positions >= window - 1].reshape(-1, 1)
+        input_shape = (int((train_positions >= window - 1).sum()),) + input_shape[1:]
+
+    input_dim = input_shape[2] # Number of features
+    print(f"[INFO] Input Shape: {input_shape} (Samples, Timesteps, Features), {args.input_pipeline} input pipeline")
 
     # 3. Build Custom LSTM Model
     print("[INFO] Building Model Architecture")
-    model = tf.keras.Sequential([        
-        # LSTM Layer 1
-        tf.keras.layers.LSTM(64, input_shape=(1, input_dim), return_sequences=True),
-        tf.keras.layers.Dropout(0.2), # Prevent Overfitting
-        # LSTM Layer 2
-        tf.keras.layers.LSTM(32, return_sequences=False),
-        tf.keras.layers.Dropout(0.2),
-        # Dense Hidden Layer
-        tf.keras.layers.Dense(32, activation='relu'),
-        # Output Layer
-        tf.keras.layers.Dense(1) 
-    ])
+    inputs = tf.keras.Input(shape=(window, input_dim))
+    x = embedding_inputs(inputs, vocab) if vocab else inputs
+    # LSTM Layer 1
+    x = tf.keras.layers.LSTM(64, return_sequences=True)(x)
+    x = tf.keras.layers.Dropout(0.2)(x) # Prevent Overfitting
+    # LSTM Layer 2
+    x = tf.keras.layers.LSTM(32, return_sequences=False)(x)
+    x = tf.keras.layers.Dropout(0.2)(x)
+    # Dense Hidden Layer
+    x = tf.keras.layers.Dense(32, activation='relu')(x)
+    # Output Layer
+    model = tf.keras.Model(inputs, tf.keras.layers.Dense(1)(x))
 
     # Compile Model
     model.compile(
@@ -79,19 +446,22 @@ if __name__ == "__main__":
 
     # 4. Train the Model
     print("[INFO] Training Model ...")
-    history = model.fit(
-        X_train, y_train,
-        validation_data=(X_test, y_test),
-        epochs=args.epochs,
-        batch_size=args.batch_size,
-        verbose=2
-    )
+    if args.input_pipeline == "stream" or window > 1:
+        history = model.fit(train_data, validation_data=test_data, epochs=args.epochs, verbose=2)
+    else:
+        history = model.fit(
+            X_train, y_train,
+            validation_data=(X_test, y_test),
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            verbose=2
+        )
 
     # 5. Evaluation
     print("\n[INFO] Evaluating on Test Data")
     
-    # Get predictions
-    y_pred = model.predict(X_test)
+    # Get predictions (the test dataset is not shuffled, so rows line up with y_test)
+    y_pred = model.predict(test_data if args.input_pipeline == "stream" or window > 1 else X_test)
     
     # Calculate Sklearn Metrics for detailed reporting
     mse = mean_squared_error(y_test, y_pred)
@@ -102,6 +472,7 @@ if __name__ == "__main__":
     print(f"Test RMSE: {rmse:.4f}")
     print(f"Test MAE:  {mae:.4f}")
     print(f"Test R2:   {r2:.4f}")
+    print(f"[INFO] Peak memory: {peak_memory_mb():.0f} MB ({args.input_pipeline} input pipeline)")
 
     # 6. Save Model
     save_path = os.path.join(args.model_dir, '00000001')
@@ -1,7 +1,11 @@
 import argparse
 import os
 import json
+import re
+import tempfile
+import time
 import pandas as pd
+from scipy import sparse
 import numpy as np
 import xgboost as xgb
 from sklearn.metrics import mean_squared_error
@@ -19,6 +23,177 @@ def model_fn(model_dir):
     booster.load_model(os.path.join(model_dir, model_file))
     return booster
 
+# ---------------------------------------------------------
+# DATA READING (processed splits: .parquet, .feather, .csv or sparse .npz)
+# ---------------------------------------------------------
+SPLIT_EXTENSIONS = (".parquet", ".feather", ".npz", ".csv")
+
+def split_path(directory, name, filename=None):
+    """
+    Path of a processed split: the explicit filename, else the first
+    <name>.parquet / .feather / .npz / .csv found in the directory.
+    """
+    if filename is not None:
+        return os.path.join(directory, filename)
+    candidates = [os.path.join(directory, name + ext) for ext in SPLIT_EXTENSIONS]
+    return next((p for p in candidates if os.path.exists(p)), candidates[-1])
+
+def read_split(directory, name, filename=None):
+    """
+    Reads a processed split. Without an explicit filename, picks the first of
+    <name>.parquet / .feather / .npz / .csv found in the directory.
+    .npz splits are returned as a scipy CSR matrix.
+    """
+    path = split_path(directory, name, filename)
+
+    if path.endswith(".npz"):
+        return sparse.load_npz(path).tocsr()
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    if path.endswith(".feather"):
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+# Written by save_split_data in XGBOOST_FEATURE_MODE=categorical: {column: categories}
+CATEGORY_VOCAB_FILE = "category_vocab.json"
+
+def read_category_vocab(directory):
+    """
+    The split's category vocabulary, or {} when it has no categorical columns.
+    """
+    path = os.path.join(directory or "", CATEGORY_VOCAB_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+# Oldest XGBoost release with each optional feature. SageMaker's framework_version pins
+# the container's XGBoost (notebooks/xgboost_sagemaker.ipynb uses 1.7-1).
+MIN_XGBOOST_VERSIONS = {
+    "categorical": (1, 6),  # enable_categorical with tree_method='hist', max_cat_to_onehot
+    "quantile": (1, 7),     # QuantileDMatrix from a DataIter
+    "external": (3, 0),     # ExtMemQuantileDMatrix
+}
+
+def require_xgboost(feature):
+    """
+    Fails with a clear message when the installed XGBoost is too old for `feature`.
+    """
+    required = MIN_XGBOOST_VERSIONS[feature]
+    installed = tuple(int(re.match(r"\d+", part).group()) for part in xgb.__version__.split(".")[:2])
+    if installed < required:
+        raise RuntimeError(
+            f"'{feature}' needs XGBoost >= {'.'.join(map(str, required))}, found {xgb.__version__}. "
+            f"Use a newer SageMaker XGBoost framework_version."
+        )
+
+def as_categorical(X, vocab):
+    """
+    Marks the integer-coded columns listed in vocab as pandas categoricals over codes
+    0..n-1 (NaN = unknown), which XGBoost splits on natively with enable_categorical.
+    """
+    for column, categories in vocab.items():
+        codes = np.nan_to_num(X[column].to_numpy(), nan=-1).astype(np.int32)
+        X[column] = pd.Categorical.from_codes(codes, categories=np.arange(len(categories)))
+    return X
+
+# ---------------------------------------------------------
+# STREAMING DATA (out-of-core training through xgb.DataIter)
+# ---------------------------------------------------------
+# memory: whole split in pandas + XGBRegressor.fit
+# quantile: chunks sketched into a QuantileDMatrix (only the quantised matrix is kept)
+# external: chunks cached to disk as ExtMemQuantileDMatrix pages, one page in memory at a time
+DATA_MODES = ("memory", "quantile", "external")
+
+def iter_split_chunks(path, chunk_rows):
+    """
+    Yields a processed split in chunks of about chunk_rows rows without loading the whole file
+    (DataFrames; CSR slices for .npz, which cannot be read partially and is loaded once).
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        # One row group at a time: ParquetFile.iter_batches pre-buffers the whole file
+        parquet_file = pq.ParquetFile(path)
+        for i in range(parquet_file.num_row_groups):
+            row_group = parquet_file.read_row_group(i)
+            for start in range(0, row_group.num_rows, chunk_rows):
+                yield row_group.slice(start, chunk_rows).to_pandas()
+    elif path.endswith(".feather"):
+        import pyarrow as pa
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        batches, n_rows = [], 0
+        for i in range(reader.num_record_batches):
+            batches.append(reader.get_batch(i))
+            n_rows += batches[-1].num_rows
+            if n_rows >= chunk_rows or i == reader.num_record_batches - 1:
+                yield pa.Table.from_batches(batches).to_pandas()
+                batches, n_rows = [], 0
+    elif path.endswith(".npz"):
+        matrix = sparse.load_npz(path).tocsr()
+        for start in range(0, matrix.shape[0], chunk_rows):
+            yield matrix[start:start + chunk_rows]
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+class SplitIter(xgb.DataIter):
+    """
+    Feeds a processed split to XGBoost chunk by chunk. The features are streamed;
+    the target (one float32 column) is read whole and sliced to match each chunk.
+    """
+    def __init__(self, features_path, target_path, chunk_rows, category_vocab=None, cache_prefix=None):
+        self.features_path = features_path
+        self.chunk_rows = chunk_rows
+        self.category_vocab = category_vocab or {}
+        self.target = read_split(os.path.dirname(target_path), None, os.path.basename(target_path))
+        self.target = self.target.to_numpy(dtype=np.float32).ravel()
+        self._chunks, self._offset = None, 0
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = iter_split_chunks(self.features_path, self.chunk_rows)
+        X = next(self._chunks, None)
+        if X is None:
+            return False
+        if self.category_vocab:
+            X = as_categorical(X, self.category_vocab)
+        n_rows = X.shape[0]
+        input_data(data=X, label=self.target[self._offset:self._offset + n_rows])
+        self._offset += n_rows
+        return True
+
+    def reset(self):
+        self._chunks, self._offset = None, 0
+
+def tree_params(data_mode, max_bin, category_vocab):
+    """
+    Tree method settings for the model. Native categorical splits and the streamed quantile
+    DMatrix need tree_method='hist' with the DMatrix's max_bin; plain in-memory one-hot
+    training keeps XGBoost's defaults.
+    """
+    params = {}
+    if category_vocab or data_mode != "memory":
+        params.update(tree_method="hist", max_bin=max_bin)
+    if category_vocab:
+        params.update(enable_categorical=True)
+    return params
+
+def streamed_dmatrix(iterator, data_mode, max_bin, enable_categorical):
+    """
+    Builds the training DMatrix from a SplitIter without materialising the float matrix.
+    """
+    require_xgboost(data_mode)
+    if data_mode == "external":
+        return xgb.ExtMemQuantileDMatrix(iterator, max_bin=max_bin, enable_categorical=enable_categorical)
+    return xgb.QuantileDMatrix(iterator, max_bin=max_bin, enable_categorical=enable_categorical)
+
+def peak_memory_mb():
+    """
+    Peak resident memory of this process so far (MB).
+    """
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
 if __name__ == "__main__":
     print("[Info] Extracting arguments")
     parser = argparse.ArgumentParser()
@@ -28,6 +203,9 @@ if __name__ == "__main__":
     parser.add_argument("--max_depth", type=int, default=6)
     parser.add_argument("--learning_rate", type=float, default=0.1)
     parser.add_argument("--subsample", type=float, default=0.8)
+    # Categorical columns with fewer categories than this get one-vs-rest splits;
+    # larger ones get partition splits, which cost more per tree (used with category codes only)
+    parser.add_argument("--max_cat_to_onehot", type=int, default=64)
     
     # Locations
     parser.add_argument("--model-dir", type=str, default=os.environ.get("SM_MODEL_DIR"))
@@ -35,32 +213,53 @@ if __name__ == "__main__":
     parser.add_argument("--test", type=str, default=os.environ.get("SM_CHANNEL_TEST"))
     
     # Filenames
-    parser.add_argument("--train-file", type=str, default="train.csv")
-    parser.add_argument("--train-target-file", type=str, default="train_target.csv")
-    parser.add_argument("--test-file", type=str, default="test.csv")
-    parser.add_argument("--test-target-file", type=str, default="test_target.csv")
+    # Default: auto-detect train.parquet / train.feather / train.npz / train.csv
+    parser.add_argument("--train-file", type=str, default=None)
+    parser.add_argument("--train-target-file", type=str, default=None)
+    parser.add_argument("--test-file", type=str, default=None)
+    parser.add_argument("--test-target-file", type=str, default=None)
+
+    # Data loading: memory, or streamed in chunks (quantile / external, see DATA_MODES)
+    parser.add_argument("--data-mode", type=str, choices=DATA_MODES, default=os.environ.get("XGB_DATA_MODE", "memory"))
+    parser.add_argument("--chunk-rows", type=int, default=int(os.environ.get("XGB_CHUNK_ROWS", 250_000)))
+    # Histogram bins, used with category codes or a streamed data mode (tree_method hist)
+    parser.add_argument("--max_bin", type=int, default=256)
+    parser.add_argument("--cache-dir", type=str, default=os.environ.get("XGB_CACHE_DIR", tempfile.gettempdir()))
 
     args, _ = parser.parse_known_args()
 
     # ---------------------------------------------------------
     # 2. DATA LOADING
     # ---------------------------------------------------------
-    print(f"[INFO] Loading data from {args.train}...")
-    
-    # Read CSVs
-    X_train = pd.read_csv(os.path.join(args.train, args.train_file))
-    y_train = pd.read_csv(os.path.join(args.train, args.train_target_file))
-    X_test = pd.read_csv(os.path.join(args.test, args.test_file))
-    y_test = pd.read_csv(os.path.join(args.test, args.test_target_file))
+    print(f"[INFO] Loading data from {args.train} ({args.data_mode} data mode)...")
 
-    # Reshape targets
-    y_train = y_train.values.ravel()
-    y_test = y_test.values.ravel()
+    # Integer-coded categoricals (XGBOOST_FEATURE_MODE=categorical), none for one-hot splits
+    category_vocab = read_category_vocab(args.train)
+    if category_vocab:
+        require_xgboost("categorical")
+        print(f"[INFO] Native categorical features: {', '.join(category_vocab)}")
 
-    print(f"Training Shape: {X_train.shape}") # Expecting (rows, 43)
+    if args.data_mode == "memory":
+        # Read splits (Parquet/Feather keep float32, no text parsing; .npz stays a sparse CSR matrix)
+        X_train = as_categorical(read_split(args.train, "train", args.train_file), category_vocab)
+        y_train = read_split(args.train, "train_target", args.train_target_file).values.ravel()
+        print(f"Training Shape: {X_train.shape}") # Expecting (rows, 43), or (rows, 11) with categorical codes
+    else:
+        # The float matrix never exists whole: chunks are quantised (and for external, paged to cache-dir)
+        start = time.perf_counter()
+        train_iter = SplitIter(
+            split_path(args.train, "train", args.train_file),
+            split_path(args.train, "train_target", args.train_target_file),
+            args.chunk_rows,
+            category_vocab,
+            cache_prefix=os.path.join(args.cache_dir, "xgb-train") if args.data_mode == "external" else None
+        )
+        dtrain = streamed_dmatrix(train_iter, args.data_mode, args.max_bin, bool(category_vocab))
+        print(f"Training Shape: ({dtrain.num_row()}, {dtrain.num_col()}), "
+              f"streamed in chunks of {args.chunk_rows} rows in {time.perf_counter() - start:.1f}s")
 
     # ---------------------------------------------------------
-    # 3. TRAINING (Scikit-Learn API)
+    # 3. TRAINING (Scikit-Learn API, or xgb.train on the streamed DMatrix)
     # ---------------------------------------------------------
     print("[INFO] Training...")
     
@@ -70,18 +269,26 @@ if __name__ == "__main__":
         learning_rate=args.learning_rate,
         subsample=args.subsample,
         objective='reg:squarederror',
-        n_jobs=-1
+        n_jobs=-1,
+        **tree_params(args.data_mode, args.max_bin, category_vocab),
+        # Only set with category codes, so one-hot splits also train on older XGBoost releases
+        **({"max_cat_to_onehot": args.max_cat_to_onehot} if category_vocab else {})
     )
     
-    model.fit(X_train, y_train)
+    start = time.perf_counter()
+    if args.data_mode == "memory":
+        # A CSR X_train goes straight into XGBoost's DMatrix without densifying.
+        # Its absent entries (inactive one-hot columns) are read as missing values.
+        model.fit(X_train, y_train)
+        booster = model.get_booster()
+    else:
+        booster = xgb.train(model.get_xgb_params(), dtrain, num_boost_round=args.n_estimators)
+    print(f"[INFO] Trained in {time.perf_counter() - start:.1f}s")
 
     # ---------------------------------------------------------
     # 4. SAVING (THE FIX)
     # ---------------------------------------------------------
-    # extract the underlying booster
-    booster = model.get_booster()
-    
-    # Save as 'xgboost-model' 
+    # Save the native booster as 'xgboost-model'
     save_path = os.path.join(args.model_dir, "xgboost-model")
     booster.save_model(save_path)
     
@@ -90,6 +297,15 @@ if __name__ == "__main__":
     # ---------------------------------------------------------
     # 5. EVALUATION
     # ---------------------------------------------------------
-    preds = model.predict(X_test)
+    y_test = read_split(args.test, "test_target", args.test_target_file).values.ravel()
+    if args.data_mode == "memory":
+        preds = model.predict(as_categorical(read_split(args.test, "test", args.test_file), category_vocab))
+    else:
+        test_path = split_path(args.test, "test", args.test_file)
+        preds = np.concatenate([
+            booster.inplace_predict(as_categorical(X, category_vocab))
+            for X in iter_split_chunks(test_path, args.chunk_rows)
+        ])
     rmse = np.sqrt(mean_squared_error(y_test, preds))
-    print(f"Test RMSE: {rmse:.4f}")
\ No newline at end of file
+    print(f"Test RMSE: {rmse:.4f}")
+    print(f"[INFO] Peak memory: {peak_memory_mb():.0f} MB ({args.data_mode} data mode)")
@@ -4,15 +4,24 @@ from datetime import datetime
 
 LOG_FILE = f"{datetime.now().strftime('%m_%d_%Y_%H_%M_%S')}.log"
 logs_dir = os.path.join(os.getcwd(), "logs")
-
-os.makedirs(logs_dir, exist_ok=True)
 LOG_FILE_PATH = os.path.join(logs_dir, LOG_FILE)
-print(f"DEBUG: Log file will be created at: {LOG_FILE_PATH}")
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    Creates the logs directory and file on the first record instead of at import time.
+    """
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        print(f"DEBUG: Log file will be created at: {self.baseFilename}")
+        return super()._open()
 
 logging.basicConfig(
-    filename=LOG_FILE_PATH, 
+    handlers=[LazyFileHandler(LOG_FILE_PATH)],
     format="[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s",
     level=logging.INFO,
 )
 
-logger = logging.getLogger("retail_forecasting")
\ No newline at end of file
+logger = logging.getLogger("retail_forecasting")
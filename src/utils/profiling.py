@@ -0,0 +1,91 @@
+import sys
+import time
+from contextlib import contextmanager
+from src.utils.logger import logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+def _proc_status_mb(field: str) -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def current_rss_mb() -> float:
+    """
+    Resident set size right now, in MB (None if unsupported).
+    """
+    return _proc_status_mb("VmRSS")
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size (since the last reset_peak_rss on Linux), in MB (None if unsupported).
+    """
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak RSS watermark so it covers the next stage only (Linux only).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+class StageProfiler:
+    """
+    Records wall time, RSS after, and peak RSS of each pipeline stage.
+
+        profiler = StageProfiler()
+        with profiler.stage("clean"):
+            df = clean_data(df)
+        profiler.log_report()
+    """
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name: str):
+        per_stage_peak = reset_peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {
+                "stage": name,
+                "seconds": time.perf_counter() - start,
+                "rss_mb": current_rss_mb(),
+                # Without a resettable watermark this is the process peak so far
+                "peak_rss_mb": peak_rss_mb(),
+                "peak_is_per_stage": per_stage_peak,
+            }
+            self.stages.append(record)
+            logger.info(
+                f"Stage '{name}': {record['seconds']:.2f}s"
+                + (f", RSS {record['rss_mb']:.0f} MB" if record["rss_mb"] is not None else "")
+                + (f", peak {record['peak_rss_mb']:.0f} MB" if record["peak_rss_mb"] is not None else "")
+            )
+
+    def report(self) -> list:
+        return list(self.stages)
+
+    def log_report(self):
+        total = sum(stage["seconds"] for stage in self.stages)
+        peak = max((stage["peak_rss_mb"] or 0 for stage in self.stages), default=0)
+        logger.info(f"Pipeline stages: {total:.2f}s total, peak RSS {peak:.0f} MB")
+        for stage in self.stages:
+            logger.info(f"  {stage['stage']:<14} {stage['seconds']:8.2f}s  peak {stage['peak_rss_mb'] or 0:8.0f} MB")